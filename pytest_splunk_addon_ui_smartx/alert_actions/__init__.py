@@ -76,3 +76,4 @@ class AlertEntity(Entity):
         Open the required page. Page(super) class opens the page by default.
         """
         self.add_alert.click()
+        self.browser_wait.settle()
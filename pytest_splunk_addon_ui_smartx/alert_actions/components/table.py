@@ -15,6 +15,7 @@
 #
 
 import copy
+import logging
 import re
 from contextlib import contextmanager
 
@@ -24,6 +25,8 @@ from .action_controls import ActionControls
 from .alert_base_component import Selector
 from .alert_base_control import AlertBaseControl
 
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+
 
 class AlertTable(ActionControls):
     def __init__(self, browser, mapping=dict(), wait_for_seconds=10):
@@ -83,10 +86,11 @@ class AlertTable(ActionControls):
 
     def get_row_count(self):
         """
-        Count the number of rows in the page.
+        Count the number of rows in the page. Waits for the table to finish loading, but not for the rows if the table is empty.
             :return: Int The count of the table rows
         """
-        return len(list(self._get_rows()))
+        self._wait_for_rendered_table()
+        return self.count_now("rows")
 
     def get_headers(self):
         """
@@ -121,59 +125,75 @@ class AlertTable(ActionControls):
                     return
                 elif "asc" in each_header.get_attribute("class") and not ascending:
                     # If the column is in ascending order order and we want to have descending order, click on the column-header once
-                    each_header.click()
-                    self._wait_for_loadspinner()
+                    with self._wait_for_loadspinner():
+                        each_header.click()
                     return
                 elif "desc" in each_header.get_attribute("class") and not ascending:
                     # If the column is already in descending order, do nothing
                     return
                 elif "desc" in each_header.get_attribute("class") and ascending:
                     # If the column is in descending order order and we want to have ascending order, click on the column-header once
-                    each_header.click()
-                    self._wait_for_loadspinner()
+                    with self._wait_for_loadspinner():
+                        each_header.click()
                     return
                 else:
                     # The column was not sorted before
                     if ascending:
                         # Click to sort ascending order
-                        each_header.click()
-                        self._wait_for_loadspinner()
+                        with self._wait_for_loadspinner():
+                            each_header.click()
                         return
                     else:
                         # Click 2 times to sort in descending order
 
                         # Ascending
-                        each_header.click()
-                        self._wait_for_loadspinner()
+                        with self._wait_for_loadspinner():
+                            each_header.click()
                         # Decending
                         # The existing element changes (class will be changed), hence, it can not be referenced again.
                         # So we need to get the headers again and do the same process.
                         self.sort_column(column, ascending=False)
                         return
 
+    def _wait_for_rendered_table(self):
+        """
+        Wait for the table body to be present & the load spinner to be gone, so the rows can be read without waiting for them
+        """
+        self.wait_for("app_listings")
+        self.wait_until("waitspinner", msg="The table did not finish loading")
+        self.browser_wait.settle()
+
+    @contextmanager
     def _wait_for_loadspinner(self):
         """
         There exist a loadspinner when sorting/filter has been applied. This method will wait until the spinner is dissapeared
+        The spinner is watched from the start of the with block, so a spinner displayed only for a moment is not missed.
         """
+        actions_done = False
         try:
-            self.wait_for("waitspinner", timeout=5)
-            self.wait_until("waitspinner")
-        except:
-            print("Waitspinner did not appear")
+            with self.browser_wait.watch_loading(
+                self.get_tuple("waitspinner"), self.get_tuple("app_listings")
+            ):
+                yield
+                actions_done = True
+        except exceptions.TimeoutException:
+            if not actions_done:
+                raise
+            LOGGER.debug("Waitspinner did not appear")
+        self.browser_wait.settle()
 
     def wait_for_rows_to_appear(self, row_count=1):
         """
         Wait for the table to load row_count rows
             :param row_count: number of row_count to wait for.
         """
-
-        def _wait_for_rows_to_appear(driver):
-            return self.get_row_count() >= row_count
-
-        self.wait_for(
-            _wait_for_rows_to_appear,
+        if row_count < 1:
+            return
+        self.browser_wait.until_elements(
+            *self.get_tuple("rows"),
+            min_count=row_count,
             msg="Expected rows : {} to be greater or equal to {}".format(
-                row_count, self.get_row_count()
+                row_count, self.count_now("rows")
             ),
         )
 
@@ -298,9 +318,9 @@ class AlertTable(ActionControls):
             :returns: resultant list of filtered row_names
         """
         with self.wait_stale():
-            self.filter.clear()
-            self.filter.send_keys(filter_query)
-            self._wait_for_loadspinner()
+            with self._wait_for_loadspinner():
+                self.filter.clear()
+                self.filter.send_keys(filter_query)
         return self.get_column_values("name")
 
     @contextmanager
@@ -317,8 +337,8 @@ class AlertTable(ActionControls):
         """
         Clean the filter textbox
         """
-        self.filter.clear()
-        self._wait_for_loadspinner()
+        with self._wait_for_loadspinner():
+            self.filter.clear()
 
     def _get_column_value(self, row, column):
         """
@@ -346,12 +366,14 @@ class AlertTable(ActionControls):
             self.wait_for("app_listings")
             return self.get_clear_text(row.find_element(*list(col._asdict().values())))
 
-    def _get_rows(self):
+    def _get_rows(self, min_count=1, settle=0):
         """
         Get list of rows
+            :param min_count: The minimum number of rows to wait for
+            :param settle: The time in seconds for which the number of rows should not change, while the table is rendered
             :return: The list of rows within the table
         """
-        yield from self.get_elements("rows")
+        yield from self.get_elements("rows", min_count=min_count, settle=settle)
 
     def _get_row(self, name):
         """
@@ -14,30 +14,394 @@
 # limitations under the License.
 #
 
+import copy
+import importlib
+import inspect
+import json
 import logging
 import os
 import re
 import sys
+import tempfile
+import threading
 import time
 import traceback
+from abc import ABC, abstractmethod
 
 import pytest
 import requests
 from msedge.selenium_tools import Edge, EdgeOptions
-from msedge.selenium_tools.remote_connection import EdgeRemoteConnection
 from selenium import webdriver
-from selenium.common.exceptions import ElementNotInteractableException, TimeoutException
+from selenium.common.exceptions import (
+    ElementNotInteractableException,
+    NoAlertPresentException,
+    TimeoutException,
+)
 from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
 
+from .components.login import Login
+from .deadline import DeadlineWait
 from .pages.login import LoginPage
-from .utils import backend_retry
+from .timeouts import get_timeout_policy
+from .transport import KeepAliveEdgeRemoteConnection, KeepAliveRemoteConnection
+from .utils import backend_retry, file_lock
 
 # requests.urllib3.disable_warnings()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 PNG_PATH = "assets"
+SAUCE_HUB_URL = "https://ondemand.saucelabs.com:443/wd/hub"
+DRIVER_BACKEND_ENTRY_POINT = "ucc_smartx.driver_backends"
+
+
+class DriverBackend(ABC):
+    """
+    Base class of the driver backends. A driver backend knows how to launch a browser of one kind.
+
+    The capabilities of the browser are built once per backend instance and reused for every browser it creates.
+    A backend has to implement build_capabilities() and create(), it can not be registered otherwise.
+    """
+
+    #: False if the backend never runs on Saucelabs. The Saucelabs environment is then not required & the job is not notified.
+    saucelabs = True
+    #: False if the browser created by the backend does not need a login to Splunk Web.
+    requires_login = True
+    #: CommandMetrics instance to record the commands of the remote browsers to, set by the DriverRegistry.
+    command_metrics = None
+    #: True to request gzip encoded responses from the remote hubs, set by the DriverRegistry.
+    compress = False
+
+    def __init__(self, browser_version, headless=False, debug=False):
+        """
+        :param browser_version: The version of the browser
+        :param headless: True to run the local browser in headless mode
+        :param debug: True to run the browser locally instead of Saucelabs
+        """
+        self.browser_version = browser_version
+        self.headless = headless
+        self.debug = debug
+        self._capabilities = None
+        self._lock = threading.Lock()
+
+    def get_capabilities(self, selenium_helper):
+        """
+        Get the capabilities of the browser, built on the first call only.
+            :param selenium_helper: The SeleniumHelper instance launching the browser
+            :returns: The capabilities, as returned by build_capabilities()
+        """
+        with self._lock:
+            if self._capabilities is None:
+                self._capabilities = self.build_capabilities(selenium_helper)
+            return self._capabilities
+
+    def get_sauce_capabilities(self, selenium_helper):
+        """
+        Get a copy of the cached Saucelabs capabilities with the name of the current test case.
+            :param selenium_helper: The SeleniumHelper instance launching the browser
+            :returns: dict
+        """
+        capabilities = copy.deepcopy(self.get_capabilities(selenium_helper))
+        if "sauce:options" in capabilities:
+            capabilities["sauce:options"]["name"] = selenium_helper.test_case
+        return capabilities
+
+    def get_command_executor(self, hub_url, connection_class=KeepAliveRemoteConnection):
+        """
+        Get a keep-alive connection to the hub, which records the metrics of the commands.
+            :param hub_url: The url of the hub
+            :param connection_class: The class of the remote connection
+            :returns: RemoteConnection instance
+        """
+        return connection_class(
+            hub_url, metrics=self.command_metrics, compress=self.compress
+        )
+
+    @abstractmethod
+    def build_capabilities(self, selenium_helper):
+        """
+        Build the capabilities of the browser.
+            :param selenium_helper: The SeleniumHelper instance launching the browser
+        """
+
+    @abstractmethod
+    def create(self, selenium_helper):
+        """
+        Launch a new browser.
+            :param selenium_helper: The SeleniumHelper instance launching the browser
+            :returns: The webdriver instance
+        """
+
+
+class FirefoxBackend(DriverBackend):
+    def build_capabilities(self, selenium_helper):
+        if self.debug:
+            return selenium_helper.get_local_firefox_opts(self.headless)
+        return selenium_helper.get_sauce_firefox_opts(self.browser_version)
+
+    def create(self, selenium_helper):
+        if self.debug:
+            return webdriver.Firefox(
+                firefox_options=self.get_capabilities(selenium_helper),
+                log_path="selenium.log",
+            )
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(SAUCE_HUB_URL),
+            desired_capabilities=self.get_sauce_capabilities(selenium_helper),
+        )
+
+
+class ChromeBackend(DriverBackend):
+    def build_capabilities(self, selenium_helper):
+        if self.debug:
+            return selenium_helper.get_local_chrome_opts(self.headless)
+        return selenium_helper.get_sauce_chrome_opts(self.browser_version)
+
+    def create(self, selenium_helper):
+        if self.debug:
+            return webdriver.Chrome(
+                chrome_options=self.get_capabilities(selenium_helper),
+                service_args=["--verbose", "--log-path=selenium.log"],
+            )
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(SAUCE_HUB_URL),
+            desired_capabilities=self.get_sauce_capabilities(selenium_helper),
+        )
+
+
+class EdgeBackend(DriverBackend):
+    def build_capabilities(self, selenium_helper):
+        if self.debug:
+            return selenium_helper.get_local_edge_opts(self.headless)
+        return selenium_helper.get_sauce_edge_opts(self.browser_version)
+
+    def create(self, selenium_helper):
+        if self.debug:
+            return Edge(
+                executable_path="msedgedriver",
+                desired_capabilities=self.get_capabilities(selenium_helper),
+                service_args=["--verbose", "--log-path=selenium.log"],
+            )
+        options = EdgeOptions()
+        options.use_chromium = True
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(
+                SAUCE_HUB_URL, KeepAliveEdgeRemoteConnection
+            ),
+            options=options,
+            desired_capabilities=self.get_sauce_capabilities(selenium_helper),
+        )
+
+
+class IEBackend(DriverBackend):
+    def build_capabilities(self, selenium_helper):
+        if self.debug:
+            return selenium_helper.get_local_ie_opts()
+        return selenium_helper.get_sauce_ie_opts(self.browser_version)
+
+    def create(self, selenium_helper):
+        if self.debug:
+            return webdriver.Ie(capabilities=self.get_capabilities(selenium_helper))
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(SAUCE_HUB_URL),
+            desired_capabilities=self.get_sauce_capabilities(selenium_helper),
+        )
+
+
+class SafariBackend(DriverBackend):
+    def build_capabilities(self, selenium_helper):
+        if self.debug:
+            return dict()
+        return selenium_helper.get_sauce_safari_opts(self.browser_version)
+
+    def create(self, selenium_helper):
+        if self.debug:
+            return webdriver.Safari()
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(SAUCE_HUB_URL),
+            desired_capabilities=self.get_sauce_capabilities(selenium_helper),
+        )
+
+
+class GridBackend(DriverBackend):
+    """
+    Browser launched on a selenium grid. The subclasses define the hub url, the browser name & the browser specific options.
+    """
+
+    saucelabs = False
+    hub_url = None
+    browser_name = None
+    browser_options = dict()
+
+    def build_capabilities(self, selenium_helper):
+        return selenium_helper.get_grid_opts(self.browser_name, self.browser_options)
+
+    def create(self, selenium_helper):
+        return webdriver.Remote(
+            command_executor=self.get_command_executor(self.hub_url),
+            desired_capabilities=self.get_capabilities(selenium_helper),
+        )
+
+
+GOOGLE_CERT_OPTS = {
+    "goog:chromeOptions": {
+        "w3c": True,
+        "args": ["ignore-certificate-errors", "ignore-ssl-errors=yes"],
+    }
+}
+FIREFOX_CERT_OPTS = {
+    "acceptInsecureCerts": True,
+    "acceptSslCerts": True,
+}
+K8S_HUB_URL = "http://selenium-hub.selenium.svc.cluster.local:4444/wd/hub"
+
+
+# selenium local stack
+class ChromeGridBackend(GridBackend):
+    hub_url = "http://chrome-grid:4444/wd/hub"
+    browser_name = "chrome"
+    browser_options = GOOGLE_CERT_OPTS
+
+
+class FirefoxGridBackend(GridBackend):
+    hub_url = "http://firefox-grid:4444/wd/hub"
+    browser_name = "firefox"
+    browser_options = FIREFOX_CERT_OPTS
+
+
+# kubernetes selenium
+class ChromeK8sBackend(GridBackend):
+    hub_url = K8S_HUB_URL
+    browser_name = "chrome"
+    browser_options = GOOGLE_CERT_OPTS
+
+
+class FirefoxK8sBackend(GridBackend):
+    hub_url = K8S_HUB_URL
+    browser_name = "firefox"
+    browser_options = FIREFOX_CERT_OPTS
+
+
+class DriverRegistry:
+    """
+    Registry of the driver backends by browser name.
+
+    The backend classes are registered at the class level: the built-in ones, the ones registered with register()
+    and the ones exposed by installed packages under the "ucc_smartx.driver_backends" entry point group.
+    An instance of the registry keeps one backend instance per browser configuration, so that the capabilities are built once per registry.
+    """
+
+    backends = {
+        "firefox": FirefoxBackend,
+        "chrome": ChromeBackend,
+        "edge": EdgeBackend,
+        "IE": IEBackend,
+        "safari": SafariBackend,
+        "chrome_grid": ChromeGridBackend,
+        "firefox_grid": FirefoxGridBackend,
+        "chrome_k8s": ChromeK8sBackend,
+        "firefox_k8s": FirefoxK8sBackend,
+    }
+    entry_points_loaded = False
+
+    def __init__(self, command_metrics=None, compress=False):
+        """
+        :param command_metrics: CommandMetrics instance to record the commands of the remote browsers to
+        :param compress: True to request gzip encoded responses from the remote hubs
+        """
+        self.command_metrics = command_metrics
+        self.compress = compress
+        self._instances = dict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name, backend_class):
+        """
+        Register a driver backend
+            :param name: The browser name used with --browser
+            :param backend_class: A DriverBackend subclass, or its import path as "package.module:ClassName"
+        """
+        if isinstance(backend_class, str):
+            module_name, _, class_name = backend_class.partition(":")
+            backend_class = getattr(importlib.import_module(module_name), class_name)
+        if inspect.isabstract(backend_class):
+            raise TypeError(
+                "The driver backend {} of {} does not implement {}".format(
+                    backend_class.__name__,
+                    name,
+                    ", ".join(sorted(backend_class.__abstractmethods__)),
+                )
+            )
+        cls.backends[name] = backend_class
+
+    @classmethod
+    def load_entry_points(cls):
+        """
+        Register the driver backends exposed by the installed packages. Loaded only once.
+        """
+        if cls.entry_points_loaded:
+            return
+        cls.entry_points_loaded = True
+        try:
+            from importlib.metadata import entry_points
+        except ImportError:
+            return
+        all_entry_points = entry_points()
+        if hasattr(all_entry_points, "select"):
+            backend_entry_points = all_entry_points.select(
+                group=DRIVER_BACKEND_ENTRY_POINT
+            )
+        else:
+            backend_entry_points = all_entry_points.get(DRIVER_BACKEND_ENTRY_POINT, [])
+        for entry_point in backend_entry_points:
+            try:
+                if entry_point.name not in cls.backends:
+                    cls.register(entry_point.name, entry_point.load())
+            except Exception:
+                logger.warning(
+                    "Could not load the driver backend {} \nTRACEBACK::{}".format(
+                        entry_point.name, traceback.format_exc()
+                    )
+                )
+
+    @classmethod
+    def get_backend_class(cls, browser):
+        """
+        Get the backend class registered for the browser
+            :param browser: The browser name
+            :returns: DriverBackend subclass, None if no backend is registered for the browser
+        """
+        if browser not in cls.backends:
+            cls.load_entry_points()
+        return cls.backends.get(browser)
+
+    def get_backend(self, browser, browser_version, headless=False, debug=False):
+        """
+        Get the backend instance of the browser configuration, created on the first call.
+            :param browser: The browser name
+            :param browser_version: The version of the browser
+            :param headless: True to run the local browser in headless mode
+            :param debug: True to run the browser locally instead of Saucelabs
+            :returns: DriverBackend instance
+        """
+        key = (browser, browser_version, headless, debug)
+        with self._lock:
+            if key not in self._instances:
+                if browser not in self.backends:
+                    self.load_entry_points()
+                if browser not in self.backends:
+                    raise Exception(
+                        "No valid browser found.! expected=[{}], got={}".format(
+                            ", ".join(self.backends), browser
+                        )
+                    )
+                backend = self.backends[browser](
+                    browser_version, headless=headless, debug=debug
+                )
+                backend.command_metrics = self.command_metrics
+                backend.compress = self.compress
+                self._instances[key] = backend
+            return self._instances[key]
 
 
 class SeleniumHelper:
@@ -50,6 +414,13 @@ class SeleniumHelper:
     sauce_tunnel_id = None
     sauce_tunnel_parent = None
     jenkins_build = None
+    splunk_web_cookies = dict()
+    splunk_web_cookies_lock = threading.Lock()
+    safari_versions = None
+    safari_versions_cache_path = os.path.join(
+        tempfile.gettempdir(), "ucc_smartx_sauce_safari_versions.json"
+    )
+    safari_versions_cache_ttl = 24 * 60 * 60
 
     def __init__(
         self,
@@ -61,153 +432,46 @@ class SeleniumHelper:
         cred=("admin", "Chang3d!"),
         headless=False,
         test_case=None,
+        cookie_login=False,
+        driver_registry=None,
     ):
         self.splunk_web_url = splunk_web_url
         self.splunk_mgmt_url = splunk_mgmt_url
         self.cred = cred
         self.test_case = test_case
+        self.cookie_login = cookie_login
         self.skip_saucelab_job = False
 
-        if "grid" in browser:
+        if driver_registry is None:
+            driver_registry = DriverRegistry()
+        self.driver_backend = driver_registry.get_backend(
+            browser, browser_version, headless=headless, debug=debug
+        )
+        if not self.driver_backend.saucelabs:
             self.skip_saucelab_job = True
             debug = True
 
         if not debug:
             # Using Saucelabs
             self.init_sauce_env_variables()
+        self.debug = debug
 
-        try:
-            if browser == "firefox":
-                if debug:
-                    self.browser = webdriver.Firefox(
-                        firefox_options=self.get_local_firefox_opts(headless),
-                        log_path="selenium.log",
-                    )
-                else:
-                    self.browser = webdriver.Remote(
-                        command_executor="https://ondemand.saucelabs.com:443/wd/hub",
-                        desired_capabilities=self.get_sauce_firefox_opts(
-                            browser_version
-                        ),
-                    )
+        self.start_browser()
 
-            elif browser == "chrome":
-                if debug:
-                    self.browser = webdriver.Chrome(
-                        chrome_options=self.get_local_chrome_opts(headless),
-                        service_args=["--verbose", "--log-path=selenium.log"],
-                    )
-                else:
-                    self.browser = webdriver.Remote(
-                        command_executor="https://ondemand.saucelabs.com:443/wd/hub",
-                        desired_capabilities=self.get_sauce_chrome_opts(
-                            browser_version
-                        ),
-                    )
-
-            # selenium local stack
-            elif browser == "chrome_grid":
-                google_cert_opts = {
-                    "goog:chromeOptions": {
-                        "w3c": True,
-                        "args": ["ignore-certificate-errors", "ignore-ssl-errors=yes"],
-                    }
-                }
-
-                self.browser = webdriver.Remote(
-                    command_executor="http://chrome-grid:4444/wd/hub",
-                    desired_capabilities=self.get_grid_opts("chrome", google_cert_opts),
-                )
-            elif browser == "firefox_grid":
-                firefox_cert_opts = {
-                    "acceptInsecureCerts": True,
-                    "acceptSslCerts": True,
-                }
-
-                self.browser = webdriver.Remote(
-                    command_executor="http://firefox-grid:4444/wd/hub",
-                    desired_capabilities=self.get_grid_opts(
-                        "firefox", firefox_cert_opts
-                    ),
-                )
-            # kubernetes selenium
-            elif browser == "chrome_k8s":
-                google_cert_opts = {
-                    "goog:chromeOptions": {
-                        "w3c": True,
-                        "args": ["ignore-certificate-errors", "ignore-ssl-errors=yes"],
-                    }
-                }
-
-                self.browser = webdriver.Remote(
-                    command_executor="http://selenium-hub.selenium.svc.cluster.local:4444/wd/hub",
-                    desired_capabilities=self.get_grid_opts("chrome", google_cert_opts),
-                )
-            elif browser == "firefox_k8s":
-                firefox_cert_opts = {
-                    "acceptInsecureCerts": True,
-                    "acceptSslCerts": True,
-                }
-
-                self.browser = webdriver.Remote(
-                    command_executor="http://selenium-hub.selenium.svc.cluster.local:4444/wd/hub",
-                    desired_capabilities=self.get_grid_opts(
-                        "firefox", firefox_cert_opts
-                    ),
-                )
-
-            elif browser == "edge":
-                if debug:
-                    self.browser = Edge(
-                        executable_path="msedgedriver",
-                        desired_capabilities=self.get_local_edge_opts(headless),
-                        service_args=["--verbose", "--log-path=selenium.log"],
-                    )
-                else:
-                    command_executor = EdgeRemoteConnection(
-                        "https://ondemand.saucelabs.com:443/wd/hub"
-                    )
-                    options = EdgeOptions()
-                    options.use_chromium = True
-                    self.browser = webdriver.Remote(
-                        command_executor=command_executor,
-                        options=options,
-                        desired_capabilities=self.get_sauce_edge_opts(browser_version),
-                    )
-
-            elif browser == "IE":
-                if debug:
-                    self.browser = webdriver.Ie(capabilities=self.get_local_ie_opts())
-                else:
-                    self.browser = webdriver.Remote(
-                        command_executor="https://ondemand.saucelabs.com:443/wd/hub",
-                        desired_capabilities=self.get_sauce_ie_opts(browser_version),
-                    )
-            elif browser == "safari":
-                if debug:
-                    self.browser = webdriver.Safari()
-                else:
-                    self.browser = webdriver.Remote(
-                        command_executor="https://ondemand.saucelabs.com:443/wd/hub",
-                        desired_capabilities=self.get_sauce_safari_opts(
-                            browser_version
-                        ),
-                    )
-            else:
-                raise Exception(
-                    "No valid browser found.! expected=[firefox, chrome, safari], got={}".format(
-                        browser
-                    )
-                )
-        except Exception as e:
-            raise e
+    def start_browser(self):
+        """
+        Launch the browser & login to the Splunk instance.
+        Also used to replace a browser which could not be reset for the next test case.
+        """
+        self.browser = self.driver_backend.create(self)
 
         try:
             self.browser_session = self.browser.session_id
-            self.login_to_splunk(*self.cred)
+            if self.driver_backend.requires_login:
+                self.login_to_splunk(*self.cred)
         except:
             self.browser.quit()
-            if not debug:
+            if not self.debug:
                 self.update_saucelab_job(False)
             raise
 
@@ -376,38 +640,8 @@ class SeleniumHelper:
         return chrome_opts
 
     def get_sauce_safari_opts(self, browser_version):
+        safari_versions = self.get_sauce_safari_versions()
         try:
-            retries = 0
-            while retries < 3:
-                response = requests.get(
-                    "https://api.us-west-1.saucelabs.com/rest/v1/info/platforms/webdriver",
-                    verify=False,
-                )
-                if response.status_code != 200:
-                    logger.debug(
-                        "Error retrieving supported webdrivers for saucelabs, retrying..."
-                    )
-                    logger.debug("Status Code: " + str(response.status_code))
-                    logger.debug(response.text)
-                    retries += 1
-                    time.sleep(1 * 60)
-                else:
-                    break
-            if response.status_code != 200:
-                raise Exception(
-                    "Error retrieving supported webdrivers for saucelabs\n Status: {}\nURL: {}".format(
-                        response.status_code, response.url
-                    )
-                )
-            safari_versions = {}
-            for items in response.json():
-                if items["api_name"] == "safari":
-                    if items["short_version"] in safari_versions:
-                        safari_versions[int(items["short_version"])] = max(
-                            items["os"], safari_versions[items["short_version"]]
-                        )
-                    else:
-                        safari_versions[int(items["short_version"])] = items["os"]
             if browser_version == "latest":
                 browser_version = str(max(safari_versions.keys()))
                 platformName = safari_versions[int(browser_version)]
@@ -426,9 +660,6 @@ class SeleniumHelper:
                     browser_version
                 )
             )
-        except Exception as e:
-            logger.debug("Supported webdrivers for Saucelab: " + response.text)
-            raise e
         sauce_opts = self.get_sauce_opts()
         sauce_opts["screenResolution"] = "1024x768"
         safari_opts = {
@@ -439,17 +670,248 @@ class SeleniumHelper:
         }
         return safari_opts
 
+    @classmethod
+    def get_sauce_safari_versions(cls):
+        """
+        Get the Safari versions supported by Saucelabs.
+        The result is kept in memory for the session and cached on the disk (shared by the xdist workers) for safari_versions_cache_ttl seconds.
+        If the Saucelabs API fails and an expired cache exists, the expired cache is used.
+            :returns: dictionary {short_version(int): os}
+        """
+        if cls.safari_versions:
+            return cls.safari_versions
+        with file_lock(cls.safari_versions_cache_path + ".lock"):
+            cache = cls.read_safari_versions_cache()
+            if (
+                cache
+                and time.time() - cache["timestamp"] < cls.safari_versions_cache_ttl
+            ):
+                cls.safari_versions = cache["versions"]
+                return cls.safari_versions
+            try:
+                # Do not wait for the retries if there is a cache to fall back to
+                safari_versions = cls.fetch_sauce_safari_versions(
+                    retry_count=1 if cache else 3
+                )
+            except Exception:
+                if not cache:
+                    raise
+                logger.debug(
+                    "Could not fetch the supported webdrivers for saucelabs, using the expired cache."
+                )
+                cls.safari_versions = cache["versions"]
+                return cls.safari_versions
+            cls.write_safari_versions_cache(safari_versions)
+            cls.safari_versions = safari_versions
+        return cls.safari_versions
+
+    @classmethod
+    def read_safari_versions_cache(cls):
+        try:
+            with open(cls.safari_versions_cache_path) as f:
+                cache = json.load(f)
+            return {
+                "timestamp": cache["timestamp"],
+                "versions": {
+                    int(version): platform
+                    for version, platform in cache["versions"].items()
+                },
+            }
+        except Exception:
+            return None
+
+    @classmethod
+    def write_safari_versions_cache(cls, safari_versions):
+        try:
+            with open(cls.safari_versions_cache_path, "w") as f:
+                json.dump({"timestamp": time.time(), "versions": safari_versions}, f)
+        except OSError:
+            logger.debug(
+                "Could not write the safari versions cache {}".format(
+                    cls.safari_versions_cache_path
+                )
+            )
+
+    @staticmethod
+    def fetch_sauce_safari_versions(retry_count=3):
+        """
+        Fetch the Safari versions supported by Saucelabs from the platforms API.
+            :param retry_count: The number of times the API should be called if it fails
+            :returns: dictionary {short_version(int): os}
+        """
+        retries = 0
+        while retries < retry_count:
+            response = requests.get(
+                "https://api.us-west-1.saucelabs.com/rest/v1/info/platforms/webdriver",
+                verify=False,
+            )
+            if response.status_code != 200:
+                logger.debug(
+                    "Error retrieving supported webdrivers for saucelabs, retrying..."
+                )
+                logger.debug("Status Code: " + str(response.status_code))
+                logger.debug(response.text)
+                retries += 1
+                if retries < retry_count:
+                    time.sleep(1 * 60)
+            else:
+                break
+        if response.status_code != 200:
+            raise Exception(
+                "Error retrieving supported webdrivers for saucelabs\n Status: {}\nURL: {}".format(
+                    response.status_code, response.url
+                )
+            )
+        safari_versions = {}
+        for items in response.json():
+            if items["api_name"] == "safari" and str(items["short_version"]).isdigit():
+                short_version = int(items["short_version"])
+                safari_versions[short_version] = max(
+                    items["os"], safari_versions.get(short_version, items["os"])
+                )
+        return safari_versions
+
     def login_to_splunk(self, *cred):
         try:
+            if self.cookie_login and self.login_with_cookies(*cred):
+                return
             login_page = LoginPage(self)
             login_page.login.login(*cred)
         except:
             self.browser.save_screenshot(os.path.join(PNG_PATH, "login_error.png"))
             raise
 
-    def update_saucelab_job(self, status):
+    def login_with_cookies(self, username, password):
+        """
+        Login by injecting the Splunk Web session cookies into the browser instead of filling the login form.
+        The cookies are fetched once per Splunk instance & user and shared by all the browsers.
+            :param username: Str the username for the splunk instance
+            :param password: Str the password for the splunk instance
+            :return: Bool True if the Splunk Web accepted the cookies, False otherwise
+        """
+        try:
+            cookies = self.get_splunk_web_cookies(
+                self.splunk_web_url, username, password
+            )
+        except Exception:
+            logger.warning(
+                "Could not login to Splunk Web over HTTP, using the login form. \nTRACEBACK::{}".format(
+                    traceback.format_exc()
+                )
+            )
+            return False
+
+        # The cookies can only be added for the domain which is currently loaded
+        self.browser.get("{}/en-US/account/login".format(self.splunk_web_url))
+        for cookie in cookies:
+            self.browser.add_cookie(cookie)
+        self.browser.get(self.splunk_web_url)
+        if Login(self.browser).is_logged_in():
+            return True
+
+        logger.info("Splunk Web rejected the session cookies, using the login form.")
+        self.browser.delete_all_cookies()
+        self.forget_splunk_web_cookies(self.splunk_web_url, username)
+        return False
+
+    @classmethod
+    def get_splunk_web_cookies(cls, splunk_web_url, username, password):
+        """
+        Get the Splunk Web session cookies for the user. The login over HTTP is done only once.
+            :param splunk_web_url: Splunk web url
+            :param username: Str the username for the splunk instance
+            :param password: Str the password for the splunk instance
+            :return: List of cookie dictionaries which can be passed to add_cookie
+        """
+        with cls.splunk_web_cookies_lock:
+            if (splunk_web_url, username) not in cls.splunk_web_cookies:
+                cls.splunk_web_cookies[
+                    (splunk_web_url, username)
+                ] = cls.fetch_splunk_web_cookies(splunk_web_url, username, password)
+            return cls.splunk_web_cookies[(splunk_web_url, username)]
+
+    @classmethod
+    def forget_splunk_web_cookies(cls, splunk_web_url, username):
+        """
+        Remove the cached Splunk Web session cookies of the user, so that the next browser logs in again.
+        """
+        with cls.splunk_web_cookies_lock:
+            cls.splunk_web_cookies.pop((splunk_web_url, username), None)
+
+    @staticmethod
+    def fetch_splunk_web_cookies(splunk_web_url, username, password):
+        """
+        Login to Splunk Web over HTTP and return the resulting session cookies.
+        """
+        login_url = "{}/en-US/account/login".format(splunk_web_url)
+        session = requests.Session()
+        # The login page sets the cval cookie which must be sent back with the credentials
+        session.get(login_url, verify=False)
+        response = session.post(
+            login_url,
+            data={
+                "username": username,
+                "password": password,
+                "cval": session.cookies.get("cval"),
+                "set_has_logged_in": "false",
+            },
+            verify=False,
+        )
+        if response.status_code != 200 or not any(
+            cookie.name.startswith("splunkd_") for cookie in session.cookies
+        ):
+            raise Exception(
+                "Could not login to Splunk Web\nStatus: {}\nURL: {}".format(
+                    response.status_code, response.url
+                )
+            )
+        return [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "path": cookie.path or "/",
+                "secure": bool(cookie.secure),
+            }
+            for cookie in session.cookies
+        ]
+
+    def reset_browser(self):
+        """
+        Reset the browser state so that the browser can be reused by another test case.
+        Extra windows are closed, the local & session storage is cleared and the browser goes back to Splunk home.
+        The cookies are kept, so the browser stays logged in to the Splunk instance.
+        """
+        try:
+            self.browser.switch_to.alert.dismiss()
+        except NoAlertPresentException:
+            pass
+        handles = self.browser.window_handles
+        for handle in handles[1:]:
+            self.browser.switch_to.window(handle)
+            self.browser.close()
+        self.browser.switch_to.window(handles[0])
+        self.browser.execute_script(
+            "window.localStorage.clear(); window.sessionStorage.clear();"
+        )
+        self.browser.get(self.splunk_web_url)
+
+    def update_saucelab_job(self, status, reporter=None):
+        """
+        Notify the status of the test case to Saucelabs.
+            :param status: True if the test case failed
+            :param reporter: SauceJobReporter instance. If provided, the status is notified in background.
+        """
         if self.skip_saucelab_job:
             return
+        if reporter:
+            reporter.report(
+                self.sauce_username,
+                self.sauce_access_key,
+                self.browser_session,
+                status,
+                self.test_case,
+            )
+            return
         data = '{"passed": false}' if status else '{"passed": true}'
         response = requests.put(
             "https://saucelabs.com/rest/v1/{}/jobs/{}".format(
@@ -462,6 +924,24 @@ class SeleniumHelper:
         print("\nSauceLabs job_id={}".format(response.get("id")))
         print("SauceLabs Video_url={}".format(response.get("video_url")))
 
+    def rename_test_case(self, test_case):
+        """
+        Give the browser to another test case, and rename its Saucelabs job after it.
+            :param test_case: The name of the test case which uses the browser
+        """
+        self.test_case = test_case
+        if self.skip_saucelab_job:
+            return
+        response = requests.put(
+            "https://saucelabs.com/rest/v1/{}/jobs/{}".format(
+                self.sauce_username, self.browser_session
+            ),
+            data=json.dumps({"name": test_case}),
+            auth=(self.sauce_username, self.sauce_access_key),
+            timeout=60,
+        )
+        response.raise_for_status()
+
 
 class RestHelper:
     def __init__(self, splunk_mgmt_url, username, password):
@@ -494,6 +974,22 @@ class RestHelper:
         self.session_key = str(res["sessionKey"])
 
 
+ASSERT_OPERATORS = {
+    "==": lambda left, right: left == right,
+    "!=": lambda left, right: left != right,
+    "<": lambda left, right: left < right,
+    "<=": lambda left, right: left <= right,
+    ">": lambda left, right: left > right,
+    ">=": lambda left, right: left >= right,
+    "in": lambda left, right: left in right,
+    "not in": lambda left, right: left not in right,
+    "is": lambda left, right: left is right,
+    "is not": lambda left, right: left is not right,
+}
+# The parameters of a condition of UccTester.assert_all, in the order of assert_util
+ASSERT_PARAMS = ("left", "right", "operator", "left_args", "right_args")
+
+
 class UccTester:
     """
     The default setup and teardown methods can be added here.
@@ -502,7 +998,9 @@ class UccTester:
 
     def setup_class(self):
         WAIT_TIMEOUT = 20
-        self.wait = WebDriverWait(None, WAIT_TIMEOUT)
+        self.wait = DeadlineWait(
+            None, get_timeout_policy().get_timeout(WAIT_TIMEOUT, component="UccTester")
+        )
 
     def assert_util(
         self, left, right, operator="==", left_args={}, right_args={}, msg=None
@@ -532,18 +1030,7 @@ class UccTester:
             "left_value": left,
             "right_value": right,
         }
-        operator_map = {
-            "==": lambda left, right: left == right,
-            "!=": lambda left, right: left != right,
-            "<": lambda left, right: left < right,
-            "<=": lambda left, right: left <= right,
-            ">": lambda left, right: left > right,
-            ">=": lambda left, right: left >= right,
-            "in": lambda left, right: left in right,
-            "not in": lambda left, right: left not in right,
-            "is": lambda left, right: left is right,
-            "is not": lambda left, right: left is not right,
-        }
+        operator_map = ASSERT_OPERATORS
 
         def _assert(browser):
             try:
@@ -573,3 +1060,70 @@ class UccTester:
             assert operator_map[args["operator"]](
                 args["left_value"], args["right_value"]
             ), msg
+
+    def assert_all(self, conditions, msg=None):
+        """
+        Check all the conditions in a single polling loop of {WAIT_TIMEOUT} seconds, and report all the failed conditions together.
+        A condition which passed once is not checked again.
+        Useful to verify many fields after a single action, ex all the values of an entity after saving it.
+
+        Params:
+            conditions: iterable of conditions. A condition is either a tuple of the assert_util parameters (left, right, operator, left_args, right_args),
+                or a dict with the same keys and an optional msg. operator is "==" by default.
+            msg: Error message shown before the failed conditions.
+
+        """
+        conditions = list(conditions)
+        pending = list()
+        for condition in conditions:
+            if not isinstance(condition, dict):
+                condition = dict(zip(ASSERT_PARAMS, condition))
+            args = {
+                "operator": "==",
+                "left_args": {},
+                "right_args": {},
+                "msg": None,
+                "error": None,
+            }
+            args.update(condition)
+            args["left_value"] = args["left"]
+            args["right_value"] = args["right"]
+            pending.append(args)
+
+        def _check(args):
+            try:
+                if callable(args["left"]):
+                    args["left_value"] = args["left"](**args["left_args"])
+                if callable(args["right"]):
+                    args["right_value"] = args["right"](**args["right_args"])
+                args["error"] = None
+            except (TimeoutException, ElementNotInteractableException) as e:
+                args["error"] = str(e).strip()
+                return False
+            return ASSERT_OPERATORS[args["operator"]](
+                args["left_value"], args["right_value"]
+            )
+
+        def _assert_all(browser):
+            pending[:] = [args for args in pending if not _check(args)]
+            return not pending
+
+        try:
+            self.wait.until(_assert_all)
+        except TimeoutException as e:
+            logger.error("Exception raised: {}".format(str(e)))
+        if pending:
+            failures = [
+                msg
+                or "{} of {} conditions failed".format(len(pending), len(conditions))
+            ]
+            for args in pending:
+                failure = args[
+                    "msg"
+                ] or "Left-value: {}, Operator: {}, Right-value: {}".format(
+                    args["left_value"], args["operator"], args["right_value"]
+                )
+                if args["error"]:
+                    failure += ", Error: {}".format(args["error"])
+                failures.append("  - {}".format(failure))
+            raise AssertionError("\n".join(failures))
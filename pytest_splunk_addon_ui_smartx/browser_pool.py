@@ -0,0 +1,187 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+
+
+class BrowserPool:
+    """
+    Pool of already logged-in browsers.
+
+    A test case leases a SeleniumHelper from the pool and gives it back once it is done.
+    Instead of quitting the browser, the pool resets it (extra windows, local/session storage, current page)
+    and keeps it for the next test case. The Splunk session cookies are kept, so the next lease does not have to login again.
+    """
+
+    def __init__(self, factory, size):
+        """
+        :param factory: Callable which takes the test_case name and returns a new logged-in SeleniumHelper
+        :param size: The maximum number of idle browsers kept in the pool
+        """
+        self.factory = factory
+        self.size = size
+        self._idle = []
+        self._leased = []
+        self._lock = threading.Lock()
+
+    def acquire(self, test_case=None):
+        """
+        Lease a browser from the pool. A new browser is launched if there is no idle browser available.
+            :param test_case: The name of the test case which is leasing the browser
+            :returns: SeleniumHelper instance
+        """
+        with self._lock:
+            selenium_helper = self._idle.pop() if self._idle else None
+        if selenium_helper is None:
+            LOGGER.info("No idle browser in the pool, launching a new one..")
+            selenium_helper = self.factory(test_case)
+        with self._lock:
+            self._leased.append(selenium_helper)
+        return selenium_helper
+
+    def release(self, selenium_helper):
+        """
+        Give the browser back to the pool. The browser is reset, and quit if the reset fails or the pool is full.
+            :param selenium_helper: The SeleniumHelper instance leased with acquire()
+        """
+        with self._lock:
+            if selenium_helper in self._leased:
+                self._leased.remove(selenium_helper)
+        try:
+            selenium_helper.reset_browser()
+        except Exception:
+            LOGGER.warn(
+                "Could not reset the browser, it will not be reused \nTRACEBACK::{}".format(
+                    traceback.format_exc()
+                )
+            )
+            self._quit(selenium_helper)
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(selenium_helper)
+                return
+        self._quit(selenium_helper)
+
+    def close(self):
+        """
+        Quit all the browsers owned by the pool.
+        """
+        with self._lock:
+            browsers = self._idle + self._leased
+            self._idle = []
+            self._leased = []
+        LOGGER.info("Quiting {} pooled browser(s)..".format(len(browsers)))
+        for selenium_helper in browsers:
+            self._quit(selenium_helper)
+
+    def _quit(self, selenium_helper):
+        try:
+            selenium_helper.browser.quit()
+        except Exception:
+            LOGGER.warn(
+                "Could not quit the browser \nTRACEBACK::{}".format(
+                    traceback.format_exc()
+                )
+            )
+
+
+class BrowserPrelauncher:
+    """
+    Launches the browser of the next test case on a background thread while the current test case is running.
+
+    Every test case still gets a fresh browser, but the driver spawn & login time is hidden behind the execution of the previous test case.
+    """
+
+    def __init__(self, factory):
+        """
+        :param factory: Callable which takes the test_case name and returns a new logged-in SeleniumHelper
+        """
+        self.factory = factory
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._pending = None
+        self._lock = threading.Lock()
+
+    def prelaunch(self, test_case=None):
+        """
+        Start launching a browser for the given test case in the background. Does nothing if a browser is already being launched.
+            :param test_case: The name of the test case which will use the browser
+        """
+        with self._lock:
+            if self._pending is None:
+                LOGGER.debug("Pre-launching the browser for {}".format(test_case))
+                self._pending = self._executor.submit(self.factory, test_case)
+
+    def acquire(self, test_case=None):
+        """
+        Get the pre-launched browser. A new browser is launched if nothing was pre-launched or the pre-launch failed.
+        The pre-launched browser is renamed after the test case, in case it was launched for another one.
+            :param test_case: The name of the test case which will use the browser
+            :returns: SeleniumHelper instance
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            try:
+                selenium_helper = pending.result()
+            except Exception:
+                LOGGER.warn(
+                    "Pre-launched browser could not be configured, launching a new one. \nTRACEBACK::{}".format(
+                        traceback.format_exc()
+                    )
+                )
+            else:
+                if selenium_helper.test_case != test_case:
+                    self._rename(selenium_helper, test_case)
+                return selenium_helper
+        return self.factory(test_case)
+
+    def _rename(self, selenium_helper, test_case):
+        LOGGER.debug(
+            "Pre-launched browser of {} is used by {}".format(
+                selenium_helper.test_case, test_case
+            )
+        )
+        try:
+            selenium_helper.rename_test_case(test_case)
+        except Exception:
+            LOGGER.warn(
+                "Could not rename the Saucelabs job of the pre-launched browser \nTRACEBACK::{}".format(
+                    traceback.format_exc()
+                )
+            )
+
+    def close(self):
+        """
+        Quit the pre-launched browser which was not used by any test case.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None:
+            try:
+                LOGGER.info("Quiting unused pre-launched browser..")
+                pending.result().browser.quit()
+            except Exception:
+                LOGGER.debug(
+                    "Unused pre-launched browser could not be quit \nTRACEBACK::{}".format(
+                        traceback.format_exc()
+                    )
+                )
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,639 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import time
+import weakref
+from contextlib import contextmanager
+
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    UnknownMethodException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from .deadline import run_within_deadline
+from .timeouts import get_timeout_policy
+
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+
+PRESENT = "present"
+VISIBLE = "visible"
+CLICKABLE = "clickable"
+INVISIBLE = "invisible"
+HAS_TEXT = "has_text"
+ABSENT = "absent"
+# Condition of until_elements, used in the wait keys of the timeout policy
+ELEMENTS = "elements"
+
+# Resolves with the element (or true) as soon as the condition matches, null on timeout.
+# The condition is checked once, then on every DOM mutation & every 100ms, as the visibility can change without any mutation (css transitions, layout).
+WAIT_FOR_CONDITION = """
+var condition = arguments[0], by = arguments[1], select = arguments[2], timeout = arguments[3];
+var done = arguments[arguments.length - 1];
+function find() {
+    if (by === "xpath") {
+        var result = document.evaluate(select, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null);
+        return result.singleNodeValue;
+    }
+    return document.querySelector(select);
+}
+function isDisplayed(element) {
+    var style = window.getComputedStyle(element);
+    return style.visibility !== "hidden" && style.display !== "none" &&
+        !!(element.offsetWidth || element.offsetHeight || element.getClientRects().length);
+}
+function check() {
+    var element = find();
+    switch (condition) {
+        case "present": return element;
+        case "visible": return element && isDisplayed(element) ? element : null;
+        case "clickable": return element && isDisplayed(element) && !element.disabled ? element : null;
+        case "invisible": return !element || !isDisplayed(element) ? true : null;
+        case "has_text": return element && element.innerText.trim().length > 0 ? element : null;
+        case "absent": return !element ? true : null;
+    }
+    return null;
+}
+var result = check();
+if (result) { return done(result); }
+var observer, timer, poller, finished = false;
+function finish(result) {
+    if (finished) { return; }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(poller);
+    done(result);
+}
+function recheck() {
+    var result = check();
+    if (result) { finish(result); }
+}
+observer = new MutationObserver(recheck);
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+poller = setInterval(recheck, 100);
+timer = setTimeout(function() { finish(null); }, timeout);
+"""
+
+# Resolves with the list of elements once at least min_count are found and their number did not change for the settle period.
+# Resolves with null on timeout.
+WAIT_FOR_ELEMENTS = """
+var by = arguments[0], select = arguments[1], min_count = arguments[2], settle = arguments[3], timeout = arguments[4];
+var done = arguments[arguments.length - 1];
+function findAll() {
+    if (by === "xpath") {
+        var result = document.evaluate(select, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var elements = [];
+        for (var i = 0; i < result.snapshotLength; i++) { elements.push(result.snapshotItem(i)); }
+        return elements;
+    }
+    return Array.prototype.slice.call(document.querySelectorAll(select));
+}
+var count = -1, observer, timer, settle_timer;
+function finish(result) {
+    observer.disconnect();
+    clearTimeout(timer);
+    clearTimeout(settle_timer);
+    done(result);
+}
+function check() {
+    var elements = findAll();
+    if (elements.length < min_count) {
+        count = -1;
+        clearTimeout(settle_timer);
+    } else if (elements.length !== count) {
+        count = elements.length;
+        clearTimeout(settle_timer);
+        settle_timer = setTimeout(function() { finish(findAll()); }, settle);
+    }
+}
+observer = new MutationObserver(check);
+observer.observe(document, {childList: true, subtree: true});
+timer = setTimeout(function() { finish(null); }, timeout);
+check();
+"""
+
+# Starts recording the loading of the page before the action which triggers it, so a short-lived spinner can not be missed.
+# The watch records if the spinner appeared, and if the target element has been changed or replaced.
+WATCH_LOADING = """
+var name = arguments[0], spinner = arguments[1], target = arguments[2];
+var watches = window.__smartxWatches = window.__smartxWatches || {};
+if (watches[name]) { watches[name].observer.disconnect(); }
+var watch = watches[name] = {spinner: spinner, target: document.querySelector(target), spinner_seen: false, changed: false};
+watch.observer = new MutationObserver(function(mutations) {
+    if (document.querySelector(spinner)) { watch.spinner_seen = true; }
+    for (var i = 0; i < mutations.length && watch.target && !watch.changed; i++) {
+        watch.changed = watch.target.contains(mutations[i].target);
+    }
+});
+watch.observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+"""
+
+# Resolves with "loaded" once the spinner is gone & the page reacted to the action (spinner seen, target changed or replaced),
+# "not_started" if the page did not react within the appear timeout, "loading" if the spinner is still displayed after the timeout.
+# Resolves with "no_watch" if the page was reloaded since the watch started.
+WAIT_FOR_LOADING = """
+var name = arguments[0], appear_timeout = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+var watch = window.__smartxWatches && window.__smartxWatches[name];
+if (!watch) { return done("no_watch"); }
+var observer, timer;
+function finish(result) {
+    watch.observer.disconnect();
+    delete window.__smartxWatches[name];
+    if (observer) { observer.disconnect(); }
+    clearTimeout(timer);
+    done(result);
+}
+function check() {
+    if (document.querySelector(watch.spinner)) {
+        watch.spinner_seen = true;
+        return false;
+    }
+    return watch.spinner_seen || watch.changed || (watch.target && !watch.target.isConnected);
+}
+if (check()) { return finish("loaded"); }
+observer = new MutationObserver(function() {
+    if (check()) { finish("loaded"); }
+});
+observer.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(function() {
+    if (!watch.spinner_seen) { return finish("not_started"); }
+    timer = setTimeout(function() { finish("loading"); }, timeout - appear_timeout);
+}, appear_timeout);
+"""
+
+# State of a watch started by WATCH_LOADING, without waiting: "loaded" once the spinner was seen and is gone,
+# "loading" while the spinner is displayed, "not_started" if the spinner was not seen yet, "no_watch" if the page was reloaded.
+GET_LOADING_WATCH = """
+var watch = window.__smartxWatches && window.__smartxWatches[arguments[0]];
+if (!watch) { return "no_watch"; }
+if (document.querySelector(watch.spinner)) { watch.spinner_seen = true; return "loading"; }
+if (!watch.spinner_seen) { return "not_started"; }
+watch.observer.disconnect();
+delete window.__smartxWatches[arguments[0]];
+return "loaded";
+"""
+
+# Counts the fetch/XHR requests in flight, and records the time of the last request or DOM mutation.
+# Installed once per document, either before the page scripts (Chrome DevTools protocol) or by WAIT_FOR_QUIESCENCE.
+NETWORK_TRACKER = """
+(function() {
+    if (window.__smartxNetwork) { return; }
+    var state = window.__smartxNetwork = {pending: 0, last_activity: Date.now()};
+    function start() { state.pending++; state.last_activity = Date.now(); }
+    function end() { state.pending = Math.max(state.pending - 1, 0); state.last_activity = Date.now(); }
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function() {
+            start();
+            return fetch.apply(this, arguments).then(
+                function(response) { end(); return response; },
+                function(error) { end(); throw error; }
+            );
+        };
+    }
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        start();
+        this.addEventListener("loadend", end);
+        try {
+            return send.apply(this, arguments);
+        } catch (error) {
+            end();
+            throw error;
+        }
+    };
+    new MutationObserver(function() { state.last_activity = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+})();
+"""
+
+# The document & the view shown by the browser: a new document has a new time origin, a single-page app view has a new url
+GET_NAVIGATION_EPOCH = "return [performance.timeOrigin, window.location.href];"
+
+# Resolves with true once the page is loaded, no request is in flight and nothing changed for the quiet period, null on timeout.
+WAIT_FOR_QUIESCENCE = (
+    NETWORK_TRACKER
+    + """
+var quiet_period = arguments[0], timeout = arguments[1];
+var done = arguments[arguments.length - 1];
+var state = window.__smartxNetwork, start = Date.now();
+var timer = setInterval(function() {
+    var now = Date.now();
+    if (document.readyState === "complete" && state.pending === 0 && now - state.last_activity >= quiet_period) {
+        clearInterval(timer);
+        done(true);
+    } else if (now - start >= timeout) {
+        clearInterval(timer);
+        done(null);
+    }
+}, 50);
+"""
+)
+
+
+class UnsupportedScript(WebDriverException):
+    """
+    Raised by a webdriver which can not run a script at all, ex the fake webdriver for the scripts it does not emulate
+    """
+
+
+def is_script_unsupported(error):
+    """
+    Check if the error means that the browser can not run the scripts of the waits, from the type of the error only.
+    The other errors (unexpected alert, closed window, stale element...) are transient, the browser-side waits are kept for the next waits.
+        :param error: The WebDriverException raised while running a script
+        :returns: bool
+    """
+    return isinstance(
+        error, (JavascriptException, UnknownMethodException, UnsupportedScript)
+    )
+
+
+class presence_of_elements_located:
+    """
+    Expected condition returning the list of the elements found by the locator, with a single find_elements per check.
+    The list is returned once at least min_count elements are found and their number did not change for the settle period.
+    """
+
+    def __init__(self, locator, min_count=1, settle=0, parent=None):
+        """
+        :param locator: The (by, select) locator of the elements
+        :param min_count: The minimum number of elements, at least 1
+        :param settle: The time in seconds for which the number of elements should not change
+        :param parent: The web-element in which the elements are searched, the page if None
+        """
+        self.locator = locator
+        self.min_count = max(min_count, 1)
+        self.settle = settle
+        self.parent = parent
+        self.count = None
+        self.count_since = None
+
+    def __call__(self, driver):
+        elements = (self.parent or driver).find_elements(*self.locator)
+        if len(elements) < self.min_count:
+            self.count = None
+            return False
+        now = time.monotonic()
+        if len(elements) != self.count:
+            self.count = len(elements)
+            self.count_since = now
+        if now - self.count_since >= self.settle:
+            return elements
+        return False
+
+
+FALLBACK_CONDITIONS = {
+    PRESENT: EC.presence_of_element_located,
+    VISIBLE: EC.visibility_of_element_located,
+    CLICKABLE: EC.element_to_be_clickable,
+    INVISIBLE: EC.invisibility_of_element_located,
+}
+LOCATORS = {
+    By.CSS_SELECTOR: ("css", "{}"),
+    By.ID: ("css", '[id="{}"]'),
+    By.NAME: ("css", '[name="{}"]'),
+    By.XPATH: ("xpath", "{}"),
+}
+# Extra time given to the browser over the wait timeout, before the script is considered hung
+SCRIPT_TIMEOUT_MARGIN = 10
+# State of the browser-side waits per webdriver: {"supported": bool, "script_timeout": int}
+BROWSER_STATES = weakref.WeakKeyDictionary()
+
+
+class BrowserWait:
+    """
+    Waits for a condition on an element inside the page, with a MutationObserver, in a single execute_async_script call.
+
+    The call returns as soon as the DOM matches, instead of polling the browser every 0.5 seconds.
+    The python-side WebDriverWait is used if the browser can not run the script, or for the locators not supported by the script.
+
+    The durations of the successful waits are recorded to the timeout policy. With a component, the timeout of each wait is taken from the policy.
+    The waits are shrunk to the remaining time budget of the test, if any.
+    """
+
+    def __init__(self, browser, timeout, component=None):
+        """
+        :param browser: The instance of the selenium webdriver
+        :param timeout: The amount of time to wait, in seconds
+        :param component: The name of the component doing the waits. If provided, the timeout is only the default of the timeout policy.
+        """
+        self.browser = browser
+        self.timeout = timeout
+        self.component = component
+
+    def until(self, condition, by, select, msg=""):
+        """
+        Wait for the condition to match the first element found by the locator.
+            :param condition: One of PRESENT, VISIBLE, CLICKABLE, INVISIBLE, HAS_TEXT, ABSENT
+            :param by: The type of the selenium locator
+            :param select: The selector text of type mentioned in by
+            :param msg: The error-msg which should be mentioned in the TimeoutException
+            :returns: The web element, or a truthy value for INVISIBLE & ABSENT
+        """
+        return self._run(
+            condition,
+            select,
+            msg,
+            lambda timeout: self._until(
+                by,
+                lambda: self._until_in_browser(condition, by, select, msg, timeout),
+                lambda: self._until_in_python(condition, by, select, msg, timeout),
+            ),
+        )
+
+    def until_elements(self, by, select, min_count=1, settle=0, msg=""):
+        """
+        Wait for the elements found by the locator, and get them from the same call which confirms their presence.
+            :param by: The type of the selenium locator
+            :param select: The selector text of type mentioned in by
+            :param min_count: The minimum number of elements to wait for, at least 1
+            :param settle: The time in seconds for which the number of elements should not change, ex while a table is rendered
+            :param msg: The error-msg which should be mentioned in the TimeoutException
+            :returns: The list of web elements
+        """
+        min_count = max(min_count, 1)
+
+        def _in_python(timeout):
+            return WebDriverWait(self.browser, timeout).until(
+                presence_of_elements_located((by, select), min_count, settle), msg
+            )
+
+        return self._run(
+            ELEMENTS,
+            select,
+            msg,
+            lambda timeout: self._until(
+                by,
+                lambda: self._until_elements_in_browser(
+                    by, select, min_count, settle, msg, timeout
+                ),
+                lambda: _in_python(timeout),
+            ),
+        )
+
+    def _run(self, condition, select, msg, wait):
+        key = "{}:{}".format(condition, select)
+        timeout_policy = get_timeout_policy()
+        timeout = self.timeout
+        if self.component:
+            timeout = timeout_policy.get_timeout(self.timeout, key, self.component)
+        start_time = time.monotonic()
+        result = run_within_deadline(msg or key, timeout, wait)
+        timeout_policy.record(key, time.monotonic() - start_time)
+        return result
+
+    def _until(self, by, in_browser, in_python):
+        if by in LOCATORS and self.is_supported():
+            try:
+                return in_browser()
+            except TimeoutException:
+                raise
+            except WebDriverException as e:
+                self._on_script_error(e)
+        return in_python()
+
+    def _on_script_error(self, error):
+        if is_script_unsupported(error):
+            LOGGER.debug(
+                "Browser-side wait is not supported, falling back to WebDriverWait: {}".format(
+                    error
+                )
+            )
+            self._get_state()["supported"] = False
+        else:
+            LOGGER.debug(
+                "Browser-side wait failed, falling back to WebDriverWait for this wait: {}".format(
+                    error
+                )
+            )
+
+    @contextmanager
+    def watch_loading(self, spinner, target, appear_timeout=5):
+        """
+        Wait for the page to load after the actions done in the with block. The observer is started before the actions,
+        so the spinner is detected even if it is displayed for a shorter time than a poll interval.
+
+        Returns as soon as the spinner disappeared, or the target element is re-rendered without any spinner.
+        Raises TimeoutException if the page did not react within appear_timeout, or the spinner did not disappear within the timeout.
+            :param spinner: The (by, select) locator of the loading spinner
+            :param target: The (by, select) locator of the element re-rendered by the actions
+            :param appear_timeout: The amount of time given to the spinner to appear, in seconds
+        """
+        watch_name = self.start_loading_watch(spinner, target)
+        yield
+        if watch_name is None:
+            BrowserWait(self.browser, appear_timeout).until(
+                PRESENT, *spinner, msg="Loading spinner did not appear"
+            )
+            self.until(INVISIBLE, *spinner, msg="Loading spinner did not disappear")
+            return
+        self._run(
+            "loading",
+            spinner[1],
+            "Loading spinner did not disappear",
+            lambda timeout: self._wait_for_loading(watch_name, appear_timeout, timeout),
+        )
+
+    def start_loading_watch(self, spinner, target):
+        """
+        Start observing the spinner in the browser, before the action which displays it.
+            :param spinner: The (by, select) locator of the loading spinner
+            :param target: The (by, select) locator of the element re-rendered by the action
+            :returns: The name of the watch, None if the browser can not run the watch
+        """
+        watch_name = "loading:{}".format(spinner[1])
+        if spinner[0] != By.CSS_SELECTOR or target[0] != By.CSS_SELECTOR:
+            return None
+        if not self.is_supported():
+            return None
+        try:
+            self.browser.execute_script(
+                WATCH_LOADING, watch_name, spinner[1], target[1]
+            )
+            return watch_name
+        except WebDriverException as e:
+            self._on_script_error(e)
+            return None
+
+    def get_loading_watch(self, watch_name):
+        """
+        Get the state of a watch started with start_loading_watch, without waiting.
+            :param watch_name: The name returned by start_loading_watch
+            :returns: "loaded" once the spinner was seen and is gone, "loading", "not_started" or "no_watch"
+        """
+        return self.browser.execute_script(GET_LOADING_WATCH, watch_name)
+
+    def track_network(self):
+        """
+        Enable the quiescence wait of settle() for the browser, and track the requests from the start of each new page.
+        Without the Chrome DevTools protocol, the requests are tracked from the first quiescence wait in each page.
+        """
+        self._get_state()["quiescence"] = True
+        try:
+            self.browser.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER}
+            )
+        except (AttributeError, WebDriverException) as e:
+            LOGGER.debug(
+                "Could not track the requests from the start of the pages: {}".format(e)
+            )
+
+    def wait_for_quiescence(self, quiet_period=0.5, msg="The page did not settle"):
+        """
+        Wait for the page to settle: loaded, no fetch/XHR request in flight and no DOM mutation for the quiet period.
+        Raises TimeoutException if the page did not settle.
+            :param quiet_period: The time without any request or DOM mutation, in seconds
+            :param msg: The error-msg which should be mentioned in the TimeoutException
+            :returns: True if the page settled, False if the wait script could not be run
+        """
+        if not self.is_supported():
+            return False
+        try:
+            return run_within_deadline(
+                msg,
+                self.timeout,
+                lambda timeout: self._wait_for_quiescence(quiet_period, msg, timeout),
+            )
+        except TimeoutException:
+            raise
+        except WebDriverException as e:
+            self._on_script_error(e)
+            return False
+
+    def settle(self, quiet_period=0.5):
+        """
+        Wait for the page to settle, only if track_network was called for the browser.
+        The page not settling is not an error, the caller continues with its own waits.
+            :param quiet_period: The time without any request or DOM mutation, in seconds
+        """
+        if not self._get_state().get("quiescence"):
+            return
+        try:
+            self.wait_for_quiescence(quiet_period)
+        except TimeoutException:
+            LOGGER.debug("The page did not settle in {} seconds".format(self.timeout))
+
+    def _wait_for_quiescence(self, quiet_period, msg, timeout):
+        self._set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+        if not self.browser.execute_async_script(
+            WAIT_FOR_QUIESCENCE, int(quiet_period * 1000), int(timeout * 1000)
+        ):
+            raise TimeoutException(msg)
+        return True
+
+    def get_navigation_epoch(self):
+        """
+        Identify the page shown by the browser, so that the web-elements cached by the components are located again after a navigation.
+        The browser reports its document & url itself, so any navigation is seen (browser.get, link, redirect, single-page app view).
+            :returns: tuple (the number of navigations noted with note_navigation, the document & url reported by the browser)
+                The document & url are None if the browser can not run the script.
+        """
+        page = None
+        try:
+            page = self.browser.execute_script(GET_NAVIGATION_EPOCH)
+        except WebDriverException as e:
+            LOGGER.debug("Could not get the page of the browser: {}".format(e))
+        if isinstance(page, list):
+            page = tuple(page)
+        return self._get_state().get("navigation_epoch", 0), page
+
+    def note_navigation(self):
+        """
+        Note that the browser navigated to another page, so that the web-elements cached by the components are located again.
+        Needed only for the browsers which can not report their page to get_navigation_epoch.
+        """
+        state = self._get_state()
+        state["navigation_epoch"] = state.get("navigation_epoch", 0) + 1
+
+    def is_supported(self):
+        """
+        False once the browser failed to run the wait script.
+        """
+        return self._get_state()["supported"]
+
+    def _get_state(self):
+        if self.browser not in BROWSER_STATES:
+            BROWSER_STATES[self.browser] = {"supported": True, "script_timeout": 0}
+        return BROWSER_STATES[self.browser]
+
+    def _set_script_timeout(self, script_timeout):
+        state = self._get_state()
+        if state["script_timeout"] < script_timeout:
+            self.browser.set_script_timeout(script_timeout)
+            state["script_timeout"] = script_timeout
+
+    def _wait_for_loading(self, watch_name, appear_timeout, timeout):
+        appear_timeout = min(appear_timeout, timeout)
+        self._set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+        result = self.browser.execute_async_script(
+            WAIT_FOR_LOADING,
+            watch_name,
+            int(appear_timeout * 1000),
+            int(timeout * 1000),
+        )
+        if result == "not_started":
+            raise TimeoutException("Loading spinner did not appear")
+        if result == "loading":
+            raise TimeoutException("Loading spinner did not disappear")
+
+    def _until_in_browser(self, condition, by, select, msg, timeout):
+        self._set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+        locator_type, locator = LOCATORS[by]
+        result = self.browser.execute_async_script(
+            WAIT_FOR_CONDITION,
+            condition,
+            locator_type,
+            locator.format(select),
+            int(timeout * 1000),
+        )
+        if not result:
+            raise TimeoutException(msg)
+        return result
+
+    def _until_elements_in_browser(self, by, select, min_count, settle, msg, timeout):
+        self._set_script_timeout(timeout + SCRIPT_TIMEOUT_MARGIN)
+        locator_type, locator = LOCATORS[by]
+        result = self.browser.execute_async_script(
+            WAIT_FOR_ELEMENTS,
+            locator_type,
+            locator.format(select),
+            min_count,
+            int(settle * 1000),
+            int(timeout * 1000),
+        )
+        if not result:
+            raise TimeoutException(msg)
+        return result
+
+    def _until_in_python(self, condition, by, select, msg, timeout):
+        wait = WebDriverWait(self.browser, timeout)
+        if condition == HAS_TEXT:
+
+            def _has_text(driver):
+                element = driver.find_element(by, select)
+                return element if len(element.text.strip()) > 0 else False
+
+            return wait.until(_has_text, msg)
+        if condition == ABSENT:
+            return wait.until(lambda driver: not driver.find_elements(by, select), msg)
+        return wait.until(FALLBACK_CONDITIONS[condition]((by, select)), msg)
@@ -16,15 +16,28 @@
 
 import re
 from collections import namedtuple
-from time import sleep
 
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.action_chains import ActionChains as action_chains
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from ..browser_wait import (
+    ABSENT,
+    CLICKABLE,
+    HAS_TEXT,
+    INVISIBLE,
+    PRESENT,
+    BrowserWait,
+    presence_of_elements_located,
+)
+from ..deadline import DeadlineWait
+from ..element_cache import cache_element
+from ..timeouts import get_timeout_policy
 
 DEFAULT_TIMEOUT = 20
+# Time given to an element to appear or disappear, for the checks which should not wait for DEFAULT_TIMEOUT
+GRACE_PERIOD = 2
 
 
 class ActionChains(action_chains):
@@ -52,6 +65,10 @@ class BaseComponent:
     - In a container, there should be only one component of the same type.
     """
 
+    # Opt-in: reuse the web-elements found by get_element & the attribute access, instead of locating them on each access.
+    # Set it on a component class, or on BaseComponent to enable it for all the components.
+    cache_elements = False
+
     def __init__(self, browser, container):
         """
         :param browser: The instance of the selenium webdriver
@@ -59,8 +76,26 @@ class BaseComponent:
         """
         self.elements = dict()
         self.browser = browser
-        self.wait = WebDriverWait(self.browser, DEFAULT_TIMEOUT)
+        self.timeout_policy = get_timeout_policy()
+        self.wait = DeadlineWait(
+            self.browser,
+            self.timeout_policy.get_timeout(
+                DEFAULT_TIMEOUT, component=type(self).__name__
+            ),
+        )
+        self.browser_wait = BrowserWait(
+            self.browser, DEFAULT_TIMEOUT, component=type(self).__name__
+        )
         self.elements["container"] = container
+        self._element_cache = dict()
+
+    def set_timeout(self, timeout):
+        """
+        Use a fixed timeout for all the waits of the component, instead of the timeout policy.
+            :param timeout: The amount of time to wait, in seconds
+        """
+        self.wait = DeadlineWait(self.browser, timeout)
+        self.browser_wait = BrowserWait(self.browser, timeout)
 
     def get_clear_text(self, web_element):
         """
@@ -73,27 +108,50 @@ class BaseComponent:
     def get_element(self, key):
         """
         Get the web-element.
+        With cache_elements, the web-element found previously is returned, and it is located again if it became stale.
 
         Note: There is a wait in get_element.
             :param key: The key of the element mentioned in self.elements
             :returns: element The element we are looking for by key
         """
         element = self.elements[key]
-        return self._get_element(element.by, element.select)
+        if not self.cache_elements:
+            return self._get_element(element.by, element.select)
+        navigation_epoch = self.browser_wait.get_navigation_epoch()
+        cached = self._element_cache.get(element)
+        if cached and cached[0] == navigation_epoch:
+            return cached[1]
+        web_element = cache_element(
+            self._get_element(element.by, element.select),
+            lambda: self._get_element(element.by, element.select),
+        )
+        self._element_cache[element] = (navigation_epoch, web_element)
+        return web_element
+
+    def clear_element_cache(self):
+        """
+        Forget the web-elements cached by the component
+        """
+        self._element_cache.clear()
 
-    def get_elements(self, key):
+    def get_elements(self, key, min_count=1, settle=0):
         """
-        Get the list of web-elements.
+        Get the list of web-elements. The elements are returned by the same call which waits for them.
 
         Note: There is a wait in the method.
             :param key: The key of the element mentioned in self.elements
+            :param min_count: The minimum number of elements to wait for
+            :param settle: The time in seconds for which the number of elements should not change, to get a stable list
             :returns: list of elements we are searching for by key, or an empty list
         """
         try:
-            self.wait_for(key)
-            element = self.elements[key]
-            return self._get_elements(element.by, element.select)
-        except:
+            return self.browser_wait.until_elements(
+                *self.get_tuple(key),
+                min_count=min_count,
+                settle=settle,
+                msg="{} elements are not present".format(key)
+            )
+        except WebDriverException:
             return list()
 
     def get_child_element(self, key):
@@ -109,7 +167,7 @@ class BaseComponent:
         element = self.elements[key]
         return self._get_child_element(element.by, element.select)
 
-    def get_child_elements(self, key):
+    def get_child_elements(self, key, min_count=1, settle=0):
         """
         Get the list of web-elements located inside the container. Returns empty list of no elements found.
             - It is more preferable to use get_child_elements over get_elements.
@@ -117,13 +175,18 @@ class BaseComponent:
 
         Note: There is a wait in the method.
             :param key: The key of the element mentioned in self.elements
+            :param min_count: The minimum number of elements to wait for
+            :param settle: The time in seconds for which the number of elements should not change, to get a stable list
             :returns: list The child elements of the element searched by key
         """
         try:
-            self.wait_for(key)
-            element = self.elements[key]
-            return self._get_child_elements(element.by, element.select)
-        except:
+            return self.wait.until(
+                presence_of_elements_located(
+                    self.get_tuple(key), min_count, settle, parent=self.container
+                ),
+                "{} elements are not present in the container".format(key),
+            )
+        except WebDriverException:
             return list()
 
     def get_tuple(self, key):
@@ -144,13 +207,16 @@ class BaseComponent:
             :param timeout: The amount of time specified to wait for the wait function
         """
         if timeout:
-            wait = WebDriverWait(self.browser, timeout)
+            wait = DeadlineWait(self.browser, timeout)
         else:
             wait = self.wait
         if key in self.elements:
             if not msg:
                 msg = "{} element is not present".format(key)
-            return wait.until(EC.presence_of_element_located(self.get_tuple(key)), msg)
+            browser_wait = (
+                BrowserWait(self.browser, timeout) if timeout else self.browser_wait
+            )
+            return browser_wait.until(PRESENT, *self.get_tuple(key), msg=msg)
         else:
             if not msg:
                 msg = "{}: Timeout while waiting for the condition to be true".format(
@@ -167,10 +233,7 @@ class BaseComponent:
         if not msg:
             msg = "Text not present in element {}".format(key)
 
-        def _wait_for_text(browser):
-            return len(self.get_element(key).text.strip()) > 0
-
-        return self.wait_for(_wait_for_text, msg)
+        return self.browser_wait.until(HAS_TEXT, *self.get_tuple(key), msg=msg)
 
     def wait_until(self, key, msg=None):
         """
@@ -180,7 +243,85 @@ class BaseComponent:
         """
         if not msg:
             msg = "{} element did not disappear".format(key)
-        self.wait.until(EC.invisibility_of_element_located(self.get_tuple(key)), msg)
+        self.browser_wait.until(INVISIBLE, *self.get_tuple(key), msg=msg)
+
+    def count_now(self, key):
+        """
+        Count the web-elements in the page, without waiting for them to appear.
+            :param key: The key of the element mentioned in self.elements
+            :returns: Int The number of elements found
+        """
+        element = self.elements[key]
+        return len(self.browser.find_elements(element.by, element.select))
+
+    def is_present(self, key, timeout=0):
+        """
+        Check if the web-element is present in the page, without waiting for the DEFAULT_TIMEOUT.
+            :param key: The key of the element mentioned in self.elements
+            :param timeout: The grace period in seconds given to the element to appear. The page is checked only once if 0.
+            :returns: True if the element is present
+        """
+        if not timeout:
+            return self.count_now(key) > 0
+        try:
+            self.wait_for(key, timeout=timeout)
+            return True
+        except TimeoutException:
+            return False
+
+    def assert_absent(self, key, timeout=0, msg=None):
+        """
+        Assert that the web-element is not present in the page. Raises AssertionError otherwise.
+            :param key: The key of the element mentioned in self.elements
+            :param timeout: The grace period in seconds given to the element to disappear. The page is checked only once if 0.
+            :param msg: The error-msg which should be mentioned in the AssertionError
+        """
+        if not msg:
+            msg = "{} element is present".format(key)
+        if not timeout:
+            assert self.count_now(key) == 0, msg
+            return
+        try:
+            BrowserWait(self.browser, timeout).until(
+                ABSENT, *self.get_tuple(key), msg=msg
+            )
+        except TimeoutException:
+            raise AssertionError(msg)
+
+    def wait_for_any(self, conditions, msg=None, timeout=None):
+        """
+        Wait for the first of several conditions to be true, checking all of them in a single wait. Raises TimeoutException if none of them is true.
+            :param conditions: Dict of {name: condition}. A condition is either the key of an element mentioned in self.elements, which should be present, or a function taking the webdriver as argument.
+            :param msg: The error-msg which should be mentioned in the TimeoutException
+            :param timeout: The amount of time specified to wait for the wait function
+            :returns: The name of the condition which is true. The conditions are checked in the order of the dict.
+        """
+        if not msg:
+            msg = "None of {} is true".format(list(conditions))
+
+        def _any_condition(driver):
+            for name, condition in conditions.items():
+                if callable(condition):
+                    if condition(driver):
+                        return name
+                elif self.count_now(condition) > 0:
+                    return name
+            return False
+
+        wait = DeadlineWait(self.browser, timeout) if timeout else self.wait
+        return wait.until(_any_condition, msg)
+
+    def wait_for_quiescence(self, quiet_period=0.5, msg=None):
+        """
+        Wait for the page to settle: loaded, no fetch/XHR request in flight and no DOM mutation for the quiet period.
+        Raises TimeoutException if the page did not settle.
+            :param quiet_period: The time without any request or DOM mutation, in seconds
+            :param msg: The error-msg which should be mentioned in the TimeoutException
+            :returns: True if the page settled, False if the browser can not run the wait script
+        """
+        if not msg:
+            msg = "The page did not settle"
+        return self.browser_wait.wait_for_quiescence(quiet_period, msg)
 
     def wait_to_display(self):
         """
@@ -191,23 +332,22 @@ class BaseComponent:
     def wait_to_be_stale(self, key, msg=None):
         if not msg:
             msg = "{} element is not stale.".format(key)
-        wait = WebDriverWait(self.browser, DEFAULT_TIMEOUT)
         try:
-            wait.until(EC.staleness_of(key), msg)
+            self.wait.until(EC.staleness_of(key), msg)
             return True
         except TimeoutException:
             pass
 
     def wait_to_be_clickable(self, key, msg=None):
         """
-        Wait for an web element to be invisible. Raises TimeoutException if the element does not dissapear.
+        Wait for an web element to be visible & enabled. Raises TimeoutException if the element is not clickable.
             :param key: The key of the element mentioned in self.elements
             :param msg: The error-msg which should be mentioned in the TimeoutException
+            :returns: The clickable web element
         """
         if not msg:
             msg = "{} element is not clickable".format(key)
-        self.wait.until(EC.element_to_be_clickable(self.get_tuple(key)), msg)
-        sleep(1)
+        return self.browser_wait.until(CLICKABLE, *self.get_tuple(key), msg=msg)
 
     def __getattr__(self, key):
         """
@@ -240,7 +380,7 @@ class BaseComponent:
             :returns: The webelement we are accessing
         """
         msg = "by={} select={} Element not found in the page".format(by, select)
-        return self.wait.until(EC.presence_of_element_located((by, select)), msg)
+        return self.browser_wait.until(PRESENT, by, select, msg=msg)
 
     def _get_elements(self, by, select):
         """
@@ -15,9 +15,17 @@
 #
 
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
 
 from ..base_component import BaseComponent, Selector
 
+# Text of the label, without the text of the child elements
+GET_LABEL_TEXT = (
+    "if(arguments[0].hasChildNodes()){var r='';var C=arguments[0].childNodes;"
+    "for(var n=0;n<C.length;n++){if(C[n].nodeType==Node.TEXT_NODE){r+=' '+C[n].nodeValue}}"
+    "return r.trim()}else{return arguments[0].innerText}"
+)
+
 
 class BaseControl(BaseComponent):
     """
@@ -61,14 +69,34 @@ class BaseControl(BaseComponent):
     def get_help_text(self):
         return self.get_clear_text(self.help_text)
 
+    def wait_for_popover(self, key):
+        """
+        Wait for the popover opened by the element to be present in the page.
+            :param key: The key of the element which opens the popover. The element gets the data-test-popover-id attribute once the popover is opened.
+            :returns: str The css selector of the popover
+        """
+
+        def _popover_opened(driver):
+            popover_id = self.get_element(key).get_attribute("data-test-popover-id")
+            if popover_id and driver.find_elements(By.CSS_SELECTOR, "#" + popover_id):
+                return "#" + popover_id
+            return False
+
+        return self.wait_for(_popover_opened, msg="{} popover did not open".format(key))
+
+    def wait_for_popover_to_close(self, popover):
+        """
+        Wait for the popover to be removed from the page or hidden.
+            :param popover: The css selector of the popover, as returned by wait_for_popover
+        """
+        self.wait_for(
+            EC.invisibility_of_element_located((By.CSS_SELECTOR, popover)),
+            msg="{} popover did not close".format(popover),
+        )
+
     def get_input_label(self):
         """
         get field label value
         """
-        GET_PARENT_ELEMENT = (
-            "if(arguments[0].hasChildNodes()){var r='';var C=arguments[0].childNodes;"
-            "for(var n=0;n<C.length;n++){if(C[n].nodeType==Node.TEXT_NODE){r+=' '+C[n].nodeValue}}"
-            "return r.trim()}else{return arguments[0].innerText}"
-        )
-        parent_text = self.browser.execute_script(GET_PARENT_ELEMENT, self.label_text)
+        parent_text = self.browser.execute_script(GET_LABEL_TEXT, self.label_text)
         return parent_text
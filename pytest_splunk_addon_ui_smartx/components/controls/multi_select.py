@@ -13,9 +13,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-import time
-
-from selenium.common.exceptions import ElementClickInterceptedException
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    StaleElementReferenceException,
+)
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
@@ -81,15 +82,12 @@ class MultiSelect(BaseControl):
             :return: Bool returns true if selection was successful, else raises an exception
         """
         try:
-            time.sleep(1)
             try:
-                self.input.click()
+                self.wait_to_be_clickable("input").click()
             except ElementClickInterceptedException:
                 self.label_text.click()
-                time.sleep(1)
-                self.input.click()
-            time.sleep(1)
-            popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+                self.wait_to_be_clickable("input").click()
+            popoverid = self.wait_for_popover("dropdown")
 
         except:
             raise Exception("dropdown not found")
@@ -100,6 +98,10 @@ class MultiSelect(BaseControl):
         for each in self.get_elements("values"):
             if each.text.strip().lower() == value.lower():
                 each.click()
+                self.wait_for(
+                    lambda driver: self._is_selected(value),
+                    msg="{} was not added to the selected values".format(value),
+                )
                 self.wait_for("input")
                 return True
         else:
@@ -113,10 +115,18 @@ class MultiSelect(BaseControl):
         """
         for each in self.get_child_elements("selected"):
             if each.text.strip().lower() == value.lower():
-                time.sleep(1)
-                each.find_element(
+                crossmark = each.find_element(
                     *list(self.elements["deselect"]._asdict().values())
-                ).click()
+                )
+                self.wait_for(
+                    lambda driver: crossmark.is_displayed() and crossmark.is_enabled(),
+                    msg="{} can not be deselected".format(value),
+                )
+                crossmark.click()
+                self.wait_for(
+                    lambda driver: self._is_selected(value) is False,
+                    msg="{} was not removed from the selected values".format(value),
+                )
                 self.wait_for("internal_container")
                 return True
         else:
@@ -136,16 +146,29 @@ class MultiSelect(BaseControl):
         """
         return [each.text.strip() for each in self.get_child_elements("selected")]
 
+    def _is_selected(self, value):
+        """
+        Check if the value is in the selected values, without waiting for them to appear
+            :param value: the value to look for
+            :returns: Bool True if the value is selected, None while the selected values are rendered again
+        """
+        try:
+            return any(
+                each.text.strip().lower() == value.lower()
+                for each in self.browser.find_elements(*self.get_tuple("selected"))
+            )
+        except StaleElementReferenceException:
+            return None
+
     def list_of_values(self):
         """
         Get list of possible values to select from dropdown
             :returns: List of options within the multi-select dropdown
         """
         self.wait_for("internal_container")
-        time.sleep(1)
         list_of_values = []
-        self.input.click()
-        popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+        self.wait_to_be_clickable("input").click()
+        popoverid = self.wait_for_popover("dropdown")
         self.elements.update(
             {
                 "values": Selector(
@@ -169,7 +192,7 @@ class MultiSelect(BaseControl):
             :returns: List of visible options within the multi-select dropdown
         """
         self.input.click()
-        popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+        popoverid = self.wait_for_popover("dropdown")
         self.elements.update(
             {
                 "values": Selector(
@@ -14,9 +14,6 @@
 # limitations under the License.
 #
 
-import time
-from time import sleep
-
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
@@ -79,9 +76,9 @@ class SingleSelect(BaseControl):
         if self.allow_new_values:
             if self.get_value():
                 self.cancel_selected.click()
-            popoverid = "#" + self.combobox.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("combobox")
         else:
-            popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("dropdown")
         self.elements.update(
             {"values": Selector(select=popoverid + ' [data-test="option"]')}
         )
@@ -90,7 +87,7 @@ class SingleSelect(BaseControl):
             if each.text.strip().lower() == value.lower():
                 each.click()
                 self.wait_for("internal_container")
-                sleep(0.25)
+                self.wait_for_popover_to_close(popoverid)
                 return True
         else:
             raise ValueError("{} not found in select list".format(value))
@@ -115,7 +112,7 @@ class SingleSelect(BaseControl):
                     }
                 )
             else:
-                popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+                popoverid = self.wait_for_popover("dropdown")
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
                 )
@@ -141,7 +138,7 @@ class SingleSelect(BaseControl):
                 )
             else:
                 self.dropdown.click()
-                popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+                popoverid = self.wait_for_popover("dropdown")
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
                 )
@@ -165,12 +162,12 @@ class SingleSelect(BaseControl):
         if open_dropdown:
             self.dropdown.click()
         if self.allow_new_values:
-            popoverid = "#" + self.combobox.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("combobox")
             self.elements.update(
                 {"values": Selector(select=popoverid + ' [data-test="option"]')}
             )
         else:
-            popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("dropdown")
             self.elements.update(
                 {
                     "values": Selector(
@@ -213,7 +210,7 @@ class SingleSelect(BaseControl):
                 )
             else:
                 self.dropdown.click()
-                popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+                popoverid = self.wait_for_popover("dropdown")
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
                 )
@@ -225,8 +222,7 @@ class SingleSelect(BaseControl):
         Cancels the currently selected value in the SingleSelect
             :return: Bool whether or not canceling the selected item was successful, else raises a error
         """
-        sleep(1)
-        self.dropdown.click()
+        self.wait_to_be_clickable("dropdown").click()
         self.wait_to_be_clickable("cancel_selected")
         self.cancel_selected.click()
         return True
@@ -237,8 +233,7 @@ class SingleSelect(BaseControl):
             :returns: list of options avaialble within the single select
         """
         selected_val = self.get_value()
-        sleep(1)
-        self.dropdown.click()
+        self.wait_to_be_clickable("dropdown").click()
         first_element = None
         list_of_values = []
 
@@ -251,9 +246,9 @@ class SingleSelect(BaseControl):
                         )
                     }
                 )
-            popoverid = "#" + self.combobox.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("combobox")
         else:
-            popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("dropdown")
             if self.searchable:
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
@@ -294,7 +289,7 @@ class SingleSelect(BaseControl):
                         )
                     }
                 )
-            popoverid = "#" + self.combobox.get_attribute("data-test-popover-id")
+            popoverid = self.wait_for_popover("combobox")
             self.elements.update(
                 {
                     "values": Selector(
@@ -304,12 +299,11 @@ class SingleSelect(BaseControl):
                 }
             )
         else:
+            popoverid = self.wait_for_popover("dropdown")
             if self.searchable:
-                popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
                 )
-            popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
             self.elements.update(
                 {"values": Selector(select=popoverid + ' [data-test="option"]')}
             )
@@ -370,7 +364,7 @@ class SingleSelect(BaseControl):
                 )
             else:
                 self.dropdown.click()
-                popoverid = "#" + self.dropdown.get_attribute("data-test-popover-id")
+                popoverid = self.wait_for_popover("dropdown")
                 self.elements.update(
                     {"input": Selector(select=popoverid + ' [data-test="textbox"]')}
                 )
@@ -15,8 +15,8 @@
 #
 
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 
+from ...deadline import DeadlineWait
 from ..base_component import Selector
 from .base_control import BaseControl
 
@@ -68,7 +68,10 @@ class Toggle(BaseControl):
             except:
                 return False
 
-        WebDriverWait(self.browser, 10).until(try_click)
+        DeadlineWait(
+            self.browser,
+            self.timeout_policy.get_timeout(10, component=type(self).__name__),
+        ).until(try_click)
 
     def get_value(self):
         """
@@ -16,15 +16,20 @@
 
 import time
 from abc import abstractmethod
+from collections import namedtuple
 
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 
 from ..pages.page import Page
-from .base_component import BaseComponent, Selector
+from .base_component import GRACE_PERIOD, BaseComponent, Selector
 from .controls.button import Button
 from .controls.message import Message
 from .dropdown import Dropdown
 
+# The outcome of Entity.save_and_get_result. error & warning hold the text of the message, None if not displayed.
+SaveResult = namedtuple("SaveResult", ["saved", "error", "warning"])
+
 
 class Entity(BaseComponent):
     """
@@ -85,11 +90,15 @@ class Entity(BaseComponent):
         return self.msg_error.get_msg()
 
     def is_error_closed(self):
+        """
+        Check if the error message is closed. The error message is given a short grace period to disappear.
+            :returns: True if no error message is displayed
+        """
         try:
-            self.msg_error.get_msg()
-            return False
-        except:
+            self.msg_error.assert_absent("msg_text", timeout=GRACE_PERIOD)
             return True
+        except AssertionError:
+            return False
 
     def save(self, expect_error=False, expect_warning=False):
         """
@@ -98,17 +107,73 @@ class Entity(BaseComponent):
             :param expoect_warning: If True, the warning message will be fetched.
             :returns: If expect_error or expect_warning is True, then it will return the message appearing on page.
                        Otherwise, the function will return True if the configuration was saved properly
+            Raises TimeoutException if an error was expected but the entity was closed without any error.
         """
         self.save_btn.wait_to_be_clickable()
         self.save_btn.click()
         if expect_error:
+            outcome = self.wait_for_any(
+                {
+                    "error": lambda driver: self.msg_error.is_present("msg_text"),
+                    "closed": lambda driver: not self.is_present("container"),
+                },
+                msg="No error message appeared",
+            )
+            if outcome == "closed":
+                raise TimeoutException(
+                    "No error message appeared, the entity was saved and closed"
+                )
             return self.get_error()
         elif expect_warning:
             return self.get_warning()
         else:
             self.loading.wait_loading()
+            self.browser_wait.settle()
             return True
 
+    def save_and_get_result(self):
+        """
+        Save the configuration, without knowing the outcome in advance.
+        Returns as soon as an error or a warning is displayed, or the entity is saved.
+        The entity is considered saved once it is closed, or once the loading is displayed then gone.
+        The loading is observed in the browser from before the click, so a short save of a form which stays open (ex. Proxy, Logging) is detected.
+            :returns: SaveResult(saved, error, warning), with the text of the error or warning message displayed
+        """
+        self.save_btn.wait_to_be_clickable()
+        watch_name = self.browser_wait.start_loading_watch(
+            self.loading.get_tuple("container"), self.get_tuple("container")
+        )
+        self.save_btn.click()
+        loading = {"seen": False, "watch": watch_name}
+
+        def _is_saved(driver):
+            if not self.is_present("container"):
+                return True
+            if loading["watch"] is not None:
+                state = self.browser_wait.get_loading_watch(loading["watch"])
+                if state != "no_watch":
+                    return state == "loaded"
+                loading["watch"] = None
+            if self.loading.is_present("container"):
+                loading["seen"] = True
+                return False
+            return loading["seen"]
+
+        outcome = self.wait_for_any(
+            {
+                "error": lambda driver: self.msg_error.is_present("msg_text"),
+                "warning": lambda driver: self.msg_warning.is_present("msg_text"),
+                "saved": _is_saved,
+            },
+            msg="The entity was not saved, and no error or warning message appeared",
+        )
+        if outcome == "error":
+            return SaveResult(saved=False, error=self.get_error(), warning=None)
+        if outcome == "warning":
+            return SaveResult(saved=False, error=None, warning=self.get_warning())
+        self.browser_wait.settle()
+        return SaveResult(saved=True, error=None, warning=None)
+
     def cancel(self):
         """
         Cancel the entity
@@ -43,6 +43,7 @@ class Login(BaseComponent):
             "homepage": Selector(select='a[data-action="home"]'),
             "accept_checkbox": Selector(by=By.ID, select="accept"),
             "accept_button": Selector(select=" .accept-tos-button.btn.btn-primary"),
+            "login_form": container,
         }
 
     def login(self, username, password):
@@ -67,3 +68,23 @@ class Login(BaseComponent):
         except TimeoutException:
             pass
         self.wait_for("homepage", "Could not log in to the Splunk instance.")
+
+    def is_logged_in(self):
+        """
+        Wait till either the Splunk homepage or the login form is loaded.
+            :return: Bool True if the homepage is loaded, False if the login form is displayed instead
+        """
+
+        def _is_page_loaded(driver):
+            if self._get_elements(*self.get_tuple("homepage")):
+                return "homepage"
+            if self._get_elements(*self.get_tuple("login_form")):
+                return "login_form"
+            return False
+
+        return (
+            self.wait_for(
+                _is_page_loaded, "Neither Splunk homepage nor login form is loaded."
+            )
+            == "homepage"
+        )
@@ -86,10 +86,10 @@ class MessageTray(BaseComponent):
 
     def get_msg_count(self):
         """
-        Count the number of msgs in the message tray.
+        Count the number of msgs in the message tray. Does not wait for the msgs if the message tray is empty.
             :return: Int The count of the msgs
         """
-        return len(list(self._get_rows()))
+        return self.count_now("message_row")
 
     def delete_msg(self, value):
         """
@@ -130,12 +130,14 @@ class MessageTray(BaseComponent):
             .strip()
         )
 
-    def _get_rows(self):
+    def _get_rows(self, min_count=1, settle=0):
         """
         Get list of msgs
+            :param min_count: The minimum number of msgs to wait for
+            :param settle: The time in seconds for which the number of msgs should not change
             :return: The list of msgs within the component
         """
-        yield from self.get_elements("message_row")
+        yield from self.get_elements("message_row", min_count=min_count, settle=settle)
 
     def _get_row(self, value):
         """
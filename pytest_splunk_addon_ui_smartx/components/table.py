@@ -15,6 +15,7 @@
 #
 
 import copy
+import logging
 import re
 import time
 from contextlib import contextmanager
@@ -24,9 +25,45 @@ from selenium.common import exceptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
+from ..table_snapshot import TableSnapshot
 from .base_component import BaseComponent, Selector
 from .dropdown import Dropdown
 
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+
+# Text of the header cell, without the text of the sort icon & the other child elements
+GET_HEADER_TEXT = (
+    "var parent = arguments[0].firstChild.firstChild;if(parent.hasChildNodes()){var r='';var C=parent.childNodes;"
+    "for(var n=0;n<C.length;n++){if(C[n].nodeType==Node.TEXT_NODE){r+=' '+C[n].nodeValue}}"
+    "return r.trim()}else{return parent.innerText}"
+)
+
+# Headers, cell texts, status & available actions of all the rows of the page, in a single round trip.
+# arguments: rows selector, header selector, status selector, list of [action, selector], cell selector
+GET_TABLE = (
+    "var rows=document.querySelectorAll(arguments[0]);var heads=document.querySelectorAll(arguments[1]);"
+    "var actions=arguments[3];"
+    "function clear(e){return e?(e.innerText||'').replace(/\\s+/g,' ').trim():null}"
+    "function head(h){var parent=h.firstChild.firstChild;if(parent.hasChildNodes()){var r='';var C=parent.childNodes;"
+    "for(var n=0;n<C.length;n++){if(C[n].nodeType==Node.TEXT_NODE){r+=' '+C[n].nodeValue}}"
+    "return r.trim()}else{return parent.innerText}}"
+    "var result={headers:[],rows:[]};"
+    "for(var i=0;i<heads.length;i++){result.headers.push(head(heads[i]))}"
+    "for(var i=0;i<rows.length;i++){var row=rows[i];var columns={};var cells=[];var available=[];"
+    "var named=row.querySelectorAll(arguments[4]);"
+    "for(var j=0;j<named.length;j++){var c=named[j].getAttribute('data-column');if(!(c in columns)){columns[c]=clear(named[j])}}"
+    "for(var j=0;j<row.children.length;j++){cells.push(clear(row.children[j]))}"
+    "for(var j=0;j<actions.length;j++){if(row.querySelector(actions[j][1])){available.push(actions[j][0])}}"
+    "result.rows.push({columns:columns,cells:cells,status:clear(row.querySelector(arguments[2])),actions:available})}"
+    "return result"
+)
+
+# Text of the cell matching the selector in each of the given rows, null if the row has no such cell
+GET_ROW_NAMES = (
+    "var rows=arguments[0];var names=[];for(var i=0;i<rows.length;i++){var cell=rows[i].querySelector(arguments[1]);"
+    "names.push(cell?(cell.innerText||'').replace(/\\s+/g,' ').trim():null)}return names"
+)
+
 
 class Table(BaseComponent):
     """
@@ -104,6 +141,7 @@ class Table(BaseComponent):
             }
         )
         self.wait_for_seconds = wait_for_seconds
+        self._row_index = None
 
     def get_count_title(self):
         """
@@ -114,10 +152,11 @@ class Table(BaseComponent):
 
     def get_row_count(self):
         """
-        Count the number of rows in the page.
+        Count the number of rows in the page. Waits for the table to finish loading, but not for the rows if the table is empty.
             :return: Int The count of the table rows
         """
-        return len(list(self._get_rows()))
+        self._wait_for_rendered_table()
+        return self.count_now("rows")
 
     def get_headers(self):
         """
@@ -125,13 +164,8 @@ class Table(BaseComponent):
             :return: Generator for Str list The headers in the table
         """
         headers = []
-        GET_PARENT_ELEMENT = (
-            "var parent = arguments[0].firstChild.firstChild;if(parent.hasChildNodes()){var r='';var C=parent.childNodes;"
-            "for(var n=0;n<C.length;n++){if(C[n].nodeType==Node.TEXT_NODE){r+=' '+C[n].nodeValue}}"
-            "return r.trim()}else{return parent.innerText}"
-        )
         for each in self.get_elements("header"):
-            parent_text = self.browser.execute_script(GET_PARENT_ELEMENT, each)
+            parent_text = self.browser.execute_script(GET_HEADER_TEXT, each)
             headers.append(parent_text)
 
         return headers
@@ -168,8 +202,8 @@ class Table(BaseComponent):
                     and not ascending
                 ):
                     # If the column is in ascending order order and we want to have descending order, click on the column-header once
-                    each_header.click()
-                    self._wait_for_loadspinner()
+                    with self._wait_for_loadspinner():
+                        each_header.click()
                     return
                 elif (
                     "desc" in each_header.get_attribute("data-test-sort-dir")
@@ -182,51 +216,67 @@ class Table(BaseComponent):
                     and ascending
                 ):
                     # If the column is in descending order order and we want to have ascending order, click on the column-header once
-                    each_header.click()
-                    self._wait_for_loadspinner()
+                    with self._wait_for_loadspinner():
+                        each_header.click()
                     return
                 else:
                     # The column was not sorted before
                     if ascending:
                         # Click to sort ascending order
-                        each_header.click()
-                        self._wait_for_loadspinner()
+                        with self._wait_for_loadspinner():
+                            each_header.click()
                         return
                     else:
                         # Click 2 times to sort in descending order
 
                         # Ascending
-                        each_header.click()
-                        self._wait_for_loadspinner()
+                        with self._wait_for_loadspinner():
+                            each_header.click()
                         # Decending
                         # The existing element changes (class will be changed), hence, it can not be referenced again.
                         # So we need to get the headers again and do the same process.
                         self.sort_column(column, ascending=False)
                         return
 
+    def _wait_for_rendered_table(self):
+        """
+        Wait for the table body to be present & the load spinner to be gone, so the rows can be read without waiting for them
+        """
+        self.wait_for("app_listings")
+        self.wait_until("waitspinner", msg="The table did not finish loading")
+        self.browser_wait.settle()
+
+    @contextmanager
     def _wait_for_loadspinner(self):
         """
         There exist a loadspinner when sorting/filter has been applied. This method will wait until the spinner is dissapeared
+        The spinner is watched from the start of the with block, so a spinner displayed only for a moment is not missed.
         """
+        actions_done = False
         try:
-            self.wait_for("waitspinner", timeout=5)
-            self.wait_until("waitspinner")
-        except:
-            print("Waitspinner did not appear")
+            with self.browser_wait.watch_loading(
+                self.get_tuple("waitspinner"), self.get_tuple("app_listings")
+            ):
+                yield
+                actions_done = True
+        except exceptions.TimeoutException:
+            if not actions_done:
+                raise
+            LOGGER.debug("Waitspinner did not appear")
+        self.browser_wait.settle()
 
     def wait_for_rows_to_appear(self, row_count=1):
         """
         Wait for the table to load row_count rows
             :param row_count: number of row_count to wait for.
         """
-
-        def _wait_for_rows_to_appear(driver):
-            return self.get_row_count() >= row_count
-
-        self.wait_for(
-            _wait_for_rows_to_appear,
+        if row_count < 1:
+            return
+        self.browser_wait.until_elements(
+            *self.get_tuple("rows"),
+            min_count=row_count,
             msg="Expected rows : {} to be greater or equal to {}".format(
-                row_count, self.get_row_count()
+                row_count, self.count_now("rows")
             ),
         )
 
@@ -247,36 +297,104 @@ class Table(BaseComponent):
     def get_table(self):
         """
         Get whole table in dictionary form. The row_name will will be the key and all header:values will be it's value. {row_1 : {header_1: value_1, . . .}, . . .}
+        The table is read with a single script, or cell by cell if the browser can not run it.
             :return: dict The data within the table
         """
+        return dict(self._get_page_rows())
+
+    def iter_all_rows(self, columns=None, from_first_page=True):
+        """
+        Iterate over the rows of all the pages of the table. A page is read only once the rows of the previous page are consumed,
+        so the iteration can be stopped early without reading the remaining pages.
+            :param columns: List of the headers to read, all the headers if None
+            :param from_first_page: Switch to the first page before reading the rows
+            :return: Generator of (row_name, {header: value}) tuples, as the items of get_table
+        """
+        if from_first_page and self._get_pager_button("prev") is not None:
+            first_page = self._get_pager_button("1")
+            if first_page is not None:
+                self._turn_page(first_page)
+        while True:
+            yield from self._get_page_rows(columns)
+            next_page = self._get_pager_button("next")
+            if next_page is None:
+                return
+            self._turn_page(next_page)
+
+    def get_snapshot(self, columns=None, all_pages=False):
+        """
+        Get a columnar snapshot of the table, cheaper to keep & to compare than get_table for large tables.
+            :param columns: List of the headers to read, all the headers if None
+            :param all_pages: Read the rows of all the pages, only the current page otherwise
+            :return: TableSnapshot
+        """
+        if all_pages:
+            return TableSnapshot.from_rows(self.iter_all_rows(columns))
+        return TableSnapshot.from_rows(self._get_page_rows(columns))
+
+    def _get_page_rows(self, columns=None):
+        """
+        Get the rows of the current page
+            :param columns: List of the headers to read, all the headers if None
+            :return: List of (row_name, {header: value}) tuples
+        """
+        if columns is not None:
+            columns = [each_col.lower() for each_col in columns]
+        extracted = self._extract_table()
+        if extracted is None:
+            return self._get_page_rows_by_cell(columns)
+
+        rows = list()
+        for each_row in extracted["rows"]:
+            row_name = self._get_extracted_value(each_row, "name")
+            values = dict()
+            for each_col in extracted["headers"]:
+                each_col = each_col.lower()
+                if columns is not None and each_col not in columns:
+                    continue
+                if each_col == "actions":
+                    values[each_col] = " | ".join(each_row["actions"])
+                elif each_col == "status":
+                    values[each_col] = each_row["status"]
+                elif each_col:
+                    values[each_col] = self._get_extracted_value(each_row, each_col)
+            rows.append((row_name, values))
+        return rows
 
-        table = dict()
+    def _get_page_rows_by_cell(self, columns=None):
+        """
+        Get the rows of the current page, reading each cell separately.
+            :param columns: List of the lowercase headers to read, all the headers if None
+            :return: List of (row_name, {header: value}) tuples
+        """
+        rows = list()
         headers = list(self.get_headers())
 
         for each_row in self._get_rows():
             row_name = self._get_column_value(each_row, "name")
-            table[row_name] = dict()
+            values = dict()
             for each_col in headers:
                 each_col = each_col.lower()
+                if columns is not None and each_col not in columns:
+                    continue
                 if each_col == "actions":
-                    table[row_name][each_col] = ""
+                    values[each_col] = ""
                     if self.edit != None:
-                        table[row_name][each_col] = "Edit"
+                        values[each_col] = "Edit"
                     if self.clone != None:
-                        table[row_name][each_col] += " | Clone"
+                        values[each_col] += " | Clone"
                     if self.delete != None:
-                        table[row_name][each_col] += " | Delete"
+                        values[each_col] += " | Delete"
                     continue
                 if each_col == "status":
-                    table[row_name][each_col] = each_row.find_element_by_css_selector(
+                    values[each_col] = each_row.find_element_by_css_selector(
                         '[data-test="status"]'
                     ).text
                     continue
                 if each_col:
-                    table[row_name][each_col] = self._get_column_value(
-                        each_row, each_col
-                    )
-        return table
+                    values[each_col] = self._get_column_value(each_row, each_col)
+            rows.append((row_name, values))
+        return rows
 
     def get_cell_value(self, name, column):
         """
@@ -296,6 +414,12 @@ class Table(BaseComponent):
             :param column: column header of the table
             :return: List The values within the certain column
         """
+        extracted = self._extract_table()
+        if extracted is not None:
+            return [
+                self._get_extracted_value(each_row, column)
+                for each_row in extracted["rows"]
+            ]
         value_list = []
         for each_row in self._get_rows():
             value_list.append(self._get_column_value(each_row, column))
@@ -371,9 +495,9 @@ class Table(BaseComponent):
             :returns: resultant list of filtered row_names
         """
         with self.wait_stale():
-            self.filter.clear()
-            self.filter.send_keys(filter_query)
-            self._wait_for_loadspinner()
+            with self._wait_for_loadspinner():
+                self.filter.clear()
+                self.filter.send_keys(filter_query)
         return self.get_column_values("name")
 
     @contextmanager
@@ -390,8 +514,8 @@ class Table(BaseComponent):
         """
         Clean the filter textbox
         """
-        self.filter.clear()
-        self._wait_for_loadspinner()
+        with self._wait_for_loadspinner():
+            self.filter.clear()
 
     def _get_column_value(self, row, column):
         """
@@ -400,44 +524,137 @@ class Table(BaseComponent):
             :param column: the header name of the column
             :return: The list of column values from a specific column and row
         """
-        find_by_col_number = False
-        if column.lower().replace(" ", "_") in self.header_mapping:
-            column = self.header_mapping[column.lower().replace(" ", "_")]
-            find_by_col_number = isinstance(column, int)
-        else:
-            column = column.lower().replace(" ", "_")
+        col = self._get_column_selector(column)
+        self.wait_for("app_listings")
+        return self.get_clear_text(row.find_element(*list(col._asdict().values())))
 
-        if not find_by_col_number:
-            col = copy.deepcopy(self.elements["col"])
-            col = col._replace(select=col.select.format(column=column))
-            self.wait_for("app_listings")
-            return self.get_clear_text(row.find_element(*list(col._asdict().values())))
-        else:
-            # Int value
-            col = copy.deepcopy(self.elements["col-number"])
-            col = col._replace(select=col.select.format(col_number=column))
-            self.wait_for("app_listings")
-            return self.get_clear_text(row.find_element(*list(col._asdict().values())))
+    def _get_column_selector(self, column):
+        """
+        Get the selector of the cell of the column, within a row.
+            :param column: the header name of the column
+            :return: Selector
+        """
+        column = column.lower().replace(" ", "_")
+        column = self.header_mapping.get(column, column)
+        if isinstance(column, int):
+            col = self.elements["col-number"]
+            return col._replace(select=col.select.format(col_number=column))
+        col = self.elements["col"]
+        return col._replace(select=col.select.format(column=column))
+
+    def _get_cell_selector(self):
+        """
+        Get the selector of the cells of all the columns, within a row. It matches the same cells as _get_column_selector.
+            :return: Selector
+        """
+        col = self.elements["col"]
+        return col._replace(select=col.select.replace('="{column}"', ""))
+
+    def _extract_table(self):
+        """
+        Read the headers & all the rows of the page with a single script. Waits for the table to finish loading & for at least one row.
+            :return: dict {"headers": [...], "rows": [{"columns": {data-column: text}, "cells": [text], "status": text, "actions": [...]}]}
+                None if the browser can not run the script
+        """
+        self._wait_for_rendered_table()
+        # The rows are rendered after the table body, ex right after opening the page or saving an entity
+        self.get_elements("rows")
+        try:
+            extracted = self.browser.execute_script(
+                GET_TABLE,
+                self.elements["rows"].select,
+                self.elements["header"].select,
+                self.elements["status_cell"].select,
+                [
+                    [action, self.elements[action.lower()].select]
+                    for action in ("Edit", "Clone", "Delete")
+                ],
+                self._get_cell_selector().select,
+            )
+        except exceptions.WebDriverException:
+            return None
+        if not isinstance(extracted, dict):
+            return None
+        return extracted
+
+    def _get_extracted_value(self, row, column):
+        """
+        Get the column from a row read by _extract_table.
+            :param row: The row dictionary
+            :param column: the header name of the column
+            :return: str The text of the cell
+        """
+        column = column.lower().replace(" ", "_")
+        column = self.header_mapping.get(column, column)
+        if isinstance(column, int):
+            if 0 < column <= len(row["cells"]):
+                return row["cells"][column - 1]
+        elif column in row["columns"]:
+            return row["columns"][column]
+        raise exceptions.NoSuchElementException(
+            "Column {} not found in the table row".format(column)
+        )
 
-    def _get_rows(self):
+    def _get_rows(self, min_count=1, settle=0):
         """
         Get list of rows
+            :param min_count: The minimum number of rows to wait for
+            :param settle: The time in seconds for which the number of rows should not change, while the table is rendered
             :return: The list of rows within the table
         """
-        yield from self.get_elements("rows")
+        yield from self.get_elements("rows", min_count=min_count, settle=settle)
 
     def _get_row(self, name):
         """
         Get the specified row.
+        The rows are looked up in an index of the row names, which is built again if the row found is stale or has another name.
         :param name: row name
             :return: element Gets the row specified within the table, or raises a warning if not found
         """
-        for each_row in self._get_rows():
-            if self._get_column_value(each_row, "name") == name:
-                return each_row
+        if self._row_index is not None:
+            _row = self._row_index.get(name)
+            if _row is not None and self._is_row(_row, name):
+                return _row
+        self._row_index = self._get_row_index()
+        if name in self._row_index:
+            return self._row_index[name]
         else:
             raise ValueError("{} row not found in table".format(name))
 
+    def _get_row_index(self):
+        """
+        Get the rows by their name. The names are read with a single script, or row by row if the browser can not run it.
+            :return: dict {row name: row web-element}
+        """
+        rows = list(self._get_rows())
+        try:
+            names = self.browser.execute_script(
+                GET_ROW_NAMES, rows, self._get_column_selector("name").select
+            )
+        except exceptions.WebDriverException:
+            names = None
+        if not isinstance(names, list) or len(names) != len(rows):
+            names = [self._get_column_value(each_row, "name") for each_row in rows]
+        row_index = dict()
+        for each_name, each_row in zip(names, rows):
+            row_index.setdefault(each_name, each_row)
+        return row_index
+
+    def _is_row(self, row, name):
+        """
+        Check that the row is still in the page and still has the name.
+            :param row: the webElement of the row
+            :param name: row name
+            :return: bool
+        """
+        try:
+            return self._get_column_value(row, "name") == name
+        except (
+            exceptions.StaleElementReferenceException,
+            exceptions.NoSuchElementException,
+        ):
+            return False
+
     def get_action_values(self, name):
         """
         Get the specified rows action values
@@ -526,6 +743,38 @@ class Table(BaseComponent):
         else:
             raise ValueError("{} not found".format(page_next))
 
+    def _get_pager_button(self, label):
+        """
+        Get the pager button with the label, without waiting for the pager.
+            :param label: The text of the button, ex "Next" or "1"
+            :return: element The button, None if it is not in the page or disabled
+        """
+        for each in self.browser.find_elements(*self.get_tuple("switch_to_page")):
+            if self.get_clear_text(each).lower() == label.lower():
+                if (
+                    each.get_attribute("disabled")
+                    or each.get_attribute("aria-disabled") == "true"
+                ):
+                    return None
+                return each
+        return None
+
+    def _turn_page(self, button):
+        """
+        Click the pager button and wait until the first row of the current page is replaced.
+            :param button: The pager button
+        """
+        rows = self.browser.find_elements(*self.get_tuple("rows"))
+        if not rows:
+            button.click()
+            return
+        first_row, first_name = rows[0], self._get_column_value(rows[0], "name")
+        button.click()
+        self.wait_for(
+            lambda driver: not self._is_row(first_row, first_name),
+            msg="The rows of the table did not change after switching the page",
+        )
+
     def check_alert_sign(self, row_name, column_name="account"):
         """
         This function check account warning present in the table while account is not configured in input
@@ -0,0 +1,169 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+# The deadline of the test running in the thread. The browsers launched in background threads are not bound by it.
+_LOCAL = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    """
+    The time budget of the test is over.
+    It is not a TimeoutException, so that it is not handled by the code expecting a single wait to time out.
+    """
+
+
+class Deadline:
+    """
+    The time budget of a test, shared by all the waits done during the test.
+    Each wait is shrunk to the remaining budget, and the time spent in each wait is recorded for the failure summary.
+    """
+
+    def __init__(self, budget):
+        """
+        :param budget: The time budget of the test, in seconds
+        """
+        self.budget = budget
+        self.start_time = time.monotonic()
+        self.waits = dict()
+
+    def remaining(self):
+        """
+        The remaining time budget in seconds, 0 if the budget is over
+        """
+        return max(self.budget - (time.monotonic() - self.start_time), 0)
+
+    def clamp(self, timeout, name):
+        """
+        Shrink the timeout of a wait to the remaining budget. Raises DeadlineExceeded if the budget is over.
+            :param timeout: The timeout of the wait in seconds
+            :param name: The name of the wait, used in the summary
+            :returns: The timeout to use for the wait
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(self.get_summary(name))
+        return min(timeout, remaining)
+
+    def record(self, name, duration):
+        """
+        Record the time spent in a wait
+            :param name: The name of the wait
+            :param duration: The time spent in seconds
+        """
+        count, total = self.waits.get(name, (0, 0.0))
+        self.waits[name] = (count + 1, total + duration)
+
+    def get_summary(self, name, limit=10):
+        """
+        Get the summary of where the time budget was spent
+            :param name: The name of the wait during which the budget ran out
+            :param limit: The maximum number of waits listed
+            :returns: str
+        """
+        waits = sorted(self.waits.items(), key=lambda x: x[1][1], reverse=True)
+        lines = [
+            "Test time budget of {}s exceeded while waiting for: {}".format(
+                self.budget, name
+            ),
+            "Time spent in waits: {:.1f}s of {:.1f}s".format(
+                sum(total for _, total in self.waits.values()),
+                time.monotonic() - self.start_time,
+            ),
+        ]
+        lines.extend(
+            "    {:.1f}s in {} wait(s): {}".format(total, count, wait_name)
+            for wait_name, (count, total) in waits[:limit]
+        )
+        return "\n".join(lines)
+
+    def run(self, name, timeout, wait):
+        """
+        Run a wait within the remaining budget
+            :param name: The name of the wait
+            :param timeout: The timeout of the wait in seconds
+            :param wait: Function taking the timeout to use as argument
+            :returns: The result of the wait
+        """
+        clamped_timeout = self.clamp(timeout, name)
+        start_time = time.monotonic()
+        try:
+            result = wait(clamped_timeout)
+        except TimeoutException as e:
+            self.record(name, time.monotonic() - start_time)
+            if clamped_timeout < timeout:
+                raise DeadlineExceeded(self.get_summary(name)) from e
+            raise
+        self.record(name, time.monotonic() - start_time)
+        return result
+
+
+def get_deadline():
+    """
+    Get the deadline of the test running in the current thread, None if there is no deadline
+    """
+    return getattr(_LOCAL, "deadline", None)
+
+
+def set_deadline(deadline):
+    """
+    Set the deadline of the test running in the current thread
+        :param deadline: Deadline, None to remove the deadline
+    """
+    _LOCAL.deadline = deadline
+
+
+def run_within_deadline(name, timeout, wait):
+    """
+    Run a wait within the deadline of the current test, if any
+        :param name: The name of the wait
+        :param timeout: The timeout of the wait in seconds
+        :param wait: Function taking the timeout to use as argument
+        :returns: The result of the wait
+    """
+    deadline = get_deadline()
+    if deadline is None:
+        return wait(timeout)
+    return deadline.run(name, timeout, wait)
+
+
+class DeadlineWait(WebDriverWait):
+    """
+    WebDriverWait which is shrunk to the remaining time budget of the test.
+    """
+
+    def until(self, method, message=""):
+        return run_within_deadline(
+            message or getattr(method, "__name__", repr(method)),
+            self._timeout,
+            lambda timeout: self._with_timeout(timeout).until(method, message),
+        )
+
+    def until_not(self, method, message=""):
+        return run_within_deadline(
+            message or getattr(method, "__name__", repr(method)),
+            self._timeout,
+            lambda timeout: self._with_timeout(timeout).until_not(method, message),
+        )
+
+    def _with_timeout(self, timeout):
+        return WebDriverWait(
+            self._driver, timeout, self._poll, tuple(self._ignored_exceptions)
+        )
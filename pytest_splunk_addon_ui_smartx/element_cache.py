@@ -0,0 +1,72 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from selenium.common.exceptions import StaleElementReferenceException
+
+# The CachedElement subclass of each web-element class
+CACHED_ELEMENT_CLASSES = dict()
+
+
+class CachedElement:
+    """
+    Mixin for a web-element which is located again, once, if it became stale.
+    The instance is also an instance of the class of the original web-element, so it can be given to execute_script & ActionChains.
+    """
+
+    def __getattribute__(self, name):
+        if name.startswith("_"):
+            return object.__getattribute__(self, name)
+        try:
+            value = object.__getattribute__(self, name)
+        except StaleElementReferenceException:
+            self._relocate()
+            return object.__getattribute__(self, name)
+        if not callable(value):
+            return value
+
+        def _retry_if_stale(*args, **kwargs):
+            try:
+                return value(*args, **kwargs)
+            except StaleElementReferenceException:
+                self._relocate()
+                return object.__getattribute__(self, name)(*args, **kwargs)
+
+        return _retry_if_stale
+
+    def _relocate(self):
+        element = self._locate()
+        self.__dict__.update(element.__dict__)
+
+
+def cache_element(element, locate):
+    """
+    Wrap the web-element so that it is located again if it became stale.
+        :param element: The web-element found in the page
+        :param locate: Function locating the web-element again
+        :returns: The wrapped web-element, or the element itself if it is not a web-element (ex. a mock)
+    """
+    element_class = type(element)
+    if getattr(element_class, "find_element", None) is None:
+        return element
+    if element_class not in CACHED_ELEMENT_CLASSES:
+        CACHED_ELEMENT_CLASSES[element_class] = type(
+            "Cached{}".format(element_class.__name__),
+            (CachedElement, element_class),
+            {},
+        )
+    cached_element = object.__new__(CACHED_ELEMENT_CLASSES[element_class])
+    cached_element.__dict__.update(element.__dict__)
+    cached_element.__dict__["_locate"] = locate
+    return cached_element
@@ -0,0 +1,592 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import html
+import itertools
+import re
+import uuid
+
+import lxml.html
+from cssselect import GenericTranslator
+from selenium.common.exceptions import (
+    NoAlertPresentException,
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from .base_test import DriverBackend
+from .browser_wait import GET_NAVIGATION_EPOCH, UnsupportedScript
+from .components.controls.base_control import GET_LABEL_TEXT
+from .components.table import GET_HEADER_TEXT, GET_ROW_NAMES, GET_TABLE
+
+BLANK_PAGE = "<html><head></head><body></body></html>"
+BLOCK_TAGS = {
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "tbody",
+    "thead",
+    "tfoot",
+    "tr",
+    "ul",
+}
+BOOLEAN_ATTRIBUTES = {"checked", "disabled", "readonly", "required", "selected"}
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden")
+SPECIAL_KEYS = {value for name, value in vars(Keys).items() if not name.startswith("_")}
+
+
+def _own_text(node):
+    """
+    The text nodes directly under the node, as the helper scripts read them from node.childNodes.
+    """
+    texts = [node.text] + [child.tail for child in node]
+    return " ".join(" " + text for text in texts if text).strip()
+
+
+def _has_child_nodes(node):
+    return bool(node.text) or len(node) > 0
+
+
+def _get_header_text(driver, element):
+    parent = element.node
+    for _ in range(2):
+        if len(parent) == 0:
+            raise WebDriverException("javascript error: parent is null")
+        parent = parent[0]
+    if _has_child_nodes(parent):
+        return _own_text(parent)
+    return FakeWebElement(driver, parent).get_attribute("innerText")
+
+
+def _get_table(driver, rows_select, header_select, status_select, actions, cell_select):
+    def _clear(element):
+        if element is None:
+            return None
+        return re.sub(r"\s+", " ", element.get_attribute("innerText")).strip()
+
+    def _first(row, css_selector):
+        elements = row.find_elements(By.CSS_SELECTOR, css_selector)
+        return elements[0] if elements else None
+
+    rows = []
+    for row in driver.find_elements(By.CSS_SELECTOR, rows_select):
+        columns = dict()
+        for cell in row.find_elements(By.CSS_SELECTOR, cell_select):
+            columns.setdefault(cell.get_attribute("data-column"), _clear(cell))
+        rows.append(
+            {
+                "columns": columns,
+                "cells": [
+                    _clear(driver._get_element(child))
+                    for child in row.node
+                    if isinstance(child.tag, str)
+                ],
+                "status": _clear(_first(row, status_select)),
+                "actions": [
+                    action
+                    for action, css_selector in actions
+                    if _first(row, css_selector) is not None
+                ],
+            }
+        )
+    return {
+        "headers": [
+            _get_header_text(driver, header)
+            for header in driver.find_elements(By.CSS_SELECTOR, header_select)
+        ],
+        "rows": rows,
+    }
+
+
+def _get_row_names(driver, rows, css_selector):
+    names = []
+    for row in rows:
+        cells = row.find_elements(By.CSS_SELECTOR, css_selector)
+        names.append(
+            re.sub(r"\s+", " ", cells[0].get_attribute("innerText")).strip()
+            if cells
+            else None
+        )
+    return names
+
+
+def _get_label_text(driver, element):
+    if _has_child_nodes(element.node):
+        return _own_text(element.node)
+    return element.get_attribute("innerText")
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    @property
+    def alert(self):
+        raise NoAlertPresentException("No alert is open in the fake webdriver")
+
+    def window(self, window_name):
+        if window_name not in self._driver.window_handles:
+            raise WebDriverException("No such window: {}".format(window_name))
+
+    def default_content(self):
+        pass
+
+
+class FakeWebElement:
+    """
+    A web-element of the FakeWebDriver. Wraps a node of the lxml tree of the current page.
+    The element becomes stale once its node is removed from the page or another page is loaded.
+    """
+
+    def __init__(self, driver, node):
+        """
+        :param driver: The FakeWebDriver instance
+        :param node: The lxml element
+        """
+        self._driver = driver
+        self._node = node
+        self.id = str(uuid.uuid4())
+
+    def __eq__(self, element):
+        return isinstance(element, FakeWebElement) and element._node is self._node
+
+    def __hash__(self):
+        return hash(self._node)
+
+    def __repr__(self):
+        return "<FakeWebElement {}>".format(self._node.tag)
+
+    @property
+    def node(self):
+        """
+        The lxml element, which can be modified by the event handlers to update the page.
+        """
+        root = self._driver.root
+        if self._node is not root and not any(
+            ancestor is root for ancestor in self._node.iterancestors()
+        ):
+            raise StaleElementReferenceException(
+                "The element <{}> is not attached to the page document".format(
+                    self._node.tag
+                )
+            )
+        return self._node
+
+    @property
+    def parent(self):
+        return self._driver
+
+    @property
+    def tag_name(self):
+        return self.node.tag
+
+    @property
+    def text(self):
+        if not self.is_displayed():
+            return ""
+        lines = (
+            re.sub(r"[ \t\r\f\v]+", " ", line).strip()
+            for line in self._driver.get_inner_text(self.node).split("\n")
+        )
+        return "\n".join(line for line in lines if line)
+
+    @property
+    def size(self):
+        return {"height": 0, "width": 0}
+
+    @property
+    def location(self):
+        return {"x": 0, "y": 0}
+
+    @property
+    def rect(self):
+        return {"height": 0, "width": 0, "x": 0, "y": 0}
+
+    def get_attribute(self, name):
+        """
+        Get the property or the attribute of the element, following the webdriver rules.
+            :param name: The name of the property or the attribute
+            :returns: str or None
+        """
+        node = self.node
+        if name == "innerText":
+            return self._driver.get_inner_text(node) if self.is_displayed() else ""
+        if name == "textContent":
+            return node.text_content()
+        if name == "outerHTML":
+            return lxml.html.tostring(node, encoding="unicode", with_tail=False)
+        if name == "innerHTML":
+            return html.escape(node.text or "", quote=False) + "".join(
+                lxml.html.tostring(child, encoding="unicode") for child in node
+            )
+        if name == "value" and node.tag == "textarea":
+            return node.text or ""
+        if name == "className":
+            name = "class"
+        if name.lower() in BOOLEAN_ATTRIBUTES:
+            return "true" if node.get(name.lower()) is not None else None
+        return node.get(name)
+
+    def get_property(self, name):
+        return self.get_attribute(name)
+
+    def is_displayed(self):
+        node = self.node
+        if node.tag == "input" and node.get("type") == "hidden":
+            return False
+        while node is not None:
+            if node.get("hidden") is not None or HIDDEN_STYLE.search(
+                node.get("style", "")
+            ):
+                return False
+            node = node.getparent()
+        return True
+
+    def is_enabled(self):
+        return self.node.get("disabled") is None
+
+    def is_selected(self):
+        node = self.node
+        return node.get("checked") is not None or node.get("selected") is not None
+
+    def click(self):
+        self._driver.dispatch("click", self)
+
+    def send_keys(self, *value):
+        text = "".join(value)
+        typed = "".join(char for char in text if char not in SPECIAL_KEYS)
+        if typed:
+            node = self.node
+            node.set("value", (node.get("value") or "") + typed)
+        self._driver.dispatch("send_keys", self, text)
+
+    def clear(self):
+        self.node.set("value", "")
+        self._driver.dispatch("clear", self)
+
+    def submit(self):
+        self._driver.dispatch("submit", self)
+
+    def value_of_css_property(self, name):
+        match = re.search(
+            r"(?:^|;)\s*{}\s*:\s*([^;]+)".format(re.escape(name)),
+            self.node.get("style", ""),
+        )
+        return match.group(1).strip() if match else ""
+
+    def find_element(self, by=By.ID, value=None):
+        return self._driver.find_element(by, value, context=self)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._driver.find_elements(by, value, context=self)
+
+    def find_element_by_id(self, id_):
+        return self.find_element(By.ID, id_)
+
+    def find_elements_by_id(self, id_):
+        return self.find_elements(By.ID, id_)
+
+    def find_element_by_css_selector(self, css_selector):
+        return self.find_element(By.CSS_SELECTOR, css_selector)
+
+    def find_elements_by_css_selector(self, css_selector):
+        return self.find_elements(By.CSS_SELECTOR, css_selector)
+
+    def find_element_by_xpath(self, xpath):
+        return self.find_element(By.XPATH, xpath)
+
+    def find_elements_by_xpath(self, xpath):
+        return self.find_elements(By.XPATH, xpath)
+
+
+class FakeWebDriver:
+    """
+    An in-process webdriver which serves the pages from HTML snapshots parsed with lxml. No browser is launched.
+
+    - find_element(s), the web-element properties, click/send_keys/clear & the waits of the components work against the snapshot.
+    - The page reacts to the user actions through the handlers registered with on(). A handler can update the tree or load another page.
+    - execute_script() runs the python equivalent of the helper scripts of the library, or the ones registered with register_script().
+
+    It is meant to test the logic of the components, not the rendering of the pages.
+    """
+
+    name = "fake"
+    w3c = False
+    scripts = {
+        GET_HEADER_TEXT: _get_header_text,
+        GET_LABEL_TEXT: _get_label_text,
+        GET_TABLE: _get_table,
+        GET_ROW_NAMES: _get_row_names,
+        "window.localStorage.clear(); window.sessionStorage.clear();": lambda driver: None,
+        GET_NAVIGATION_EPOCH: lambda driver: [driver.page_loads, driver.current_url],
+    }
+
+    def __init__(self, html=BLANK_PAGE, url="about:blank", pages=None):
+        """
+        :param html: The HTML of the page to load first
+        :param url: The url of the first page
+        :param pages: dict of url: HTML, served by get()
+        """
+        self.session_id = str(uuid.uuid4())
+        self.pages = dict(pages or dict())
+        self.window_handles = ["fake-window"]
+        self.current_window_handle = self.window_handles[0]
+        self.switch_to = FakeSwitchTo(self)
+        self.scripts = dict(self.scripts)
+        self.cookies = list()
+        self.handlers = list()
+        self.page_loads = 0
+        self._xpath_cache = dict()
+        self._translator = GenericTranslator()
+        self.load_html(html, url)
+
+    def load_html(self, html, url=None):
+        """
+        Replace the current page. The elements of the previous page become stale.
+            :param html: The HTML of the page
+            :param url: The url of the page, the current url is kept if not provided
+        """
+        self.root = lxml.html.document_fromstring(html)
+        self._elements = dict()
+        self.page_loads += 1
+        if url is not None:
+            self.current_url = url
+
+    @property
+    def page_source(self):
+        return lxml.html.tostring(self.root, encoding="unicode")
+
+    @property
+    def title(self):
+        title = self.root.find(".//title")
+        return title.text_content().strip() if title is not None else ""
+
+    def get(self, url):
+        """
+        Load the page registered for the url in self.pages. The current page is reloaded if the url is unknown.
+        """
+        html = self.pages.get(url)
+        if html is None:
+            html = self.page_source
+        self.load_html(html, url)
+
+    def refresh(self):
+        self.get(self.current_url)
+
+    def on(self, event, css_selector, handler):
+        """
+        Register an event handler.
+            :param event: One of click, send_keys, clear, submit, hover
+            :param css_selector: The handler is called for the elements matching the selector, or for their descendants.
+            :param handler: Callable taking (driver, element, *args). For send_keys, args is the text sent.
+        """
+        self.handlers.append((event, css_selector, handler))
+
+    def dispatch(self, event, element, *args):
+        """
+        Call the handlers of the event registered for the element or its ancestors.
+        """
+        node = element.node
+        ancestors = set(itertools.chain([node], node.iterancestors()))
+        for handler_event, css_selector, handler in list(self.handlers):
+            if handler_event != event:
+                continue
+            if ancestors.intersection(self.root.xpath(self._to_xpath(css_selector))):
+                handler(self, element, *args)
+
+    def register_script(self, script, handler):
+        """
+        Serve a script with a python function.
+            :param script: The exact javascript source passed to execute_script()
+            :param handler: Callable taking (driver, *args) and returning the result of the script
+        """
+        self.scripts[script] = handler
+
+    def execute_script(self, script, *args):
+        if script not in self.scripts:
+            raise UnsupportedScript(
+                "Script not supported by the fake webdriver: {}".format(script[:80])
+            )
+        return self.scripts[script](self, *args)
+
+    execute_async_script = execute_script
+
+    def set_script_timeout(self, time_to_wait):
+        pass
+
+    def execute(self, driver_command, params=None):
+        # Used by the ActionChains
+        if driver_command == "mouseMoveTo" and params and params.get("element"):
+            for element in self._elements.values():
+                if element.id == params["element"]:
+                    self.dispatch("hover", element)
+        return {"value": None}
+
+    def get_inner_text(self, node):
+        """
+        Approximation of the innerText of a node: the hidden nodes are skipped & the block elements are put on separate lines.
+        """
+        parts = []
+
+        def _walk(node):
+            if not isinstance(node.tag, str) or node.tag in ("script", "style"):
+                return
+            if node.get("hidden") is not None or HIDDEN_STYLE.search(
+                node.get("style", "")
+            ):
+                return
+            block = node.tag in BLOCK_TAGS
+            if node.tag == "br" or block:
+                parts.append("\n")
+            if node.text:
+                parts.append(node.text)
+            for child in node:
+                _walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+            if block:
+                parts.append("\n")
+
+        _walk(node)
+        return re.sub(r"\n\s*\n+", "\n", "".join(parts)).strip()
+
+    def find_element(self, by=By.ID, value=None, context=None):
+        elements = self.find_elements(by, value, context)
+        if not elements:
+            raise NoSuchElementException(
+                "Unable to locate element: by={} value={}".format(by, value)
+            )
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None, context=None):
+        """
+        Find the elements in the page, or in the context element.
+        As with querySelectorAll, a css selector is matched against the whole page and only the descendants of the context are returned.
+        """
+        if by == By.XPATH:
+            nodes = (context.node if context else self.root).xpath(value)
+        else:
+            nodes = self.root.xpath(self._to_xpath(self._to_css(by, value)))
+            if context is not None:
+                context_node = context.node
+                nodes = [
+                    node
+                    for node in nodes
+                    if node is not context_node
+                    and any(a is context_node for a in node.iterancestors())
+                ]
+        return [self._get_element(node) for node in nodes if isinstance(node.tag, str)]
+
+    def find_element_by_id(self, id_):
+        return self.find_element(By.ID, id_)
+
+    def find_elements_by_id(self, id_):
+        return self.find_elements(By.ID, id_)
+
+    def find_element_by_css_selector(self, css_selector):
+        return self.find_element(By.CSS_SELECTOR, css_selector)
+
+    def find_elements_by_css_selector(self, css_selector):
+        return self.find_elements(By.CSS_SELECTOR, css_selector)
+
+    def find_element_by_xpath(self, xpath):
+        return self.find_element(By.XPATH, xpath)
+
+    def find_elements_by_xpath(self, xpath):
+        return self.find_elements(By.XPATH, xpath)
+
+    def add_cookie(self, cookie_dict):
+        self.cookies.append(cookie_dict)
+
+    def get_cookies(self):
+        return list(self.cookies)
+
+    def delete_all_cookies(self):
+        self.cookies = list()
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+    def _get_element(self, node):
+        # The same node is always wrapped by the same web-element, as the browser does
+        if node not in self._elements:
+            self._elements[node] = FakeWebElement(self, node)
+        return self._elements[node]
+
+    @staticmethod
+    def _to_css(by, value):
+        if by == By.CSS_SELECTOR:
+            return value
+        if by == By.ID:
+            return '[id="{}"]'.format(value)
+        if by == By.NAME:
+            return '[name="{}"]'.format(value)
+        if by == By.CLASS_NAME:
+            return "." + value
+        if by == By.TAG_NAME:
+            return value
+        raise WebDriverException("Locator not supported by the fake webdriver: " + by)
+
+    def _to_xpath(self, css_selector):
+        if css_selector not in self._xpath_cache:
+            self._xpath_cache[css_selector] = self._translator.css_to_xpath(
+                css_selector
+            )
+        return self._xpath_cache[css_selector]
+
+
+class FakeBackend(DriverBackend):
+    """
+    Driver backend of the FakeWebDriver. The browser starts on a blank page at the Splunk Web url & is not logged in to Splunk.
+    """
+
+    saucelabs = False
+    requires_login = False
+
+    def build_capabilities(self, selenium_helper):
+        return dict()
+
+    def create(self, selenium_helper):
+        return FakeWebDriver(url=selenium_helper.splunk_web_url)
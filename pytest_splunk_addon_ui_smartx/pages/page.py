@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from ..browser_wait import BrowserWait
+from ..components.base_component import DEFAULT_TIMEOUT
 
 
 class Page:
@@ -33,6 +35,9 @@ class Page:
             self.splunk_web_url = ucc_smartx_selenium_helper.splunk_web_url
             if open_page:
                 self.open()
+                BrowserWait(self.browser, DEFAULT_TIMEOUT).note_navigation()
+                # Wait for the REST calls of the page, if enabled with --ucc-wait-for-quiescence
+                BrowserWait(self.browser, DEFAULT_TIMEOUT).settle()
         if ucc_smartx_rest_helper:
             self.splunk_mgmt_url = ucc_smartx_rest_helper.splunk_mgmt_url
 
@@ -20,7 +20,13 @@ from collections import namedtuple
 
 import pytest
 
-from .base_test import RestHelper, SeleniumHelper
+from .base_test import DriverRegistry, RestHelper, SeleniumHelper
+from .browser_pool import BrowserPool, BrowserPrelauncher
+from .browser_wait import BrowserWait
+from .deadline import Deadline, set_deadline
+from .sauce_reporter import SauceJobReporter
+from .timeouts import TimeoutPolicy, set_timeout_policy
+from .transport import CommandMetrics
 
 LOGGER = logging.getLogger("pytest-ucc-smartx")
 PNG_PATH = "assets"
@@ -31,18 +37,103 @@ def pytest_configure(config):
     Setup configuration after command-line options are parsed
     """
     config.addinivalue_line("markers", "ucc: UCC Tests")
+    config.addinivalue_line(
+        "markers", "xdist_group(name): Run the tests of the group on same xdist worker"
+    )
+    config.addinivalue_line(
+        "markers",
+        "ucc_deadline(seconds): Time budget shared by all the waits of the test, overrides --ucc-test-deadline",
+    )
     pytest_html = config.pluginmanager.getplugin("html")
     if pytest_html:
         try:
             os.mkdir(PNG_PATH)
         except OSError:
             pass
+    configure_timeout_policy(config)
+    register_driver_backends(config)
+    check_worker_browser(config)
+
+
+def register_driver_backends(config):
+    """
+    Register the driver backends provided with --ucc-driver-backend
+    """
+    for driver_backend in config.getoption("--ucc-driver-backend"):
+        LOGGER.debug("--ucc-driver-backend={}".format(driver_backend))
+        backend_name, _, backend_class = driver_backend.partition("=")
+        DriverRegistry.register(backend_name, backend_class)
+
+
+def check_worker_browser(config):
+    """
+    Ignore --ucc-worker-browser if it is combined with another way of sharing the browsers, or with Saucelabs where each test case has its own job.
+    """
+    if not config.getoption("--ucc-worker-browser"):
+        return
+    conflict = None
+    if config.getoption("--ucc-browser-pool"):
+        conflict = "--ucc-browser-pool"
+    elif config.getoption("--ucc-prelaunch-browser"):
+        conflict = "--ucc-prelaunch-browser"
+    elif not config.getoption("--local") and config.getoption("--browser"):
+        backend_class = DriverRegistry.get_backend_class(
+            config.getoption("--browser").split(":")[0]
+        )
+        if backend_class is not None and backend_class.saucelabs:
+            conflict = "a Saucelabs browser"
+    if conflict:
+        LOGGER.warn("--ucc-worker-browser is ignored with {}".format(conflict))
+        config.option.ucc_worker_browser = False
 
 
+def get_timeout_environment(config):
+    """
+    Get the name of the environment in which the wait durations are recorded, ex "chrome:latest:local:headless"
+    """
+    driver = config.getoption("--browser") or ""
+    if len(driver.split(":")) != 2:
+        driver = "{}:latest".format(driver)
+    environment = [driver, "local" if config.getoption("--local") else "remote"]
+    if config.getoption("--headless"):
+        environment.append("headless")
+    return ":".join(environment)
+
+
+def configure_timeout_policy(config):
+    """
+    Setup the timeout policy of the components as per --ucc-timeouts-file & --ucc-timeout
+    """
+    timeouts_file = config.getoption("--ucc-timeouts-file", None)
+    timeout_overrides = config.getoption("--ucc-timeout", None) or []
+    if not timeouts_file and not timeout_overrides:
+        return
+    if timeouts_file:
+        LOGGER.debug("--ucc-timeouts-file={}".format(timeouts_file))
+        timeout_policy = TimeoutPolicy.load(
+            timeouts_file, get_timeout_environment(config)
+        )
+    else:
+        timeout_policy = TimeoutPolicy()
+    for timeout_override in timeout_overrides:
+        LOGGER.debug("--ucc-timeout={}".format(timeout_override))
+        name, _, timeout = timeout_override.rpartition("=")
+        timeout_policy.set_override(name, timeout)
+    set_timeout_policy(timeout_policy)
+    config._ucc_smartx_timeout_policy = timeout_policy
+
+
+@pytest.hookimpl(tryfirst=True)
 def pytest_collection_modifyitems(config, items):
     """
     Add browser name as prefix in test class name
+    With --ucc-worker-browser, group the tests by test class so that pytest-xdist (--dist loadgroup) runs them on the same worker
     """
+    if config.getoption("--ucc-worker-browser"):
+        for item in items:
+            item.add_marker(
+                pytest.mark.xdist_group(name="::".join(item.nodeid.split("::")[:-1]))
+            )
     browser = config.getoption("--browser")
     if browser:
         if len(browser.split(":")) == 2:
@@ -95,10 +186,124 @@ def pytest_addoption(parser):
         "--headless", action="store_true", help="Run the test case on headless mode"
     )
 
+    group.addoption(
+        "--ucc-browser-pool",
+        action="store",
+        type=int,
+        default=0,
+        help=(
+            "Keep a pool of N logged-in browsers. Instead of quitting the browser after each test,"
+            " the browser is reset (windows, local/session storage, current page) and reused by the next test."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-cookie-login",
+        action="store_true",
+        help=(
+            "Login to Splunk Web over HTTP once per session and inject the session cookies into each new browser."
+            " The login form is used only if the cookies are rejected."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-prelaunch-browser",
+        action="store_true",
+        help=(
+            "Launch the browser of the next test case in the background while the current test case is running."
+            " (Not used with --persist-browser, --ucc-browser-pool or on the pytest-xdist workers)"
+        ),
+    )
+
+    group.addoption(
+        "--ucc-worker-browser",
+        action="store_true",
+        help=(
+            "Keep a single browser per pytest-xdist worker (or per session without xdist) and reset it between the tests."
+            " Supported with local, grid and k8s browsers, ignored with Saucelabs, --ucc-browser-pool or --ucc-prelaunch-browser."
+            " Tests of the same class are grouped on one worker with --dist loadgroup."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-command-metrics",
+        action="store_true",
+        help=(
+            "Record the latency & the payload size of the WebDriver commands sent to the remote browsers (grid, k8s, Saucelabs)"
+            " and add the summary to the terminal report."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-compress-responses",
+        action="store_true",
+        help="Request gzip encoded responses from the remote browsers (grid, k8s, Saucelabs).",
+    )
+
+    group.addoption(
+        "--ucc-timeouts-file",
+        action="store",
+        help=(
+            "JSON file in which the durations of the waits are recorded per environment (browser, local/remote, headless)."
+            " Once enough durations are recorded, the timeout of each wait is derived from them instead of the fixed defaults."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-timeout",
+        action="append",
+        default=[],
+        help=(
+            "Override the timeout of the waits, in seconds. ex, default=30 for all the waits, Table=40 for the waits of a component,"
+            ' "present:#table tbody=10" for a single wait. Can be provided multiple times.'
+        ),
+    )
+
+    group.addoption(
+        "--ucc-test-deadline",
+        action="store",
+        type=float,
+        default=0,
+        help=(
+            "Time budget of each test in seconds, shared by all the waits of the test. Each wait is shrunk to the remaining budget,"
+            " and the test fails with a summary of the waits once the budget is over. Can be set per test with @pytest.mark.ucc_deadline(seconds)."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-wait-for-quiescence",
+        action="store_true",
+        help=(
+            "Track the fetch/XHR requests of Splunk Web, and wait for the page to settle (no request in flight, no DOM change)"
+            " after opening a page, saving an entity and sorting/filtering a table."
+        ),
+    )
+
+    group.addoption(
+        "--ucc-driver-backend",
+        action="append",
+        default=[],
+        help=(
+            "Register a custom driver backend which can then be used with --browser."
+            " ex, <browser>=<package.module>:<DriverBackendClass>. Can be provided multiple times."
+        ),
+    )
+
 
 SmartConfigs = namedtuple(
     "SmartConfigs",
-    ["driver", "driver_version", "local_run", "retry_count", "headless_run"],
+    [
+        "driver",
+        "driver_version",
+        "local_run",
+        "retry_count",
+        "headless_run",
+        "browser_pool_size",
+        "cookie_login",
+        "prelaunch_browser",
+        "driver_registry",
+        "wait_for_quiescence",
+    ],
 )
 
 
@@ -137,6 +342,26 @@ def ucc_smartx_configs(request):
     else:
         headless_run = False
 
+    browser_pool_size = request.config.getoption("--ucc-browser-pool")
+    if browser_pool_size:
+        LOGGER.debug("--ucc-browser-pool={}".format(browser_pool_size))
+
+    if request.config.getoption("--ucc-cookie-login"):
+        cookie_login = True
+        LOGGER.debug("--ucc-cookie-login")
+    else:
+        cookie_login = False
+
+    if request.config.getoption("--ucc-prelaunch-browser"):
+        prelaunch_browser = True
+        LOGGER.debug("--ucc-prelaunch-browser")
+    else:
+        prelaunch_browser = False
+
+    if request.config.getoption("--ucc-command-metrics"):
+        LOGGER.debug("--ucc-command-metrics")
+        request.config._ucc_smartx_command_metrics = CommandMetrics()
+
     LOGGER.info(
         "Calling SeleniumHelper with:: browser={driver}, debug={local_run}, headless={headless_run})".format(
             driver=driver, local_run=local_run, headless_run=headless_run
@@ -148,6 +373,16 @@ def ucc_smartx_configs(request):
         local_run=local_run,
         retry_count=retry_count,
         headless_run=headless_run,
+        browser_pool_size=browser_pool_size,
+        cookie_login=cookie_login,
+        prelaunch_browser=prelaunch_browser,
+        driver_registry=DriverRegistry(
+            command_metrics=getattr(
+                request.config, "_ucc_smartx_command_metrics", None
+            ),
+            compress=request.config.getoption("--ucc-compress-responses"),
+        ),
+        wait_for_quiescence=request.config.getoption("--ucc-wait-for-quiescence"),
     )
     return smartx_configs
 
@@ -158,18 +393,19 @@ def get_browser_scope(fixture_name, config):
     """
     if config.getoption("--local") and config.getoption("--persist-browser"):
         return "session"
+    elif config.getoption("--ucc-worker-browser"):
+        # Each xdist worker is a separate session, so the browser is owned by the worker
+        return "session"
     else:
         return "function"
 
 
-@pytest.fixture(scope=get_browser_scope)
-def ucc_smartx_selenium_helper(
-    request, ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri
+def launch_selenium_helper(
+    ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri, test_case
 ):
-    # Try to configure selenium & Login to splunk instance
-    test_case = "{}_{}".format(
-        ucc_smartx_configs.driver, request.node.nodeid.split("::")[-1]
-    )
+    """
+    Configure selenium & Login to splunk instance. Retries as per --setup-retry-count.
+    """
     for try_number in range(ucc_smartx_configs.retry_count):
         last_exc = Exception()
         try:
@@ -182,8 +418,12 @@ def ucc_smartx_selenium_helper(
                 cred=(splunk["username"], splunk["password"]),
                 headless=ucc_smartx_configs.headless_run,
                 test_case=test_case,
+                cookie_login=ucc_smartx_configs.cookie_login,
+                driver_registry=ucc_smartx_configs.driver_registry,
             )
-            break
+            if ucc_smartx_configs.wait_for_quiescence:
+                BrowserWait(selenium_helper.browser, 0).track_network()
+            return selenium_helper
         except Exception as e:
             last_exc = e
             LOGGER.warn(
@@ -191,11 +431,112 @@ def ucc_smartx_selenium_helper(
                     try_number, traceback.format_exc()
                 )
             )
+    LOGGER.error(
+        "Could not connect to Browser or login to Splunk instance. Please check the logs for detailed error of each retry"
+    )
+    raise (last_exc)
+
+
+@pytest.fixture(scope="session")
+def ucc_smartx_browser_pool(
+    ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri
+):
+    """
+    Pool of logged-in browsers, if --ucc-browser-pool is provided. None otherwise.
+    """
+    if not ucc_smartx_configs.browser_pool_size:
+        yield None
+        return
+
+    def _factory(test_case):
+        return launch_selenium_helper(
+            ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri, test_case
+        )
+
+    browser_pool = BrowserPool(_factory, ucc_smartx_configs.browser_pool_size)
+    yield browser_pool
+    browser_pool.close()
+
+
+@pytest.fixture(scope="session")
+def ucc_smartx_browser_prelauncher(
+    request, ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri
+):
+    """
+    Launches the browser of the next test case in background, if --ucc-prelaunch-browser is provided. None otherwise.
+    """
+    if (
+        not ucc_smartx_configs.prelaunch_browser
+        or ucc_smartx_configs.browser_pool_size
+        or get_browser_scope("ucc_smartx_selenium_helper", request.config) != "function"
+    ):
+        yield None
+        return
+    if hasattr(request.config, "workerinput"):
+        # The collected items are not the ones scheduled on the worker, so the next test case of the worker is not known
+        LOGGER.warn("--ucc-prelaunch-browser is ignored on the pytest-xdist workers")
+        yield None
+        return
+
+    def _factory(test_case):
+        return launch_selenium_helper(
+            ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri, test_case
+        )
+
+    browser_prelauncher = BrowserPrelauncher(_factory)
+    yield browser_prelauncher
+    browser_prelauncher.close()
+
+
+def get_next_test_case(request, driver):
+    """
+    Get the name of the next collected test case which uses the browser.
+    """
+    items = request.session.items
+    if request.node not in items:
+        return None
+    for item in items[items.index(request.node) + 1 :]:
+        if "ucc_smartx_selenium_helper" in item.fixturenames:
+            return "{}_{}".format(driver, item.nodeid.split("::")[-1])
+    return None
+
+
+@pytest.fixture(scope=get_browser_scope)
+def ucc_smartx_selenium_helper(
+    request,
+    ucc_smartx_configs,
+    ucc_smartx_browser_pool,
+    ucc_smartx_browser_prelauncher,
+    splunk,
+    splunk_web_uri,
+    splunk_rest_uri,
+):
+    if request.scope == "session" and request.config.getoption("--ucc-worker-browser"):
+        test_case = "{}_{}".format(
+            ucc_smartx_configs.driver, os.environ.get("PYTEST_XDIST_WORKER", "master")
+        )
     else:
-        LOGGER.error(
-            "Could not connect to Browser or login to Splunk instance. Please check the logs for detailed error of each retry"
+        test_case = "{}_{}".format(
+            ucc_smartx_configs.driver, request.node.nodeid.split("::")[-1]
+        )
+    if ucc_smartx_browser_pool:
+        selenium_helper = ucc_smartx_browser_pool.acquire(test_case)
+        yield selenium_helper
+        if not ucc_smartx_configs.local_run:
+            notify_saucelabs(request, selenium_helper)
+        LOGGER.info("Releasing browser to the pool..")
+        ucc_smartx_browser_pool.release(selenium_helper)
+        return
+
+    if ucc_smartx_browser_prelauncher:
+        selenium_helper = ucc_smartx_browser_prelauncher.acquire(test_case)
+        next_test_case = get_next_test_case(request, ucc_smartx_configs.driver)
+        if next_test_case:
+            ucc_smartx_browser_prelauncher.prelaunch(next_test_case)
+    else:
+        selenium_helper = launch_selenium_helper(
+            ucc_smartx_configs, splunk, splunk_web_uri, splunk_rest_uri, test_case
         )
-        raise (last_exc)
 
     yield selenium_helper
 
@@ -203,22 +544,124 @@ def ucc_smartx_selenium_helper(
     selenium_helper.browser.quit()
 
     if not ucc_smartx_configs.local_run:
-        LOGGER.debug("Notifying the status of the testcase to SauceLabs...")
+        notify_saucelabs(request, selenium_helper)
+
+
+def notify_saucelabs(request, selenium_helper):
+    """
+    Notify the status of the test case to SauceLabs.
+    A browser of the pool runs several test cases in the same job, so its job stays failed once a test case failed.
+    """
+    LOGGER.debug("Notifying the status of the testcase to SauceLabs...")
+    try:
+        if hasattr(request.node, "report"):
+            selenium_helper.job_failed = (
+                getattr(selenium_helper, "job_failed", False)
+                or request.node.report.failed
+            )
+            reporter = None
+            if not selenium_helper.skip_saucelab_job:
+                # The reporter thread is only started for the Saucelabs backends
+                reporter = get_sauce_job_reporter(request.config)
+            selenium_helper.update_saucelab_job(
+                selenium_helper.job_failed, reporter=reporter
+            )
+        else:
+            LOGGER.info(
+                "Could not notify to sauce labs because scope of fixture is not set to function"
+            )
+    except:
+        LOGGER.warn(
+            "Could not notify to Saucelabs \nTRACEBACK::{}".format(
+                traceback.format_exc()
+            )
+        )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Start the time budget of the test as per @pytest.mark.ucc_deadline or --ucc-test-deadline.
+    The budget covers the test body only, the browser setup is not part of it.
+    """
+    marker = item.get_closest_marker("ucc_deadline")
+    budget = marker.args[0] if marker else item.config.getoption("--ucc-test-deadline")
+    if budget:
+        set_deadline(Deadline(budget))
+    try:
+        yield
+    finally:
+        set_deadline(None)
+
+
+def get_sauce_job_reporter(config):
+    """
+    Get the SauceJobReporter of the session. It is created on the first use.
+    """
+    if getattr(config, "_ucc_smartx_sauce_reporter", None) is None:
+        config._ucc_smartx_sauce_reporter = SauceJobReporter()
+    return config._ucc_smartx_sauce_reporter
+
+
+def pytest_sessionfinish(session):
+    """
+    Send the pending Saucelabs job updates before the session ends.
+    On a pytest-xdist worker, the summary of the jobs is sent to the controller which writes the terminal summary.
+    Save the wait durations of the session to --ucc-timeouts-file.
+    """
+    sauce_job_reporter = getattr(session.config, "_ucc_smartx_sauce_reporter", None)
+    if sauce_job_reporter:
+        LOGGER.debug("Sending the pending status updates to SauceLabs...")
+        sauce_job_reporter.flush()
+        sauce_job_reporter.close()
+        if hasattr(session.config, "workeroutput"):
+            session.config.workeroutput[
+                "ucc_smartx_sauce_jobs"
+            ] = sauce_job_reporter.get_summary()
+    timeouts_file = session.config.getoption("--ucc-timeouts-file", None)
+    timeout_policy = getattr(session.config, "_ucc_smartx_timeout_policy", None)
+    if timeouts_file and timeout_policy:
         try:
-            if hasattr(request.node, "report"):
-                selenium_helper.update_saucelab_job(request.node.report.failed)
-            else:
-                LOGGER.info(
-                    "Could not notify to sauce labs because scope of fixture is not set to function"
-                )
+            timeout_policy.save(timeouts_file, get_timeout_environment(session.config))
         except:
             LOGGER.warn(
-                "Could not notify to Saucelabs \nTRACEBACK::{}".format(
-                    traceback.format_exc()
+                "Could not save the wait durations to {} \nTRACEBACK::{}".format(
+                    timeouts_file, traceback.format_exc()
                 )
             )
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Collect the summary of the Saucelabs jobs notified by a pytest-xdist worker
+    """
+    sauce_jobs = getattr(node, "workeroutput", {}).get("ucc_smartx_sauce_jobs")
+    if sauce_jobs:
+        node.config._ucc_smartx_sauce_jobs = (
+            getattr(node.config, "_ucc_smartx_sauce_jobs", []) + sauce_jobs
+        )
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    """
+    Add the Saucelabs job & video urls and the WebDriver command metrics to the terminal summary.
+    """
+    sauce_jobs = list(getattr(config, "_ucc_smartx_sauce_jobs", []))
+    sauce_job_reporter = getattr(config, "_ucc_smartx_sauce_reporter", None)
+    if sauce_job_reporter:
+        sauce_jobs.extend(sauce_job_reporter.get_summary())
+    if sauce_jobs:
+        terminalreporter.write_sep("=", "SauceLabs jobs")
+        for line in sauce_jobs:
+            terminalreporter.write_line(line)
+    command_metrics = getattr(config, "_ucc_smartx_command_metrics", None)
+    if command_metrics and command_metrics.commands:
+        terminalreporter.write_sep("=", "WebDriver commands")
+        for line in command_metrics.get_summary():
+            terminalreporter.write_line(line)
+
+
 @pytest.fixture(scope="session")
 def ucc_smartx_rest_helper(ucc_smartx_configs, splunk, splunk_rest_uri):
     # Try to configure rest endpoint
@@ -249,11 +692,35 @@ def ucc_smartx_rest_helper(ucc_smartx_configs, splunk, splunk_rest_uri):
 def ucc_smartx_selenium_wrapper(request):
     """
     Calls ucc_smartx_selenium_helper fixture
+    With --ucc-worker-browser, reset the browser of the worker after the test case.
+    A browser which can not be reset is quit & replaced by a new browser, so that the next test case does not reuse it.
     """
-    if "ucc_smartx_selenium_helper" in request.fixturenames:
-        request.node.selenium_helper = request.getfixturevalue(
-            "ucc_smartx_selenium_helper"
-        )
+    if "ucc_smartx_selenium_helper" not in request.fixturenames:
+        yield
+        return
+    selenium_helper = request.getfixturevalue("ucc_smartx_selenium_helper")
+    request.node.selenium_helper = selenium_helper
+    yield
+    if request.config.getoption("--ucc-worker-browser"):
+        try:
+            selenium_helper.reset_browser()
+        except:
+            LOGGER.warn(
+                "Could not reset the browser of the worker, launching a new browser \nTRACEBACK::{}".format(
+                    traceback.format_exc()
+                )
+            )
+            try:
+                selenium_helper.browser.quit()
+            except:
+                LOGGER.debug(
+                    "Could not quit the browser \nTRACEBACK::{}".format(
+                        traceback.format_exc()
+                    )
+                )
+            selenium_helper.start_browser()
+            if request.getfixturevalue("ucc_smartx_configs").wait_for_quiescence:
+                BrowserWait(selenium_helper.browser, 0).track_network()
 
 
 @pytest.mark.hookwrapper
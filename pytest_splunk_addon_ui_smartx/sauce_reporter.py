@@ -0,0 +1,145 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import logging
+import queue
+import threading
+import time
+
+import requests
+
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+SAUCE_API_URL = "https://saucelabs.com/rest/v1"
+
+
+class SauceJobReporter:
+    """
+    Notifies the status of the Saucelabs jobs from a background thread, so that the teardown of the test case does not wait for the Saucelabs API.
+
+    - The updates are queued in a bounded queue and sent one after the other over a single pooled HTTP session.
+    - A failed update is retried with an exponential backoff.
+    - The job & video urls returned by Saucelabs are collected for the session summary.
+    """
+
+    def __init__(
+        self, api_url=SAUCE_API_URL, max_queue_size=100, retry_count=3, backoff=1
+    ):
+        """
+        :param api_url: The url of the Saucelabs REST API
+        :param max_queue_size: The maximum number of pending updates. report() blocks while the queue is full.
+        :param retry_count: The number of times an update is tried
+        :param backoff: The amount of time in seconds to wait before the first retry. Doubled on each retry.
+        """
+        self.api_url = api_url
+        self.retry_count = retry_count
+        self.backoff = backoff
+        self.jobs = []
+        self.session = requests.Session()
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def report(self, username, access_key, session_id, status, test_case=None):
+        """
+        Queue the status update of a Saucelabs job.
+            :param username: Saucelabs username
+            :param access_key: Saucelabs access key
+            :param session_id: The session id of the browser, which is the Saucelabs job id
+            :param status: True if the test case failed
+            :param test_case: The name of the test case, used in the summary
+        """
+        self._queue.put((username, access_key, session_id, status, test_case))
+
+    def flush(self):
+        """
+        Wait till all the queued updates are sent.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Send the queued updates and stop the background thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+        self.session.close()
+
+    def get_summary(self):
+        """
+        Get the summary of the notified jobs
+            :returns: list of str, one line per job
+        """
+        summary = []
+        for job in self.jobs:
+            if job.get("error"):
+                summary.append(
+                    "{}: Could not notify Saucelabs job={}, error={}".format(
+                        job["test_case"], job["session_id"], job["error"]
+                    )
+                )
+            else:
+                summary.append(
+                    "{}: SauceLabs job_id={} Video_url={}".format(
+                        job["test_case"], job["job_id"], job["video_url"]
+                    )
+                )
+        return summary
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._update_job(*job)
+            finally:
+                self._queue.task_done()
+
+    def _update_job(self, username, access_key, session_id, status, test_case):
+        data = '{"passed": false}' if status else '{"passed": true}'
+        for try_number in range(self.retry_count):
+            try:
+                response = self.session.put(
+                    "{}/{}/jobs/{}".format(self.api_url, username, session_id),
+                    data=data,
+                    auth=(username, access_key),
+                    timeout=60,
+                )
+                response.raise_for_status()
+                response = response.json()
+                self.jobs.append(
+                    {
+                        "test_case": test_case,
+                        "session_id": session_id,
+                        "job_id": response.get("id"),
+                        "video_url": response.get("video_url"),
+                    }
+                )
+                return
+            except Exception as e:
+                last_exc = e
+                LOGGER.debug(
+                    "Could not notify Saucelabs job={} - Try={} error={}".format(
+                        session_id, try_number, e
+                    )
+                )
+                if try_number < self.retry_count - 1:
+                    time.sleep(self.backoff * 2**try_number)
+        LOGGER.warn(
+            "Could not notify Saucelabs job={}, error={}".format(session_id, last_exc)
+        )
+        self.jobs.append(
+            {"test_case": test_case, "session_id": session_id, "error": str(last_exc)}
+        )
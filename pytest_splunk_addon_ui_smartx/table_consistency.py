@@ -0,0 +1,187 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from .table_snapshot import TableSnapshot
+
+# The conf parameter of the columns which are not in the header_mapping of the table & are not named after their parameter
+DEFAULT_FIELDS = {"status": "disabled"}
+
+# The columns which are not compared
+SKIPPED_COLUMNS = {"", "actions"}
+
+
+def get_text(value):
+    """
+    The text shown in the table for a conf value
+        :param value: The value returned by the rest endpoint
+        :returns: str
+    """
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return str(value)
+
+
+def get_status(value):
+    """
+    The text shown in the status column for the value of the disabled parameter
+        :param value: The value returned by the rest endpoint
+        :returns: str "Enabled" or "Disabled"
+    """
+    if get_text(value).lower() in ("1", "true", "t", "yes", "y"):
+        return "Disabled"
+    return "Enabled"
+
+
+DEFAULT_TRANSFORMS = {"status": get_status}
+
+
+class ConsistencyDiff(
+    namedtuple("ConsistencyDiff", ["missing_in_ui", "missing_in_conf", "mismatches"])
+):
+    """
+    The differences between the table and the conf.
+        - missing_in_ui: Tuple of the stanzas which are not in the table
+        - missing_in_conf: Tuple of the rows which are not in the conf
+        - mismatches: Dict of {row_name: {header: (table value, conf value)}}, MISSING for a column which is not mapped to a conf parameter
+
+    It is false if the table matches the conf, and it lists all the differences when converted to str.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.missing_in_ui or self.missing_in_conf or self.mismatches)
+
+    def __str__(self):
+        lines = [
+            "  - {}: in the conf, not in the table".format(row_name)
+            for row_name in self.missing_in_ui
+        ]
+        lines.extend(
+            "  - {}: in the table, not in the conf".format(row_name)
+            for row_name in self.missing_in_conf
+        )
+        for row_name, cells in self.mismatches.items():
+            lines.extend(
+                "  - {}.{}: table={!r} conf={!r}".format(
+                    row_name, header, table_value, conf_value
+                )
+                for header, (table_value, conf_value) in cells.items()
+            )
+        return "\n".join(
+            ["{} differences between the table and the conf".format(len(lines))] + lines
+        )
+
+
+def get_conf_field(header, header_mapping):
+    """
+    Get the conf parameter shown in a column
+        :param header: The lowercase header of the column
+        :param header_mapping: The header_mapping of the table
+        :returns: The parameter name, None if the column is mapped to a column number
+    """
+    header = header.lower().replace(" ", "_")
+    field = header_mapping.get(header, DEFAULT_FIELDS.get(header, header))
+    if isinstance(field, int):
+        return None
+    return field
+
+
+def get_conf_snapshot(
+    stanzas, headers, header_mapping=None, transforms=None, defaults=None
+):
+    """
+    Get the snapshot of the table expected from the conf
+        :param stanzas: Dict of {stanza: {param: value}}, as returned by ListBackendConf.get_all_stanzas
+        :param headers: The lowercase headers of the columns
+        :param header_mapping: The header_mapping of the table
+        :param transforms: Dict of {header: function converting the conf value to the text shown in the column}
+        :param defaults: Dict of {header: conf value used when the parameter is not in the stanza}, None by default
+        :returns: TableSnapshot
+    """
+    header_mapping = header_mapping or dict()
+    transforms = dict(DEFAULT_TRANSFORMS, **(transforms or dict()))
+    defaults = defaults or dict()
+    rows = []
+    for stanza_name, params in stanzas.items():
+        values = dict()
+        for header in headers:
+            if header == "name":
+                values[header] = stanza_name
+                continue
+            field = get_conf_field(header, header_mapping)
+            if field is None:
+                continue
+            # A parameter with its default value is not always in the stanza, ex disabled
+            values[header] = transforms.get(header, get_text)(
+                params.get(field, defaults.get(header))
+            )
+        rows.append((stanza_name, values))
+    return TableSnapshot.from_rows(rows)
+
+
+def get_table_snapshot(table, columns=None):
+    """
+    Get the snapshot of all the pages of the table, or of the current page if the table can not switch pages
+        :param table: The table component
+        :param columns: List of the headers to read, all the headers if None
+        :returns: TableSnapshot
+    """
+    if hasattr(table, "iter_all_rows"):
+        snapshot = table.get_snapshot(columns, all_pages=True)
+    else:
+        snapshot = TableSnapshot.from_dict(table.get_table())
+    headers = [
+        header
+        for header in snapshot.columns
+        if header not in SKIPPED_COLUMNS
+        and (columns is None or header in [each.lower() for each in columns])
+    ]
+    return TableSnapshot(
+        snapshot.names, {header: snapshot.columns[header] for header in headers}
+    )
+
+
+def compare_table_with_conf(
+    table, backend_conf, columns=None, query=None, transforms=None, defaults=None
+):
+    """
+    Compare all the rows of the table with all the stanzas of the conf.
+    The conf is fetched in a background thread while the table is read, and the columns are mapped to the parameters through the header_mapping of the table.
+        :param table: The table component, ex InputTable or ConfigurationTable
+        :param backend_conf: ListBackendConf of the endpoint listed in the table
+        :param columns: List of the headers to compare, all the headers but actions if None
+        :param query: Query params to filter the stanzas, as in ListBackendConf.get_all_stanzas
+        :param transforms: Dict of {header: function converting the conf value to the text shown in the column}. The values are converted to str by default
+        :param defaults: Dict of {header: conf value used when the parameter is not in the stanza}, ex {"interval": "300"}
+        :returns: ConsistencyDiff
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stanzas = executor.submit(backend_conf.get_all_stanzas, query)
+        ui_snapshot = get_table_snapshot(table, columns)
+        conf_snapshot = get_conf_snapshot(
+            stanzas.result(),
+            list(ui_snapshot.columns),
+            getattr(table, "header_mapping", None),
+            transforms,
+            defaults,
+        )
+    diff = ui_snapshot.diff(conf_snapshot)
+    return ConsistencyDiff(diff.added, diff.removed, diff.changed)
@@ -0,0 +1,184 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import sys
+from collections import namedtuple
+
+
+class _Missing:
+    """
+    The value of a column which is not in the row
+    """
+
+    def __repr__(self):
+        return "MISSING"
+
+    def __reduce__(self):
+        return "MISSING"
+
+
+MISSING = _Missing()
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+class SnapshotDiff(namedtuple("SnapshotDiff", ["added", "removed", "changed"])):
+    """
+    The differences between two snapshots.
+        - added: Tuple of the row names only in the other snapshot
+        - removed: Tuple of the row names only in this snapshot
+        - changed: Dict of {row_name: {header: (value, other value)}}, MISSING for a column which is not in the row
+
+    It is false if the snapshots are equal.
+    """
+
+    __slots__ = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+class TableSnapshot:
+    """
+    Columnar snapshot of a table: the tuple of the row names, and one tuple of values per column.
+    The headers & the values are interned, so the repeated values (status, interval...) are stored once,
+    and two snapshots of the same table are compared mostly by identity.
+    """
+
+    __slots__ = ("names", "columns", "_positions")
+
+    def __init__(self, names, columns):
+        """
+        :param names: The row names
+        :param columns: Dict of {header: values}, one value per row in the order of the names
+        """
+        self.names = tuple(_intern(name) for name in names)
+        self.columns = {
+            _intern(header): tuple(_intern(value) for value in values)
+            for header, values in columns.items()
+        }
+        self._positions = None
+
+    @classmethod
+    def from_rows(cls, rows):
+        """
+        Create the snapshot from the rows, ex the items of Table.get_table or Table.iter_all_rows()
+            :param rows: Iterable of (row_name, {header: value}) tuples
+            :returns: TableSnapshot
+        """
+        names = []
+        columns = dict()
+        for row_name, values in rows:
+            for header in values:
+                if header not in columns:
+                    columns[header] = [MISSING] * len(names)
+            for header, column in columns.items():
+                column.append(_intern(values.get(header, MISSING)))
+            names.append(row_name)
+        return cls(names, columns)
+
+    @classmethod
+    def from_dict(cls, table):
+        """
+        Create the snapshot from the dictionary returned by Table.get_table
+            :param table: Dict of {row_name: {header: value}}
+            :returns: TableSnapshot
+        """
+        return cls.from_rows(table.items())
+
+    def to_dict(self):
+        """
+        Get the snapshot in the form of Table.get_table
+            :returns: Dict of {row_name: {header: value}}
+        """
+        return {row_name: self.get_row(row_name) for row_name in self.names}
+
+    def get_row(self, row_name):
+        """
+        Get the values of a row
+            :param row_name: The name of the row
+            :returns: Dict of {header: value}. Raises KeyError if the row is not in the snapshot
+        """
+        position = self._get_positions()[row_name]
+        return {
+            header: values[position]
+            for header, values in self.columns.items()
+            if values[position] is not MISSING
+        }
+
+    def get_column(self, header):
+        """
+        Get the values of a column
+            :param header: The lowercase header of the column
+            :returns: Tuple of the values, in the order of the row names
+        """
+        return self.columns[header]
+
+    def diff(self, other):
+        """
+        Compare the snapshot with a snapshot taken later
+            :param other: TableSnapshot
+            :returns: SnapshotDiff, false if the snapshots are equal
+        """
+        if self == other:
+            return SnapshotDiff((), (), {})
+        positions = self._get_positions()
+        other_positions = other._get_positions()
+        added = tuple(name for name in other.names if name not in positions)
+        removed = tuple(name for name in self.names if name not in other_positions)
+        changed = dict()
+        for header in list(self.columns) + [
+            header for header in other.columns if header not in self.columns
+        ]:
+            values = self.columns.get(header)
+            other_values = other.columns.get(header)
+            if values == other_values and self.names == other.names:
+                continue
+            for row_name, position in positions.items():
+                other_position = other_positions.get(row_name)
+                if other_position is None:
+                    continue
+                value = MISSING if values is None else values[position]
+                other_value = (
+                    MISSING if other_values is None else other_values[other_position]
+                )
+                if value != other_value:
+                    changed.setdefault(row_name, dict())[header] = (
+                        value,
+                        other_value,
+                    )
+        return SnapshotDiff(added, removed, changed)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __eq__(self, other):
+        if not isinstance(other, TableSnapshot):
+            return NotImplemented
+        return self.names == other.names and self.columns == other.columns
+
+    def __repr__(self):
+        return "<TableSnapshot {} rows x {} columns>".format(
+            len(self.names), len(self.columns)
+        )
+
+    def _get_positions(self):
+        if self._positions is None:
+            self._positions = dict()
+            for position, row_name in enumerate(self.names):
+                self._positions.setdefault(row_name, position)
+        return self._positions
@@ -0,0 +1,192 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+
+from .utils import file_lock
+
+LOGGER = logging.getLogger("pytest-ucc-smartx")
+
+# The override applied to all the waits, if no override is given for the wait or the component
+DEFAULT_OVERRIDE = "default"
+
+
+class TimeoutPolicy:
+    """
+    Derives the timeouts of the waits from the wait durations observed in the environment.
+
+    The timeout of a wait is looked up in this order:
+        - The override for the wait key, ex "present:#table tbody"
+        - The override for the component, ex "Table"
+        - The "default" override
+        - The calibrated timeout: the percentile of the observed durations multiplied by the safety factor,
+          once enough durations are recorded for the wait key
+        - The default timeout of the wait
+    """
+
+    def __init__(
+        self,
+        overrides=None,
+        samples=None,
+        safety_factor=3,
+        percentile=99,
+        min_samples=20,
+        minimum=5,
+        maximum=120,
+        max_samples=200,
+    ):
+        """
+        :param overrides: Dict of {wait key or component name or "default": timeout in seconds}
+        :param samples: Dict of {wait key: list of the durations observed in the previous runs}
+        :param safety_factor: The percentile duration is multiplied by the safety factor
+        :param percentile: The percentile of the durations used to calibrate the timeout
+        :param min_samples: The number of durations required before the timeout is calibrated
+        :param minimum: The lower bound of the calibrated timeouts, in seconds
+        :param maximum: The upper bound of the calibrated timeouts, in seconds
+        :param max_samples: The number of latest durations kept per wait key
+        """
+        self.overrides = dict(overrides or {})
+        self.samples = {key: list(values) for key, values in (samples or {}).items()}
+        self.new_samples = dict()
+        self.safety_factor = safety_factor
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.minimum = minimum
+        self.maximum = maximum
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+
+    def set_override(self, name, timeout):
+        """
+        Override the timeout of a wait key, a component or of all the waits
+            :param name: The wait key, the component class name or "default"
+            :param timeout: The timeout in seconds
+        """
+        self.overrides[name] = float(timeout)
+
+    def record(self, key, duration):
+        """
+        Record the time taken by a successful wait
+            :param key: The wait key, ex "present:#table tbody"
+            :param duration: The time taken by the wait in seconds
+        """
+        with self._lock:
+            for samples in (self.samples, self.new_samples):
+                values = samples.setdefault(key, [])
+                values.append(round(duration, 3))
+                del values[: -self.max_samples]
+
+    def get_calibrated(self, key):
+        """
+        Get the timeout derived from the recorded durations of the wait
+            :param key: The wait key
+            :returns: The timeout in seconds, None if not enough durations are recorded
+        """
+        with self._lock:
+            values = sorted(self.samples.get(key, []))
+        if len(values) < self.min_samples:
+            return None
+        index = max(math.ceil(self.percentile / 100 * len(values)) - 1, 0)
+        timeout = values[index] * self.safety_factor
+        return min(max(timeout, self.minimum), self.maximum)
+
+    def get_timeout(self, default, key=None, component=None):
+        """
+        Get the timeout of a wait
+            :param default: The timeout used if there is no override nor calibrated timeout
+            :param key: The wait key, None if the wait is not calibrated
+            :param component: The name of the component doing the wait
+            :returns: The timeout in seconds
+        """
+        for name in (key, component, DEFAULT_OVERRIDE):
+            if name is not None and name in self.overrides:
+                return self.overrides[name]
+        if key is not None:
+            calibrated = self.get_calibrated(key)
+            if calibrated is not None:
+                return calibrated
+        return default
+
+    @classmethod
+    def load(cls, path, environment, **kwargs):
+        """
+        Create the policy from the durations recorded in the previous runs in the same environment
+            :param path: The path of the timeouts file
+            :param environment: The name of the environment, ex "chrome:latest:local:headless"
+            :returns: TimeoutPolicy
+        """
+        samples = cls._read(path).get(environment, {})
+        LOGGER.debug(
+            "Loaded the durations of {} waits for {} from {}".format(
+                len(samples), environment, path
+            )
+        )
+        return cls(samples=samples, **kwargs)
+
+    def save(self, path, environment):
+        """
+        Add the durations recorded in this run to the timeouts file.
+        The file is read again & written under a lock file, so that the durations recorded by the other processes are kept.
+        Nothing is written if no duration was recorded since the last save.
+            :param path: The path of the timeouts file
+            :param environment: The name of the environment, ex "chrome:latest:local:headless"
+        """
+        with self._lock:
+            new_samples, self.new_samples = self.new_samples, dict()
+        if not new_samples:
+            return
+        with file_lock(path + ".lock"):
+            environments = self._read(path)
+            samples = environments.setdefault(environment, {})
+            for key, values in new_samples.items():
+                samples[key] = (samples.get(key, []) + values)[-self.max_samples :]
+            directory = os.path.dirname(os.path.abspath(path))
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False
+            ) as timeouts_file:
+                json.dump(environments, timeouts_file)
+            os.replace(timeouts_file.name, path)
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path) as timeouts_file:
+                return json.load(timeouts_file)
+        except (OSError, ValueError):
+            return dict()
+
+
+TIMEOUT_POLICY = TimeoutPolicy()
+
+
+def get_timeout_policy():
+    """
+    Get the timeout policy used by the components
+    """
+    return TIMEOUT_POLICY
+
+
+def set_timeout_policy(timeout_policy):
+    """
+    Set the timeout policy used by the components created afterwards
+        :param timeout_policy: TimeoutPolicy
+    """
+    global TIMEOUT_POLICY
+    TIMEOUT_POLICY = timeout_policy
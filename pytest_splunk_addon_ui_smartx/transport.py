@@ -0,0 +1,172 @@
+#
+# Copyright 2021 Splunk Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+
+import urllib3
+from msedge.selenium_tools.remote_connection import EdgeRemoteConnection
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+
+class CommandMetrics:
+    """
+    Collects the latency & the payload size of the WebDriver commands, aggregated by command name.
+    """
+
+    def __init__(self):
+        self.commands = dict()
+        self._lock = threading.Lock()
+
+    def record(self, command, duration, bytes_sent, bytes_received):
+        """
+        Record one execution of a command
+            :param command: The name of the WebDriver command
+            :param duration: The time taken by the command in seconds
+            :param bytes_sent: The size of the request bodies
+            :param bytes_received: The size of the response bodies, as sent over the wire
+        """
+        with self._lock:
+            metrics = self.commands.setdefault(
+                command,
+                {
+                    "count": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                    "bytes_sent": 0,
+                    "bytes_received": 0,
+                },
+            )
+            metrics["count"] += 1
+            metrics["total_time"] += duration
+            metrics["max_time"] = max(metrics["max_time"], duration)
+            metrics["bytes_sent"] += bytes_sent
+            metrics["bytes_received"] += bytes_received
+
+    def get_summary(self, limit=None):
+        """
+        Get the summary of the commands, the slowest in total first
+            :param limit: The maximum number of commands in the summary
+            :returns: list of str, one line per command
+        """
+        with self._lock:
+            commands = sorted(
+                self.commands.items(), key=lambda x: x[1]["total_time"], reverse=True
+            )
+        return [
+            "{}: count={} total={:.2f}s mean={:.1f}ms max={:.1f}ms sent={}B received={}B".format(
+                command,
+                metrics["count"],
+                metrics["total_time"],
+                metrics["total_time"] * 1000 / metrics["count"],
+                metrics["max_time"] * 1000,
+                metrics["bytes_sent"],
+                metrics["bytes_received"],
+            )
+            for command, metrics in commands[:limit]
+        ]
+
+
+class MeteredPoolManager(urllib3.PoolManager):
+    """
+    PoolManager which counts the bytes sent & received by the current thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+
+    def reset_counters(self):
+        self._local.bytes_sent = 0
+        self._local.bytes_received = 0
+
+    def get_counters(self):
+        return (
+            getattr(self._local, "bytes_sent", 0),
+            getattr(self._local, "bytes_received", 0),
+        )
+
+    def urlopen(self, method, url, redirect=True, **kw):
+        response = super().urlopen(method, url, redirect=redirect, **kw)
+        bytes_sent, bytes_received = self.get_counters()
+        self._local.bytes_sent = bytes_sent + len(kw.get("body") or b"")
+        self._local.bytes_received = bytes_received + int(
+            response.headers.get("Content-Length") or len(response.data)
+        )
+        return response
+
+
+class KeepAliveConnectionMixin:
+    """
+    Makes a RemoteConnection reuse its HTTP connections & record the metrics of each command.
+
+    - The connections to the hub are kept alive & pooled, so the TCP/TLS setup is done once instead of once per command.
+    - With compress, the responses are requested gzip encoded. It helps with the large responses, like screenshots & page sources.
+    """
+
+    def setup_transport(self, metrics=None, compress=False, pool_size=4):
+        """
+        :param metrics: CommandMetrics instance to record the commands to, None to not record them
+        :param compress: True to request gzip encoded responses
+        :param pool_size: The number of connections kept alive per host
+        """
+        self.metrics = metrics
+        self.compress = compress
+        timeout = self._timeout
+        if not isinstance(timeout, (int, float)):
+            # socket._GLOBAL_DEFAULT_TIMEOUT is not accepted by all the urllib3 versions
+            timeout = urllib3.Timeout.DEFAULT_TIMEOUT
+        self._conn = MeteredPoolManager(num_pools=2, maxsize=pool_size, timeout=timeout)
+
+    def get_remote_connection_headers(self, parsed_url, keep_alive=False):
+        headers = super().get_remote_connection_headers(parsed_url, keep_alive)
+        if self.compress:
+            headers["Accept-Encoding"] = "gzip"
+        return headers
+
+    def execute(self, command, params):
+        self._conn.reset_counters()
+        start_time = time.monotonic()
+        try:
+            return super().execute(command, params)
+        finally:
+            if self.metrics is not None:
+                self.metrics.record(
+                    command, time.monotonic() - start_time, *self._conn.get_counters()
+                )
+
+
+class KeepAliveRemoteConnection(KeepAliveConnectionMixin, RemoteConnection):
+    def __init__(self, remote_server_addr, metrics=None, compress=False, pool_size=4):
+        """
+        :param remote_server_addr: The url of the hub
+        :param metrics: CommandMetrics instance to record the commands to, None to not record them
+        :param compress: True to request gzip encoded responses
+        :param pool_size: The number of connections kept alive per host
+        """
+        super().__init__(remote_server_addr, keep_alive=True, resolve_ip=False)
+        self.setup_transport(metrics, compress, pool_size)
+
+
+class KeepAliveEdgeRemoteConnection(KeepAliveConnectionMixin, EdgeRemoteConnection):
+    def __init__(self, remote_server_addr, metrics=None, compress=False, pool_size=4):
+        """
+        :param remote_server_addr: The url of the hub
+        :param metrics: CommandMetrics instance to record the commands to, None to not record them
+        :param compress: True to request gzip encoded responses
+        :param pool_size: The number of connections kept alive per host
+        """
+        super().__init__(remote_server_addr, keep_alive=True)
+        self.setup_transport(metrics, compress, pool_size)
@@ -15,6 +15,9 @@
 #
 
 import json
+import os
+import time
+from contextlib import contextmanager
 
 
 def get_orca_deployment_urls():
@@ -56,3 +59,36 @@ def backend_retry(retry_count):
         return retry_method
 
     return backend_retry_decorator
+
+
+@contextmanager
+def file_lock(path, timeout=60, stale_after=300):
+    """
+    Lock shared between the processes (for example pytest-xdist workers) by creating the lock file exclusively.
+        :param path: Path of the lock file
+        :param timeout: The amount of time in seconds to wait for the lock
+        :param stale_after: The lock file older than this many seconds is considered as stale and removed
+    """
+    end_time = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)
+                    continue
+            except OSError:
+                continue
+            if time.time() > end_time:
+                raise TimeoutError("Could not acquire the lock {}".format(path))
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,4 +1,5 @@
 import importlib
+import inspect
 from copy import deepcopy
 from unittest.mock import ANY, MagicMock, patch
 
@@ -12,6 +13,7 @@ from pytest_splunk_addon_ui_smartx.base_test import (
     SeleniumHelper,
     UccTester,
 )
+from pytest_splunk_addon_ui_smartx.fake_webdriver import FakeBackend
 
 SAUCE_OPTIONS = {
     "screenResolution": "1280x768",
@@ -577,3 +579,336 @@ def test_update_sauce_job(status):
             auth=("SAUCE_USERNAME", "SAUCE_PASSWORD"),
             data='{"passed": false}' if status else '{"passed": true}',
         )
+
+
+def test_reset_browser():
+    with patch("selenium.webdriver.Chrome"):
+        selenium_helper = SeleniumHelper(**default_args_for_selenium_helper)
+    browser = selenium_helper.browser
+    browser.switch_to.alert.dismiss.side_effect = (
+        selenium.common.exceptions.NoAlertPresentException
+    )
+    browser.window_handles = ["main", "popup_1", "popup_2"]
+    selenium_helper.reset_browser()
+    assert browser.close.call_count == 2
+    browser.switch_to.window.assert_called_with("main")
+    browser.delete_all_cookies.assert_not_called()
+    browser.get.assert_called_with(default_args_for_selenium_helper["splunk_web_url"])
+
+
+SPLUNK_WEB_COOKIES = [
+    {"name": "splunkd_8000", "value": "abc", "path": "/", "secure": False},
+    {"name": "splunkweb_csrf_token_8000", "value": "def", "path": "/", "secure": False},
+]
+
+
+@pytest.fixture()
+def clean_splunk_web_cookies():
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    yield
+    pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper.splunk_web_cookies.clear()
+
+
+def test_cookie_login_injects_cookies(clean_splunk_web_cookies):
+    with patch("selenium.webdriver.Chrome"), patch(
+        "pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper.fetch_splunk_web_cookies",
+        return_value=SPLUNK_WEB_COOKIES,
+    ) as fetch, patch(
+        "pytest_splunk_addon_ui_smartx.base_test.Login.is_logged_in", return_value=True
+    ), patch(
+        "pytest_splunk_addon_ui_smartx.base_test.LoginPage"
+    ) as login_page:
+        for _ in range(2):
+            selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper(
+                **{**default_args_for_selenium_helper, "cookie_login": True}
+            )
+            for cookie in SPLUNK_WEB_COOKIES:
+                selenium_helper.browser.add_cookie.assert_any_call(cookie)
+    fetch.assert_called_once_with("https://localhost:8000", "admin", "Chang3d!")
+    login_page.assert_not_called()
+
+
+def test_cookie_login_falls_back_to_login_form(clean_splunk_web_cookies):
+    with patch("selenium.webdriver.Chrome"), patch(
+        "pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper.fetch_splunk_web_cookies",
+        return_value=SPLUNK_WEB_COOKIES,
+    ), patch(
+        "pytest_splunk_addon_ui_smartx.base_test.Login.is_logged_in", return_value=False
+    ), patch(
+        "pytest_splunk_addon_ui_smartx.base_test.LoginPage"
+    ) as login_page:
+        selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper(
+            **{**default_args_for_selenium_helper, "cookie_login": True}
+        )
+    selenium_helper.browser.delete_all_cookies.assert_called_once()
+    login_page.return_value.login.login.assert_called_once_with("admin", "Chang3d!")
+    assert (
+        pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper.splunk_web_cookies == {}
+    )
+
+
+def test_fetch_splunk_web_cookies_raise_exception_when_login_failed():
+    with patch("requests.Session") as session:
+        session.return_value.post.return_value.status_code = 401
+        with pytest.raises(Exception, match="Could not login to Splunk Web"):
+            SeleniumHelper.fetch_splunk_web_cookies(
+                "https://localhost:8000", "admin", "wrong"
+            )
+
+
+SAUCE_PLATFORMS = [
+    {"api_name": "safari", "short_version": "13", "os": "Mac 10.15"},
+    {"api_name": "safari", "short_version": "14", "os": "Mac 11"},
+    {"api_name": "chrome", "short_version": "88", "os": "Windows 10"},
+]
+
+
+@pytest.fixture()
+def safari_versions_cache(tmp_path):
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper
+    selenium_helper.safari_versions_cache_path = str(tmp_path / "safari.json")
+    return selenium_helper
+
+
+def test_safari_versions_are_cached_on_disk(safari_versions_cache):
+    with patch("requests.get") as req:
+        req.return_value.status_code = 200
+        req.return_value.json.return_value = SAUCE_PLATFORMS
+        assert safari_versions_cache.get_sauce_safari_versions() == {
+            13: "Mac 10.15",
+            14: "Mac 11",
+        }
+        safari_versions_cache.safari_versions = None
+        assert safari_versions_cache.get_sauce_safari_versions() == {
+            13: "Mac 10.15",
+            14: "Mac 11",
+        }
+    req.assert_called_once()
+
+
+def test_expired_safari_versions_cache_is_used_when_api_fails(safari_versions_cache):
+    safari_versions_cache.write_safari_versions_cache({14: "Mac 11"})
+    safari_versions_cache.safari_versions_cache_ttl = 0
+    with patch("requests.get") as req, patch("time.sleep") as sleep:
+        req.return_value.status_code = 500
+        assert safari_versions_cache.get_sauce_safari_versions() == {14: "Mac 11"}
+    req.assert_called_once()
+    sleep.assert_not_called()
+
+
+def test_sauce_safari_opts_latest_version(safari_versions_cache):
+    safari_versions_cache.safari_versions = {13: "Mac 10.15", 14: "Mac 11"}
+    with patch("selenium.webdriver.Remote"), patch("os.environ.get", lambda x: x):
+        selenium_helper = safari_versions_cache(
+            **{
+                **default_args_for_selenium_helper,
+                "browser": "safari",
+                "debug": False,
+                "browser_version": "latest",
+            }
+        )
+    safari_opts = selenium_helper.get_sauce_safari_opts("latest")
+    assert safari_opts["browserVersion"] == "14"
+    assert safari_opts["platformName"] == "Mac 11"
+
+
+def test_update_sauce_job_with_reporter():
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    with patch("selenium.webdriver.Remote"), patch("requests.put") as req, patch(
+        "os.environ.get", lambda x: x
+    ):
+        selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper(
+            **{**default_args_for_selenium_helper, "debug": False}
+        )
+        selenium_helper.browser_session = "1234"
+        reporter = MagicMock()
+        selenium_helper.update_saucelab_job(True, reporter=reporter)
+    req.assert_not_called()
+    reporter.report.assert_called_once_with(
+        "SAUCE_USERNAME", "SAUCE_PASSWORD", "1234", True, None
+    )
+
+
+def test_rename_test_case_renames_the_sauce_job():
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    with patch("selenium.webdriver.Remote"), patch("requests.put") as req, patch(
+        "os.environ.get", lambda x: x
+    ):
+        selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper(
+            **{**default_args_for_selenium_helper, "debug": False}
+        )
+        selenium_helper.browser_session = "1234"
+        selenium_helper.rename_test_case("chrome_test_two")
+    assert selenium_helper.test_case == "chrome_test_two"
+    req.assert_called_once_with(
+        "https://saucelabs.com/rest/v1/SAUCE_USERNAME/jobs/1234",
+        data='{"name": "chrome_test_two"}',
+        auth=("SAUCE_USERNAME", "SAUCE_PASSWORD"),
+        timeout=60,
+    )
+
+
+def test_driver_registry_builds_capabilities_once(monkeypatch):
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    driver_registry = pytest_splunk_addon_ui_smartx.base_test.DriverRegistry()
+    selenium_helper = pytest_splunk_addon_ui_smartx.base_test.SeleniumHelper
+    monkeypatch.setattr(
+        selenium_helper,
+        "get_sauce_chrome_opts",
+        MagicMock(
+            return_value={"browserName": "chrome", "sauce:options": {"name": None}}
+        ),
+    )
+    with patch("selenium.webdriver.Remote") as webdriver_, patch(
+        "os.environ.get", lambda x: x
+    ):
+        for test_case in ["test_one", "test_two"]:
+            selenium_helper(
+                **{
+                    **default_args_for_selenium_helper,
+                    "debug": False,
+                    "test_case": test_case,
+                    "driver_registry": driver_registry,
+                }
+            )
+            assert webdriver_.call_args[1]["desired_capabilities"] == {
+                "browserName": "chrome",
+                "sauce:options": {"name": test_case},
+            }
+        selenium_helper.get_sauce_chrome_opts.assert_called_once_with("88")
+
+
+def test_driver_registry_custom_backend(monkeypatch):
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    base_test = pytest_splunk_addon_ui_smartx.base_test
+    browser = MagicMock()
+
+    class CustomBackend(base_test.DriverBackend):
+        saucelabs = False
+        requires_login = False
+
+        def build_capabilities(self, selenium_helper):
+            return {"browserName": "custom"}
+
+        def create(self, selenium_helper):
+            return browser
+
+    monkeypatch.setitem(base_test.DriverRegistry.backends, "custom", CustomBackend)
+    with patch.object(base_test.SeleniumHelper, "login_to_splunk") as login:
+        selenium_helper = base_test.SeleniumHelper(
+            **{**default_args_for_selenium_helper, "browser": "custom", "debug": False}
+        )
+    assert selenium_helper.browser is browser
+    assert selenium_helper.skip_saucelab_job
+    login.assert_not_called()
+
+
+def test_driver_registry_rejects_incomplete_backend():
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    base_test = pytest_splunk_addon_ui_smartx.base_test
+
+    class IncompleteBackend(base_test.DriverBackend):
+        def build_capabilities(self, selenium_helper):
+            return {"browserName": "custom"}
+
+    with pytest.raises(TypeError, match="IncompleteBackend of custom .* create"):
+        base_test.DriverRegistry.register("custom", IncompleteBackend)
+    assert "custom" not in base_test.DriverRegistry.backends
+    for backend_class in list(base_test.DriverRegistry.backends.values()) + [
+        FakeBackend
+    ]:
+        assert not inspect.isabstract(backend_class), backend_class
+
+
+def test_driver_registry_register_import_path(monkeypatch):
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    base_test = pytest_splunk_addon_ui_smartx.base_test
+    monkeypatch.setattr(
+        base_test.DriverRegistry, "backends", dict(base_test.DriverRegistry.backends)
+    )
+    base_test.DriverRegistry.register(
+        "chrome_alias", "pytest_splunk_addon_ui_smartx.base_test:ChromeBackend"
+    )
+    backend = base_test.DriverRegistry().get_backend("chrome_alias", "latest")
+    assert isinstance(backend, base_test.ChromeBackend)
+
+
+def test_remote_backend_uses_keep_alive_connection():
+    importlib.reload(pytest_splunk_addon_ui_smartx.base_test)
+    base_test = pytest_splunk_addon_ui_smartx.base_test
+    command_metrics = MagicMock()
+    driver_registry = base_test.DriverRegistry(
+        command_metrics=command_metrics, compress=True
+    )
+    with patch("selenium.webdriver.Remote") as webdriver_:
+        base_test.SeleniumHelper(
+            **{
+                **default_args_for_selenium_helper,
+                "browser": "chrome_grid",
+                "driver_registry": driver_registry,
+            }
+        )
+    command_executor = webdriver_.call_args[1]["command_executor"]
+    assert isinstance(command_executor, base_test.KeepAliveRemoteConnection)
+    assert command_executor._url == "http://chrome-grid:4444/wd/hub"
+    assert command_executor.metrics is command_metrics
+    assert command_executor.compress
+
+
+@pytest.fixture()
+def ucc_polling_mock():
+    ucc = UccTester()
+    ucc.wait = MagicMock()
+
+    def f(x):
+        for _ in range(3):
+            out = x("fake_browser")
+            if out:
+                return out
+        raise TimeoutException
+
+    ucc.wait.until.side_effect = f
+    return ucc
+
+
+def test_assert_all_in_single_loop(ucc_polling_mock):
+    values = iter(["", "", "saved"])
+    fast_check = MagicMock(return_value="name")
+    ucc_polling_mock.assert_all(
+        [
+            (fast_check, "name"),
+            (lambda: next(values), "saved"),
+            {"left": 2, "right": [1, 2], "operator": "in"},
+        ]
+    )
+    ucc_polling_mock.wait.until.assert_called_once()
+    fast_check.assert_called_once_with()
+
+
+def test_assert_all_reports_all_failures(ucc_polling_mock):
+    def _timeout():
+        raise TimeoutException("host element is not present")
+
+    with pytest.raises(AssertionError) as e:
+        ucc_polling_mock.assert_all(
+            [
+                (1, 1),
+                (lambda x: x, 2, "==", {"x": 1}),
+                {"left": _timeout, "right": "", "msg": "host is empty"},
+            ]
+        )
+    assert str(e.value).splitlines() == [
+        "2 of 3 conditions failed",
+        "  - Left-value: 1, Operator: ==, Right-value: 2",
+        "  - host is empty, Error: Message: host element is not present",
+    ]
+
+
+def test_assert_all_accepts_a_generator(ucc_polling_mock):
+    with pytest.raises(AssertionError) as e:
+        ucc_polling_mock.assert_all((value, 1) for value in (1, 2))
+    assert str(e.value).splitlines() == [
+        "1 of 2 conditions failed",
+        "  - Left-value: 2, Operator: ==, Right-value: 1",
+    ]
@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock
+
+from pytest_splunk_addon_ui_smartx.browser_pool import BrowserPool, BrowserPrelauncher
+
+
+def test_acquire_launches_browser_when_pool_is_empty():
+    factory = MagicMock()
+    pool = BrowserPool(factory, 1)
+    assert pool.acquire("test_case") == factory.return_value
+    factory.assert_called_once_with("test_case")
+
+
+def test_released_browser_is_reset_and_reused():
+    factory = MagicMock()
+    pool = BrowserPool(factory, 1)
+    selenium_helper = pool.acquire()
+    pool.release(selenium_helper)
+    selenium_helper.reset_browser.assert_called_once()
+    selenium_helper.browser.quit.assert_not_called()
+    assert pool.acquire() is selenium_helper
+    factory.assert_called_once()
+
+
+def test_browser_is_quit_when_reset_fails():
+    factory = MagicMock()
+    factory.return_value.reset_browser.side_effect = Exception("reset failed")
+    pool = BrowserPool(factory, 1)
+    selenium_helper = pool.acquire()
+    pool.release(selenium_helper)
+    selenium_helper.browser.quit.assert_called_once()
+    pool.acquire()
+    assert factory.call_count == 2
+
+
+def test_browser_is_quit_when_pool_is_full():
+    factory = MagicMock(side_effect=lambda test_case: MagicMock())
+    pool = BrowserPool(factory, 1)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    first.browser.quit.assert_not_called()
+    second.browser.quit.assert_called_once()
+
+
+def test_close_quits_idle_and_leased_browsers():
+    factory = MagicMock(side_effect=lambda test_case: MagicMock())
+    pool = BrowserPool(factory, 2)
+    idle, leased = pool.acquire(), pool.acquire()
+    pool.release(idle)
+    pool.close()
+    idle.browser.quit.assert_called_once()
+    leased.browser.quit.assert_called_once()
+
+
+def test_prelauncher_returns_prelaunched_browser():
+    factory = MagicMock()
+    prelauncher = BrowserPrelauncher(factory)
+    prelauncher.prelaunch("next_test_case")
+    assert prelauncher.acquire("next_test_case") == factory.return_value
+    factory.assert_called_once_with("next_test_case")
+    prelauncher.close()
+
+
+def test_prelaunched_browser_is_renamed_after_the_test_case_using_it():
+    factory = MagicMock(side_effect=lambda test_case: MagicMock(test_case=test_case))
+    prelauncher = BrowserPrelauncher(factory)
+    prelauncher.prelaunch("next_test_case")
+    selenium_helper = prelauncher.acquire("other_test_case")
+    selenium_helper.rename_test_case.assert_called_once_with("other_test_case")
+    prelauncher.prelaunch("next_test_case")
+    prelauncher.acquire("next_test_case").rename_test_case.assert_not_called()
+    prelauncher.close()
+
+
+def test_prelauncher_launches_browser_when_prelaunch_failed():
+    factory = MagicMock(side_effect=[Exception("grid is busy"), "selenium_helper"])
+    prelauncher = BrowserPrelauncher(factory)
+    prelauncher.prelaunch("test_case")
+    assert prelauncher.acquire("test_case") == "selenium_helper"
+    assert factory.call_count == 2
+    prelauncher.close()
+
+
+def test_prelauncher_quits_unused_browser_on_close():
+    factory = MagicMock()
+    prelauncher = BrowserPrelauncher(factory)
+    prelauncher.prelaunch("test_case")
+    prelauncher.close()
+    factory.return_value.browser.quit.assert_called_once()
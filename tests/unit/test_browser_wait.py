@@ -0,0 +1,281 @@
+import json
+import shutil
+import subprocess
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import (
+    JavascriptException,
+    TimeoutException,
+    UnexpectedAlertPresentException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+from pytest_splunk_addon_ui_smartx.browser_wait import (
+    CLICKABLE,
+    HAS_TEXT,
+    INVISIBLE,
+    NETWORK_TRACKER,
+    PRESENT,
+    WAIT_FOR_CONDITION,
+    WAIT_FOR_ELEMENTS,
+    WAIT_FOR_LOADING,
+    WAIT_FOR_QUIESCENCE,
+    WATCH_LOADING,
+    BrowserWait,
+    UnsupportedScript,
+    presence_of_elements_located,
+)
+from pytest_splunk_addon_ui_smartx.components.base_component import Selector
+from pytest_splunk_addon_ui_smartx.components.table import Table
+from pytest_splunk_addon_ui_smartx.fake_webdriver import FakeWebDriver
+
+SPINNER = (By.CSS_SELECTOR, "#table .spinner")
+TABLE_BODY = (By.CSS_SELECTOR, "#table tbody")
+
+
+def test_wait_is_resolved_in_browser():
+    browser = MagicMock()
+    element = MagicMock()
+    browser.execute_async_script.return_value = element
+    browser_wait = BrowserWait(browser, 20)
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    assert browser_wait.until(CLICKABLE, By.CSS_SELECTOR, "#table button") is element
+    browser.execute_async_script.assert_called_with(
+        WAIT_FOR_CONDITION, CLICKABLE, "css", "#table button", 20000
+    )
+    browser.set_script_timeout.assert_called_once_with(30)
+    browser.find_element.assert_not_called()
+
+
+def test_wait_in_browser_timeout():
+    browser = MagicMock()
+    browser.execute_async_script.return_value = None
+    with pytest.raises(TimeoutException, match="table element is not present"):
+        BrowserWait(browser, 1).until(
+            PRESENT, By.XPATH, "//table", msg="table element is not present"
+        )
+
+
+def test_wait_falls_back_to_webdriver_wait():
+    browser = MagicMock()
+    browser.execute_async_script.side_effect = UnsupportedScript("Script not supported")
+    element = MagicMock()
+    browser.find_element.return_value = element
+    browser_wait = BrowserWait(browser, 1)
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    browser.execute_async_script.assert_called_once()
+    assert not browser_wait.is_supported()
+
+
+def test_transient_error_does_not_disable_the_wait_in_browser():
+    browser = MagicMock()
+    element = MagicMock()
+    browser.execute_async_script.side_effect = [
+        UnexpectedAlertPresentException("unexpected alert open"),
+        element,
+    ]
+    browser.find_element.return_value = element
+    browser_wait = BrowserWait(browser, 1)
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    assert browser_wait.is_supported()
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    assert browser.execute_async_script.call_count == 2
+    browser.find_element.assert_called_once()
+
+
+def test_javascript_error_disables_the_wait_in_browser():
+    browser = MagicMock()
+    browser.execute_async_script.side_effect = JavascriptException(
+        "Promise is not defined"
+    )
+    BrowserWait(browser, 1).until(PRESENT, By.ID, "table")
+    assert not BrowserWait(browser, 1).is_supported()
+
+
+def test_error_message_does_not_disable_the_wait_in_browser():
+    browser = MagicMock()
+    element = MagicMock()
+    browser.execute_async_script.side_effect = [
+        WebDriverException("unsupported operation on the element"),
+        element,
+    ]
+    browser.find_element.return_value = element
+    browser_wait = BrowserWait(browser, 1)
+    assert browser_wait.until(PRESENT, By.ID, "table") is element
+    assert browser_wait.is_supported()
+
+
+def test_unsupported_locator_is_waited_in_python():
+    browser = MagicMock()
+    element = MagicMock()
+    browser.find_element.return_value = element
+    assert BrowserWait(browser, 1).until(PRESENT, By.CLASS_NAME, "table") is element
+    browser.execute_async_script.assert_not_called()
+
+
+def test_fallback_conditions_with_fake_webdriver():
+    browser = FakeWebDriver(
+        '<html><body><div id="msg">Saved</div><div id="empty" style="display: none"></div></body></html>'
+    )
+    browser_wait = BrowserWait(browser, 1)
+    assert browser_wait.until(HAS_TEXT, By.ID, "msg").text == "Saved"
+    assert browser_wait.until(INVISIBLE, By.ID, "empty")
+    with pytest.raises(TimeoutException):
+        browser_wait.until(HAS_TEXT, By.ID, "empty", msg="no text")
+
+
+def test_loading_is_watched_before_the_action():
+    browser = MagicMock()
+    browser.execute_async_script.return_value = "loaded"
+    action = MagicMock()
+    with BrowserWait(browser, 20).watch_loading(SPINNER, TABLE_BODY):
+        browser.execute_script.assert_called_once_with(
+            WATCH_LOADING, "loading:#table .spinner", "#table .spinner", "#table tbody"
+        )
+        action()
+    action.assert_called_once()
+    browser.execute_async_script.assert_called_once_with(
+        WAIT_FOR_LOADING, "loading:#table .spinner", 5000, 20000
+    )
+    browser.find_element.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "result,msg",
+    [
+        ("not_started", "did not appear"),
+        ("loading", "did not disappear"),
+    ],
+)
+def test_loading_timeout(result, msg):
+    browser = MagicMock()
+    browser.execute_async_script.return_value = result
+    with pytest.raises(TimeoutException, match=msg):
+        with BrowserWait(browser, 20).watch_loading(SPINNER, TABLE_BODY):
+            pass
+
+
+def test_loading_is_not_waited_if_the_action_fails():
+    browser = MagicMock()
+    with pytest.raises(ValueError):
+        with BrowserWait(browser, 20).watch_loading(SPINNER, TABLE_BODY):
+            raise ValueError("action failed")
+    browser.execute_async_script.assert_not_called()
+
+
+def test_table_filter_waits_for_the_watched_spinner():
+    browser = MagicMock()
+    textbox = MagicMock()
+    browser.execute_async_script.side_effect = lambda script, *args: (
+        "not_started" if script == WAIT_FOR_LOADING else textbox
+    )
+    Table(browser, Selector(select="#table")).clean_filter()
+    textbox.clear.assert_called_once()
+    assert browser.execute_script.call_args[0][0] == WATCH_LOADING
+    assert browser.execute_async_script.call_args[0][0] == WAIT_FOR_LOADING
+
+
+def test_wait_for_quiescence():
+    browser = MagicMock()
+    browser.execute_async_script.return_value = True
+    browser_wait = BrowserWait(browser, 20)
+    assert browser_wait.wait_for_quiescence(quiet_period=0.2)
+    browser.execute_async_script.assert_called_once_with(
+        WAIT_FOR_QUIESCENCE, 200, 20000
+    )
+    browser.execute_async_script.return_value = None
+    with pytest.raises(TimeoutException, match="did not settle"):
+        browser_wait.wait_for_quiescence()
+
+
+def test_settle_only_when_network_is_tracked():
+    browser = MagicMock()
+    browser.execute_async_script.return_value = None
+    browser_wait = BrowserWait(browser, 20)
+    browser_wait.settle()
+    browser.execute_async_script.assert_not_called()
+    browser_wait.track_network()
+    browser.execute_cdp_cmd.assert_called_once_with(
+        "Page.addScriptToEvaluateOnNewDocument", {"source": NETWORK_TRACKER}
+    )
+    browser_wait.settle()
+    assert browser.execute_async_script.call_args[0][0] == WAIT_FOR_QUIESCENCE
+
+
+def test_quiescence_is_not_waited_without_scripts():
+    browser = FakeWebDriver()
+    browser_wait = BrowserWait(browser, 20)
+    browser_wait.track_network()
+    assert not browser_wait.wait_for_quiescence()
+    browser_wait.settle()
+
+
+def test_elements_are_returned_by_the_wait():
+    browser = MagicMock()
+    rows = [MagicMock(), MagicMock()]
+    browser.execute_async_script.return_value = rows
+    table = Table(browser, Selector(select="#table"))
+    assert table.get_elements("rows", min_count=2, settle=0.3) == rows
+    browser.execute_async_script.assert_called_once_with(
+        WAIT_FOR_ELEMENTS,
+        "css",
+        '#table tbody[data-test="body"] tr[data-test="row"]',
+        2,
+        300,
+        20000,
+    )
+    browser.find_elements.assert_not_called()
+
+
+def test_presence_of_elements_located_min_count_and_settle():
+    browser = FakeWebDriver(
+        '<html><body><ul id="list"><li>1</li><li>2</li></ul></body></html>'
+    )
+    condition = presence_of_elements_located((By.CSS_SELECTOR, "#list li"), 3)
+    assert not condition(browser)
+    condition = presence_of_elements_located(
+        (By.CSS_SELECTOR, "li"), settle=0.2, parent=browser.find_element(By.ID, "list")
+    )
+    assert not condition(browser)
+    time.sleep(0.2)
+    assert [li.text for li in condition(browser)] == ["1", "2"]
+    elements = BrowserWait(browser, 1).until_elements(By.CSS_SELECTOR, "#list li")
+    assert len(elements) == 2
+    with pytest.raises(TimeoutException, match="not enough items"):
+        BrowserWait(browser, 1).until_elements(
+            By.CSS_SELECTOR, "#list li", min_count=3, msg="not enough items"
+        )
+
+
+# Runs WAIT_FOR_CONDITION with a page in which the element becomes visible after 300ms, without any DOM mutation
+CSS_TRANSITION_PAGE = """
+var visible = false;
+setTimeout(function() { visible = true; }, 300);
+var element = {offsetWidth: 10, offsetHeight: 10, getClientRects: function() { return [1]; }};
+var document = {querySelector: function() { return element; }};
+var window = {getComputedStyle: function() { return {visibility: visible ? "visible" : "hidden", display: "block"}; }};
+function MutationObserver() { this.observe = function() {}; this.disconnect = function() {}; }
+var start = Date.now();
+function done(result) { console.log(JSON.stringify({found: result === element, elapsed: Date.now() - start})); }
+"""
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node is not installed")
+def test_visibility_change_without_mutation_is_seen_in_browser():
+    script = "(function() {{ {} }})('visible', 'css', '#modal', 5000, done);".format(
+        WAIT_FOR_CONDITION
+    )
+    output = subprocess.run(
+        ["node", "-e", CSS_TRANSITION_PAGE + script],
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=10,
+    ).stdout
+    result = json.loads(output)
+    assert result["found"]
+    assert result["elapsed"] < 1000
@@ -0,0 +1,98 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from pytest_splunk_addon_ui_smartx.browser_wait import (
+    PRESENT,
+    WAIT_FOR_CONDITION,
+    WAIT_FOR_LOADING,
+    BrowserWait,
+)
+from pytest_splunk_addon_ui_smartx.components.base_component import Selector
+from pytest_splunk_addon_ui_smartx.components.table import Table
+from pytest_splunk_addon_ui_smartx.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    DeadlineWait,
+    set_deadline,
+)
+
+
+@pytest.fixture()
+def deadline():
+    deadline = Deadline(1)
+    set_deadline(deadline)
+    yield deadline
+    set_deadline(None)
+
+
+def test_wait_is_shrunk_to_the_remaining_budget(deadline):
+    browser = MagicMock()
+    BrowserWait(browser, 20).until(PRESENT, By.CSS_SELECTOR, "#table")
+    timeout = browser.execute_async_script.call_args[0][-1]
+    assert 0 < timeout <= 1000
+    assert deadline.waits["present:#table"][0] == 1
+
+
+def test_deadline_exceeded_with_summary(deadline):
+    table = Table(MagicMock(), Selector(select="#table"))
+    start_time = time.monotonic()
+    with pytest.raises(DeadlineExceeded) as e:
+        table.wait_for(lambda driver: False, msg="rows to be sorted")
+    assert time.monotonic() - start_time < 5
+    assert not isinstance(e.value, TimeoutException)
+    assert (
+        "Test time budget of 1s exceeded while waiting for: rows to be sorted"
+        in str(e.value)
+    )
+    assert "in 1 wait(s): rows to be sorted" in str(e.value)
+    with pytest.raises(DeadlineExceeded, match="waiting for: rows element"):
+        table.wait_for("rows")
+
+
+def test_deadline_is_not_swallowed_by_get_elements(deadline):
+    browser = MagicMock()
+    browser.execute_async_script.return_value = []
+    table = Table(browser, Selector(select="#table"))
+    with pytest.raises(DeadlineExceeded, match="rows elements are not present"):
+        table.get_elements("rows")
+    with pytest.raises(DeadlineExceeded):
+        table.get_child_elements("rows")
+
+
+def test_loading_watch_is_shrunk_to_the_remaining_budget(deadline):
+    browser = MagicMock()
+    browser.execute_async_script.return_value = "loading"
+    with pytest.raises(DeadlineExceeded, match="Loading spinner did not disappear"):
+        with BrowserWait(browser, 20).watch_loading(
+            (By.CSS_SELECTOR, "#table .spinner"), (By.CSS_SELECTOR, "#table tbody")
+        ):
+            pass
+    (
+        script,
+        watch_name,
+        appear_timeout,
+        timeout,
+    ) = browser.execute_async_script.call_args[0]
+    assert script == WAIT_FOR_LOADING
+    assert 0 < appear_timeout <= timeout <= 1000
+
+
+def test_wait_timeout_within_the_budget():
+    set_deadline(Deadline(60))
+    try:
+        with pytest.raises(TimeoutException):
+            DeadlineWait(None, 0.5).until(lambda driver: False)
+    finally:
+        set_deadline(None)
+
+
+def test_no_deadline():
+    browser = MagicMock()
+    BrowserWait(browser, 20).until(PRESENT, By.CSS_SELECTOR, "#table")
+    browser.execute_async_script.assert_called_with(
+        WAIT_FOR_CONDITION, PRESENT, "css", "#table", 20000
+    )
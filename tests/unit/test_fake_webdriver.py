@@ -0,0 +1,679 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import lxml.html
+import pytest
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+from pytest_splunk_addon_ui_smartx.browser_wait import (
+    GET_LOADING_WATCH,
+    WAIT_FOR_CONDITION,
+    WATCH_LOADING,
+    BrowserWait,
+    UnsupportedScript,
+)
+from pytest_splunk_addon_ui_smartx.components.base_component import Selector
+from pytest_splunk_addon_ui_smartx.components.controls.multi_select import (
+    MultiSelect,
+)
+from pytest_splunk_addon_ui_smartx.components.controls.single_select import (
+    SingleSelect,
+)
+from pytest_splunk_addon_ui_smartx.components.controls.textbox import TextBox
+from pytest_splunk_addon_ui_smartx.components.entity import Entity, SaveResult
+from pytest_splunk_addon_ui_smartx.components.message_tray import MessageTray
+from pytest_splunk_addon_ui_smartx.components.table import GET_TABLE, Table
+from pytest_splunk_addon_ui_smartx.fake_webdriver import (
+    FakeBackend,
+    FakeWebDriver,
+    FakeWebElement,
+)
+
+TABLE_PAGE = """
+<html><body>
+<div id="table">
+  <span class="inputNumber">2 Inputs</span>
+  <table>
+    <thead><tr>
+      <th data-test="head-cell" data-test-sort-dir="asc"><div><span>Name<i class="sort">^</i></span></div></th>
+      <th data-test="head-cell" data-test-sort-dir="none"><div><span>Interval</span></div></th>
+      <th data-test="head-cell" data-test-sort-dir="none"><div><span>Status</span></div></th>
+    </tr></thead>
+    <tbody data-test="body">
+      <tr data-test="row">
+        <td data-test="cell" data-column="name">input_1</td>
+        <td data-test="cell" data-column="interval">60</td>
+        <td data-test="cell" data-column="disabled"><span data-test="status">Enabled</span></td>
+      </tr>
+      <tr data-test="row">
+        <td data-test="cell" data-column="name">input_2</td>
+        <td data-test="cell" data-column="interval">
+          <div>120</div>
+          <div style="display: none">hidden</div>
+        </td>
+        <td data-test="cell" data-column="disabled"><span data-test="status">Disabled</span></td>
+      </tr>
+    </tbody>
+  </table>
+</div>
+</body></html>
+"""
+
+SINGLE_SELECT_PAGE = """
+<html><body>
+<div id="index">
+  <label data-test="label" id="index-label">Index <span>*</span></label>
+  <button class="dropdownBox" data-test-popover-id="popover-index" data-test-loading="false" data-test-value="" label="">Select...</button>
+</div>
+<div id="popover-index" style="display: none">
+  <div data-test="option" data-test-value="main"><span data-test="label">main</span></div>
+  <div data-test="option" data-test-value="summary"><span data-test="label">summary</span></div>
+</div>
+</body></html>
+"""
+
+MULTI_SELECT_PAGE = """
+<html><body>
+<div id="roles">
+  <label data-test="label" id="roles-label">Roles</label>
+  <div role="listbox" data-test-popover-id="popover-roles">
+    <button data-test="selected-option" role="option">admin<span data-test="crossmark"></span></button>
+    <input data-test="textbox">
+  </div>
+</div>
+<div id="popover-roles" style="display: none">
+  <div data-test="option"><span data-test="label">admin</span></div>
+  <div data-test="option"><span data-test="label">power</span></div>
+</div>
+</body></html>
+"""
+
+MESSAGE_TRAY_PAGE = """
+<html><body>
+<a title="Messages">Messages</a>
+<div data-view="views/shared/splunkbar/messages/MenuContents">
+  <div data-view="views/shared/splunkbar/messages/Message">
+    <span data-role="icon"><i data-view="views/shared/Icon" data-icon="error"></i></span>
+    <span data-role="content">Could not reach the server</span>
+    <a data-action="delete">x</a>
+  </div>
+  <div data-view="views/shared/splunkbar/messages/Message">
+    <span data-role="icon"><i data-view="views/shared/Icon" data-icon="info"></i></span>
+    <span data-role="content">Restart required</span>
+    <a data-action="delete">x</a>
+  </div>
+</div>
+</body></html>
+"""
+
+ENTITY_PAGE = """
+<html><body>
+<div id="entity">
+  <input data-test="textbox" name="name">
+  <button class="saveBtn">Save</button>
+</div>
+</body></html>
+"""
+
+
+@pytest.fixture()
+def table_driver():
+    return FakeWebDriver(TABLE_PAGE)
+
+
+def test_find_elements_by_locators(table_driver):
+    assert len(table_driver.find_elements(By.CSS_SELECTOR, '[data-test="row"]')) == 2
+    assert table_driver.find_element(By.ID, "table").tag_name == "div"
+    assert (
+        table_driver.find_element(By.XPATH, "//td[@data-column='name']").text
+        == "input_1"
+    )
+    with pytest.raises(NoSuchElementException):
+        table_driver.find_element_by_css_selector(".missing")
+
+
+def test_child_css_selector_matches_against_the_page(table_driver):
+    row = table_driver.find_elements_by_css_selector('[data-test="row"]')[1]
+    cell = row.find_element(
+        By.CSS_SELECTOR, '#table [data-test="cell"][data-column="name"]'
+    )
+    assert cell.text == "input_2"
+    assert row.find_elements(By.CSS_SELECTOR, "#table") == []
+
+
+def test_same_node_is_same_element(table_driver):
+    assert table_driver.find_element(By.ID, "table") == table_driver.find_element(
+        By.CSS_SELECTOR, "#table"
+    )
+
+
+def test_text_skips_hidden_nodes(table_driver):
+    cell = table_driver.find_elements_by_css_selector('[data-column="interval"]')[1]
+    assert cell.text == "120"
+    assert "hidden" in cell.get_attribute("textContent")
+    assert not table_driver.find_element_by_xpath(
+        "//div[@style='display: none']"
+    ).is_displayed()
+
+
+def test_element_is_stale_after_page_load(table_driver):
+    row = table_driver.find_element(By.CSS_SELECTOR, '[data-test="row"]')
+    table_driver.load_html(TABLE_PAGE)
+    with pytest.raises(StaleElementReferenceException):
+        row.text
+
+
+def test_element_is_stale_after_removal(table_driver):
+    row = table_driver.find_element(By.CSS_SELECTOR, '[data-test="row"]')
+    row.node.getparent().remove(row.node)
+    with pytest.raises(StaleElementReferenceException):
+        row.click()
+    assert len(table_driver.find_elements(By.CSS_SELECTOR, '[data-test="row"]')) == 1
+
+
+def test_send_keys_and_clear():
+    driver = FakeWebDriver('<html><body><input id="filter" value="a"></body></html>')
+    on_send_keys = MagicMock()
+    driver.on("send_keys", "#filter", on_send_keys)
+    textbox = driver.find_element(By.ID, "filter")
+    textbox.send_keys("bc", Keys.ENTER)
+    assert textbox.get_attribute("value") == "abc"
+    on_send_keys.assert_called_once_with(driver, textbox, "bc" + Keys.ENTER)
+    textbox.clear()
+    assert textbox.get_attribute("value") == ""
+
+
+def test_boolean_attributes():
+    driver = FakeWebDriver(
+        '<html><body><input id="a" disabled readonly checked></body></html>'
+    )
+    element = driver.find_element(By.ID, "a")
+    assert element.get_attribute("readOnly") == "true"
+    assert element.get_attribute("disabled") == "true"
+    assert element.get_attribute("required") is None
+    assert not element.is_enabled()
+    assert element.is_selected()
+
+
+def test_get_loads_registered_page():
+    driver = FakeWebDriver(pages={"https://localhost:8000/en-US/app": TABLE_PAGE})
+    driver.get("https://localhost:8000/en-US/app")
+    assert driver.current_url == "https://localhost:8000/en-US/app"
+    assert driver.find_elements(By.CSS_SELECTOR, '[data-test="row"]')
+
+
+def test_unknown_script_raise_exception(table_driver):
+    with pytest.raises(UnsupportedScript):
+        table_driver.execute_script("return document.title")
+    table_driver.register_script("return document.title", lambda driver: "title")
+    assert table_driver.execute_script("return document.title") == "title"
+
+
+def test_table(table_driver):
+    table = Table(table_driver, Selector(select="#table"))
+    assert table.get_headers() == ["Name", "Interval", "Status"]
+    assert table.get_row_count() == 2
+    assert table.get_count_number() == 2
+    assert table.get_column_values("interval") == ["60", "120"]
+    assert table.get_cell_value("input_2", "status") == "Disabled"
+    assert table.get_sort_order() == {"header": "Name^", "ascending": True}
+    assert table.get_table() == {
+        "input_1": {"name": "input_1", "interval": "60", "status": "Enabled"},
+        "input_2": {"name": "input_2", "interval": "120", "status": "Disabled"},
+    }
+    with pytest.raises(ValueError):
+        table.get_cell_value("input_3", "name")
+
+
+def test_table_is_read_with_a_single_script(table_driver):
+    table_driver.find_element(By.CSS_SELECTOR, '[data-test="row"]').node.append(
+        lxml.html.fragment_fromstring('<td><a class="editBtn">Edit</a></td>')
+    )
+    table = Table(table_driver, Selector(select="#table"), mapping={"period": 2})
+    table_driver.find_element = MagicMock(wraps=table_driver.find_element)
+    assert table.get_column_values("period") == ["60", "120"]
+    assert table.get_table()["input_1"] == {
+        "name": "input_1",
+        "interval": "60",
+        "status": "Enabled",
+    }
+    table_driver.find_element.assert_called()
+    assert table._extract_table()["rows"][0]["actions"] == ["Edit"]
+    assert table._extract_table()["rows"][1]["actions"] == []
+    # Only the table body & the load spinner are looked up, never the rows one by one
+    assert all(
+        call[0]
+        in (
+            (By.CSS_SELECTOR, '#table tbody[data-test="body"]'),
+            (By.CSS_SELECTOR, '#table [data-test="wait-spinner"]'),
+        )
+        for call in table_driver.find_element.call_args_list
+    )
+    extracted = table.get_table()
+    del table_driver.scripts[GET_TABLE]
+    assert table.get_table() == extracted
+    assert table.get_column_values("period") == ["60", "120"]
+
+
+def test_table_script_reads_the_same_cells_as_the_cell_by_cell_read():
+    driver = FakeWebDriver(
+        TABLE_PAGE.replace(
+            '<td data-test="cell" data-column="name">input_1</td>',
+            '<td data-test="cell" data-column="name">input_1'
+            '<span data-column="interval" style="display: none">tooltip</span></td>',
+        )
+    )
+    table = Table(driver, Selector(select="#table"))
+    extracted = table.get_table()
+    assert extracted["input_1"]["interval"] == "60"
+    del driver.scripts[GET_TABLE]
+    assert table.get_table() == extracted
+
+
+def test_table_rows_are_looked_up_in_the_index(table_driver):
+    table = Table(table_driver, Selector(select="#table"))
+    assert table.get_cell_value("input_2", "interval") == "120"
+    table._get_rows = MagicMock(wraps=table._get_rows)
+    assert table.get_cell_value("input_1", "interval") == "60"
+    assert table.get_cell_value("input_2", "status") == "Disabled"
+    table._get_rows.assert_not_called()
+    # The rows are rendered again, the index is built again
+    table_driver.load_html(TABLE_PAGE.replace("input_2", "input_3"))
+    assert table.get_cell_value("input_3", "interval") == "120"
+    table._get_rows.assert_called_once()
+    # The row element now shows another row
+    cell = table_driver.find_element(By.CSS_SELECTOR, '[data-column="name"]')
+    cell.node.text = "input_4"
+    with pytest.raises(ValueError):
+        table.get_cell_value("input_1", "name")
+    assert table.get_cell_value("input_4", "interval") == "60"
+
+
+def _paged_table(page, pages, page_size=2):
+    rows = [
+        '<tr data-test="row"><td data-test="cell" data-column="name">input_{}</td>'
+        '<td data-test="cell" data-column="interval">{}</td></tr>'.format(n, 60 * n)
+        for n in range(1, 6)
+    ]
+    buttons = [("Prev", page - 1, page == 1)]
+    buttons += [(str(n), n, False) for n in range(1, pages + 1)]
+    buttons += [("Next", page + 1, page == pages)]
+    return (
+        '<html><body><div id="table"><table><thead><tr>'
+        '<th data-test="head-cell"><div><span>Name</span></div></th>'
+        '<th data-test="head-cell"><div><span>Interval</span></div></th>'
+        '</tr></thead><tbody data-test="body">{}</tbody></table>{}</div></body></html>'
+    ).format(
+        "".join(rows[(page - 1) * page_size : page * page_size]),
+        "".join(
+            '<button data-test-page="{}"{}>{}</button>'.format(
+                target, " disabled" if disabled else "", label
+            )
+            for label, target, disabled in buttons
+        ),
+    )
+
+
+def test_iter_all_rows():
+    driver = FakeWebDriver(_paged_table(2, 3))
+    pages = MagicMock()
+    pages.side_effect = lambda driver, button: driver.load_html(
+        _paged_table(int(button.get_attribute("data-test-page")), 3)
+    )
+    driver.on("click", "button[data-test-page]", pages)
+    table = Table(driver, Selector(select="#table"))
+    assert list(table.iter_all_rows()) == [
+        ("input_{}".format(n), {"name": "input_{}".format(n), "interval": str(60 * n)})
+        for n in range(1, 6)
+    ]
+    assert pages.call_count == 3
+    rows = table.iter_all_rows(columns=["Interval"])
+    assert next(rows) == ("input_1", {"interval": "60"})
+    assert next(rows) == ("input_2", {"interval": "120"})
+    rows.close()
+    # Only the switch to the first page, the second page is not read
+    assert pages.call_count == 4
+    snapshot = table.get_snapshot(columns=["Interval"], all_pages=True)
+    assert snapshot.get_column("interval") == ("60", "120", "180", "240", "300")
+
+
+def _open_popover(popover):
+    def _open(driver, element):
+        driver.find_element(By.CSS_SELECTOR, popover).node.set("style", "")
+
+    return _open
+
+
+def _close_popover(driver, popover):
+    driver.find_element(By.CSS_SELECTOR, popover).node.set("style", "display: none")
+
+
+def test_single_select():
+    driver = FakeWebDriver(SINGLE_SELECT_PAGE)
+
+    def _select_option(driver, option):
+        dropdown = driver.find_element(By.CSS_SELECTOR, "#index .dropdownBox").node
+        dropdown.set("data-test-value", option.get_attribute("data-test-value"))
+        dropdown.set("label", option.text)
+        _close_popover(driver, "#popover-index")
+
+    driver.on("click", "#index .dropdownBox", _open_popover("#popover-index"))
+    driver.on("click", '[data-test="option"]', _select_option)
+    single_select = SingleSelect(driver, Selector(select="#index"))
+    assert single_select.get_input_label() == "Index"
+    assert single_select.get_value() is False
+    assert single_select.select("Summary")
+    assert single_select.get_value() == "summary"
+    with pytest.raises(ValueError):
+        single_select.select("history")
+
+
+def test_multi_select():
+    driver = FakeWebDriver(MULTI_SELECT_PAGE)
+
+    def _select_option(driver, option):
+        chip = lxml.html.fragment_fromstring(
+            '<button data-test="selected-option" role="option">{}'
+            '<span data-test="crossmark"></span></button>'.format(option.text)
+        )
+        driver.find_element(By.CSS_SELECTOR, "#roles input").node.addprevious(chip)
+        _close_popover(driver, "#popover-roles")
+
+    def _deselect(driver, crossmark):
+        chip = crossmark.node.getparent()
+        chip.getparent().remove(chip)
+
+    driver.on("click", "#roles input", _open_popover("#popover-roles"))
+    driver.on("click", '[data-test="option"]', _select_option)
+    driver.on("click", '[data-test="crossmark"]', _deselect)
+    multi_select = MultiSelect(driver, Selector(select="#roles"))
+    assert multi_select.select("Power")
+    assert multi_select.get_values() == ["admin", "power"]
+    assert multi_select.list_of_values() == ["admin", "power"]
+    assert multi_select.deselect("admin")
+    assert multi_select.get_values() == ["power"]
+
+
+def test_multi_select_waits_for_the_selected_values():
+    driver = FakeWebDriver(MULTI_SELECT_PAGE)
+    timers = []
+
+    def _select_option_later(driver, option):
+        chip = lxml.html.fragment_fromstring(
+            '<button data-test="selected-option" role="option">{}'
+            '<span data-test="crossmark"></span></button>'.format(option.text)
+        )
+        _close_popover(driver, "#popover-roles")
+        timers.append(
+            threading.Timer(
+                0.3,
+                driver.find_element(By.CSS_SELECTOR, "#roles input").node.addprevious,
+                (chip,),
+            )
+        )
+        timers[-1].start()
+
+    driver.on("click", "#roles input", _open_popover("#popover-roles"))
+    driver.on("click", '[data-test="option"]', _select_option_later)
+    multi_select = MultiSelect(driver, Selector(select="#roles"))
+    assert multi_select.select("Power")
+    assert multi_select.get_values() == ["admin", "power"]
+    # The crossmark does nothing, the chip stays
+    multi_select.set_timeout(0.5)
+    with pytest.raises(
+        TimeoutException, match="admin was not removed from the selected values"
+    ):
+        multi_select.deselect("admin")
+    for timer in timers:
+        timer.join()
+
+
+def test_single_select_waits_for_the_popover():
+    driver = FakeWebDriver(
+        SINGLE_SELECT_PAGE.replace(' data-test-popover-id="popover-index"', "")
+    )
+    timers = []
+
+    def _open_popover_later(driver, dropdown):
+        def _open():
+            dropdown.node.set("data-test-popover-id", "popover-index")
+            _open_popover("#popover-index")(driver, dropdown)
+
+        timers.append(threading.Timer(0.3, _open))
+        timers[-1].start()
+
+    driver.on("click", "#index .dropdownBox", _open_popover_later)
+    driver.on(
+        "click",
+        '[data-test="option"]',
+        lambda driver, option: _close_popover(driver, "#popover-index"),
+    )
+    single_select = SingleSelect(driver, Selector(select="#index"), searchable=False)
+    assert single_select.list_of_values() == ["main", "summary"]
+    for timer in timers:
+        timer.join()
+
+
+def test_message_tray():
+    driver = FakeWebDriver(MESSAGE_TRAY_PAGE)
+
+    def _delete_msg(driver, delete_btn):
+        message = delete_btn.node.getparent()
+        message.getparent().remove(message)
+
+    driver.on("click", "[data-action='delete']", _delete_msg)
+    message_tray = MessageTray(driver)
+    assert message_tray.get_msg_count() == 2
+    assert message_tray.get_icon_attribute(0) == "error"
+    assert message_tray.get_message_list() == [
+        "Could not reach the server",
+        "Restart required",
+    ]
+    message_tray.delete_msg(0)
+    assert message_tray.get_msg(0) == "Restart required"
+
+
+def test_fake_backend():
+    driver_backend = FakeBackend("latest")
+    selenium_helper = MagicMock(splunk_web_url="https://localhost:8000")
+    browser = driver_backend.create(selenium_helper)
+    assert isinstance(browser, FakeWebDriver)
+    assert browser.current_url == "https://localhost:8000"
+    assert not driver_backend.saucelabs and not driver_backend.requires_login
+
+
+def test_row_count_waits_for_the_table_to_load():
+    driver = FakeWebDriver(
+        '<html><body><div id="table"><div data-test="wait-spinner"></div>'
+        '<table><tbody data-test="body"></tbody></table></div></body></html>'
+    )
+    loaded = threading.Timer(0.5, driver.load_html, (TABLE_PAGE,))
+    loaded.start()
+    try:
+        assert Table(driver, Selector(select="#table")).get_row_count() == 2
+    finally:
+        loaded.join()
+
+
+def test_table_is_read_once_the_rows_are_rendered():
+    driver = FakeWebDriver(
+        '<html><body><div id="table"><table><tbody data-test="body"></tbody></table></div></body></html>'
+    )
+    rendered = threading.Timer(0.5, driver.load_html, (TABLE_PAGE,))
+    rendered.start()
+    try:
+        assert list(Table(driver, Selector(select="#table")).get_table()) == [
+            "input_1",
+            "input_2",
+        ]
+    finally:
+        rendered.join()
+
+
+def test_empty_table_row_count_does_not_wait():
+    driver = FakeWebDriver(
+        '<html><body><div id="table"><table><tbody data-test="body"></tbody></table></div></body></html>'
+    )
+    start_time = time.monotonic()
+    assert Table(driver, Selector(select="#table")).get_row_count() == 0
+    assert MessageTray(driver).get_msg_count() == 0
+    assert time.monotonic() - start_time < 1
+
+
+def test_presence_checks(table_driver):
+    table = Table(table_driver, Selector(select="#table"))
+    assert table.count_now("rows") == 2
+    assert table.is_present("rows")
+    table.assert_absent("delete_prompt")
+    with pytest.raises(AssertionError, match="rows element is present"):
+        table.assert_absent("rows")
+    start_time = time.monotonic()
+    with pytest.raises(AssertionError, match="row still there"):
+        table.assert_absent("rows", timeout=0.5, msg="row still there")
+    assert not table.is_present("delete_prompt", timeout=0.5)
+    assert time.monotonic() - start_time < 5
+
+
+def _entity_driver(on_save):
+    driver = FakeWebDriver(ENTITY_PAGE)
+    driver.on("click", ".saveBtn", on_save)
+    return driver, Entity(driver, Selector(select="#entity"), add_btn=MagicMock())
+
+
+def _show_message(msg_type, text):
+    def _show(driver, save_btn):
+        message = lxml.html.fragment_fromstring(
+            '<div data-test-type="{}" data-test="message">{}</div>'.format(
+                msg_type, text
+            )
+        )
+        driver.find_element(By.TAG_NAME, "body").node.append(message)
+
+    return _show
+
+
+def _close_entity(driver, save_btn):
+    entity = driver.find_element(By.ID, "entity").node
+    entity.getparent().remove(entity)
+
+
+def test_wait_for_any():
+    driver, entity = _entity_driver(_close_entity)
+    assert (
+        entity.wait_for_any({"error": lambda driver: False, "save": "container"})
+        == "save"
+    )
+    with pytest.raises(TimeoutException, match="None of"):
+        entity.wait_for_any({"error": lambda driver: False}, timeout=0.5)
+
+
+@pytest.mark.parametrize(
+    "on_save,expected",
+    [
+        (
+            _show_message("error", "Field Name is required"),
+            SaveResult(saved=False, error="Field Name is required", warning=None),
+        ),
+        (
+            _show_message("warning", "Restart required"),
+            SaveResult(saved=False, error=None, warning="Restart required"),
+        ),
+        (_close_entity, SaveResult(saved=True, error=None, warning=None)),
+    ],
+)
+def test_save_and_get_result(on_save, expected):
+    driver, entity = _entity_driver(on_save)
+    start_time = time.monotonic()
+    assert entity.save_and_get_result() == expected
+    assert time.monotonic() - start_time < 5
+
+
+def test_save_and_get_result_with_entity_staying_open():
+    # The spinner is displayed & removed during the click, only the observer started before the click sees it
+    watch = {"spinner_seen": False}
+    driver, entity = _entity_driver(
+        lambda driver, save_btn: watch.update(spinner_seen=True)
+    )
+    driver.register_script(
+        WAIT_FOR_CONDITION,
+        lambda driver, condition, by, select, timeout: driver.find_element(
+            By.CSS_SELECTOR, select
+        ),
+    )
+    driver.register_script(
+        WATCH_LOADING, lambda driver, name, spinner, target: watch.update(name=name)
+    )
+    driver.register_script(
+        GET_LOADING_WATCH,
+        lambda driver, name: "loaded" if watch["spinner_seen"] else "not_started",
+    )
+    start_time = time.monotonic()
+    assert entity.save_and_get_result() == SaveResult(
+        saved=True, error=None, warning=None
+    )
+    assert time.monotonic() - start_time < 5
+    assert watch["name"] == 'loading:#entity button[data-test="wait-spinner"]'
+    assert entity.is_present("container")
+
+
+class CachedTextBox(TextBox):
+    cache_elements = True
+
+
+def test_cached_element_is_relocated_once_stale():
+    driver = FakeWebDriver(
+        '<html><body><div id="name"><input value="input_1"></div></body></html>'
+    )
+    driver.find_element = MagicMock(wraps=driver.find_element)
+    textbox = CachedTextBox(driver, Selector(select="#name"))
+    assert textbox.get_value() == "input_1"
+    assert textbox.is_editable()
+    assert driver.find_element.call_count == 1
+    assert isinstance(textbox.input, FakeWebElement)
+
+    # The input is re-rendered
+    container = driver.find_element(By.ID, "name").node
+    container.replace(container[0], lxml.html.fragment_fromstring('<input value="b">'))
+    driver.find_element.reset_mock()
+    assert textbox.get_value() == "b"
+    assert driver.find_element.call_count == 1
+
+    BrowserWait(driver, 1).note_navigation()
+    assert textbox.get_value() == "b"
+    assert driver.find_element.call_count == 2
+
+
+def test_cached_element_is_located_again_after_a_view_change():
+    driver = FakeWebDriver(
+        '<html><body><div id="name"><input value="input_1"></div></body></html>',
+        url="https://localhost:8000/en-US/app/inputs",
+    )
+    driver.find_element = MagicMock(wraps=driver.find_element)
+    textbox = CachedTextBox(driver, Selector(select="#name"))
+    assert textbox.get_value() == "input_1"
+    assert textbox.get_value() == "input_1"
+    assert driver.find_element.call_count == 1
+
+    # The single-page app shows another view, without loading a new document
+    driver.current_url = "https://localhost:8000/en-US/app/configuration"
+    assert textbox.get_value() == "input_1"
+    assert driver.find_element.call_count == 2
+
+
+def test_element_cache_is_opt_in():
+    driver = FakeWebDriver(
+        '<html><body><div id="name"><input value="input_1"></div></body></html>'
+    )
+    driver.find_element = MagicMock(wraps=driver.find_element)
+    textbox = TextBox(driver, Selector(select="#name"))
+    assert textbox.get_value() == "input_1"
+    assert textbox.get_value() == "input_1"
+    assert driver.find_element.call_count == 2
@@ -0,0 +1,252 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from pytest_splunk_addon_ui_smartx import plugin
+from pytest_splunk_addon_ui_smartx.sauce_reporter import SauceJobReporter
+
+pytest_plugins = "pytester"
+
+CONFTEST = """
+import pytest
+
+
+@pytest.fixture(scope="session")
+def splunk():
+    return {"username": "admin", "password": "Chang3d!"}
+
+
+@pytest.fixture(scope="session")
+def splunk_web_uri():
+    return "https://localhost:8000"
+
+
+@pytest.fixture(scope="session")
+def splunk_rest_uri():
+    return None, "https://localhost:8089"
+"""
+
+GROUPING_HOOKS = """
+
+def pytest_collection_modifyitems(config, items):
+    # Runs after the hooks marked tryfirst, as the loadgroup scheduling of pytest-xdist
+    config.xdist_groups = [
+        item.get_closest_marker("xdist_group").kwargs["name"]
+        for item in items
+        if item.get_closest_marker("xdist_group")
+    ]
+
+
+def pytest_terminal_summary(config):
+    print("xdist_groups={}".format(config.xdist_groups))
+"""
+
+WORKER_BROWSER_ARGS = (
+    "-p",
+    "pytest_splunk_addon_ui_smartx.plugin",
+    "--browser=fake",
+    "--local",
+    "--ucc-worker-browser",
+    "--ucc-driver-backend=fake=pytest_splunk_addon_ui_smartx.fake_webdriver:FakeBackend",
+    "-s",
+)
+
+
+@pytest.fixture()
+def worker_browser_tests(pytester):
+    pytester.makeconftest(CONFTEST + GROUPING_HOOKS)
+    pytester.makepyfile(
+        """
+        BROWSERS = []
+
+
+        class TestInputs:
+            def test_first(self, ucc_smartx_selenium_helper):
+                BROWSERS.append(ucc_smartx_selenium_helper.browser)
+                ucc_smartx_selenium_helper.browser.get("https://localhost:8000/en-US/app/inputs")
+
+            def test_second(self, ucc_smartx_selenium_helper):
+                BROWSERS.append(ucc_smartx_selenium_helper.browser)
+                assert BROWSERS[0] is BROWSERS[1]
+                assert ucc_smartx_selenium_helper.browser.current_url == "https://localhost:8000"
+
+            def test_broken_browser(self, ucc_smartx_selenium_helper):
+                def _broken(*args):
+                    raise Exception("The browser crashed")
+
+                ucc_smartx_selenium_helper.browser.get = _broken
+
+            def test_after_broken_browser(self, ucc_smartx_selenium_helper):
+                assert ucc_smartx_selenium_helper.browser is not BROWSERS[0]
+                ucc_smartx_selenium_helper.browser.get("https://localhost:8000/en-US/app/search")
+
+
+        def test_without_class(ucc_smartx_selenium_helper):
+            pass
+        """
+    )
+    return pytester
+
+
+def test_worker_browser_is_shared_and_reset(worker_browser_tests):
+    result = worker_browser_tests.runpytest(*WORKER_BROWSER_ARGS)
+    result.assert_outcomes(passed=5)
+
+
+def test_tests_are_grouped_before_xdist_schedules_them(worker_browser_tests):
+    result = worker_browser_tests.runpytest(*WORKER_BROWSER_ARGS)
+    result.stdout.fnmatch_lines(
+        [
+            "xdist_groups=['test_tests_are_grouped_before_xdist_schedules_them.py::TestInputs', "
+            "'test_tests_are_grouped_before_xdist_schedules_them.py::TestInputs', "
+            "'test_tests_are_grouped_before_xdist_schedules_them.py::TestInputs', "
+            "'test_tests_are_grouped_before_xdist_schedules_them.py::TestInputs', "
+            "'test_tests_are_grouped_before_xdist_schedules_them.py']"
+        ]
+    )
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("--browser=fake", "--local", "--ucc-browser-pool=1"),
+        ("--browser=fake", "--local", "--ucc-prelaunch-browser"),
+        ("--browser=chrome",),
+    ],
+    ids=["browser_pool", "prelaunch_browser", "saucelabs"],
+)
+def test_worker_browser_is_ignored_with_other_modes(pytester, args):
+    pytester.makeconftest(CONFTEST)
+    pytester.makepyfile(
+        """
+        def test_worker_browser(request):
+            assert not request.config.getoption("--ucc-worker-browser")
+        """
+    )
+    result = pytester.runpytest(
+        "-p",
+        "pytest_splunk_addon_ui_smartx.plugin",
+        "--ucc-worker-browser",
+        "--ucc-driver-backend=fake=pytest_splunk_addon_ui_smartx.fake_webdriver:FakeBackend",
+        *args,
+    )
+    result.assert_outcomes(passed=1)
+
+
+SAUCE_HOOKS = """
+
+# The class used by the plugin, in case base_test was imported again
+from pytest_splunk_addon_ui_smartx.plugin import SeleniumHelper
+
+REPORTED = []
+
+
+def pytest_configure(config):
+    config.update_saucelab_job = SeleniumHelper.update_saucelab_job
+    SeleniumHelper.update_saucelab_job = (
+        lambda self, status, reporter=None: REPORTED.append((self.test_case, status))
+    )
+
+
+def pytest_unconfigure(config):
+    SeleniumHelper.update_saucelab_job = config.update_saucelab_job
+
+
+def pytest_terminal_summary(config):
+    print("reported={}".format(REPORTED))
+    print(
+        "sauce_reporter={}".format(getattr(config, "_ucc_smartx_sauce_reporter", None))
+    )
+"""
+
+
+def test_pooled_browser_job_status_is_reported(pytester):
+    pytester.makeconftest(CONFTEST + SAUCE_HOOKS)
+    pytester.makepyfile(
+        """
+        def test_passed(ucc_smartx_selenium_helper):
+            pass
+
+
+        def test_failed(ucc_smartx_selenium_helper):
+            assert False
+
+
+        def test_passed_after_failure(ucc_smartx_selenium_helper):
+            pass
+        """
+    )
+    result = pytester.runpytest(
+        "-p",
+        "pytest_splunk_addon_ui_smartx.plugin",
+        "--browser=fake",
+        "--ucc-browser-pool=1",
+        "--ucc-driver-backend=fake=pytest_splunk_addon_ui_smartx.fake_webdriver:FakeBackend",
+        "-s",
+    )
+    result.assert_outcomes(passed=2, failed=1)
+    # The browser of the pool runs the 3 test cases in the job of the first one
+    result.stdout.fnmatch_lines(
+        [
+            "reported=[('fake_test_passed', False), ('fake_test_passed', True), "
+            "('fake_test_passed', True)]",
+            # The fake browser is not a Saucelabs backend
+            "sauce_reporter=None",
+        ]
+    )
+
+
+def test_sauce_jobs_of_xdist_workers_are_in_the_summary():
+    worker_config = SimpleNamespace(
+        workeroutput=dict(), getoption=lambda name, default=None: default
+    )
+    worker_config._ucc_smartx_sauce_reporter = SauceJobReporter()
+    worker_config._ucc_smartx_sauce_reporter.jobs.append(
+        {
+            "test_case": "chrome_test_one",
+            "session_id": "1234",
+            "job_id": "1234",
+            "video_url": "https://saucelabs.com/video/1234",
+        }
+    )
+    plugin.pytest_sessionfinish(SimpleNamespace(config=worker_config))
+    controller_config = SimpleNamespace()
+    plugin.pytest_testnodedown(
+        SimpleNamespace(
+            workeroutput=worker_config.workeroutput, config=controller_config
+        ),
+        None,
+    )
+    terminalreporter = MagicMock()
+    plugin.pytest_terminal_summary(terminalreporter, controller_config)
+    terminalreporter.write_line.assert_called_once_with(
+        "chrome_test_one: SauceLabs job_id=1234 Video_url=https://saucelabs.com/video/1234"
+    )
+
+
+def test_browser_is_not_prelaunched_on_xdist_workers(pytester):
+    pytester.makeconftest(
+        CONFTEST
+        + """
+
+def pytest_configure(config):
+    # As on a pytest-xdist worker
+    config.workerinput = dict()
+"""
+    )
+    pytester.makepyfile(
+        """
+        def test_first(ucc_smartx_browser_prelauncher, ucc_smartx_selenium_helper):
+            assert ucc_smartx_browser_prelauncher is None
+        """
+    )
+    result = pytester.runpytest(
+        "-p",
+        "pytest_splunk_addon_ui_smartx.plugin",
+        "--browser=fake",
+        "--local",
+        "--ucc-prelaunch-browser",
+        "--ucc-driver-backend=fake=pytest_splunk_addon_ui_smartx.fake_webdriver:FakeBackend",
+    )
+    result.assert_outcomes(passed=1)
@@ -0,0 +1,80 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from pytest_splunk_addon_ui_smartx.sauce_reporter import SauceJobReporter
+
+
+class SauceStandIn(BaseHTTPRequestHandler):
+    requests = []
+    failures = 0
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        SauceStandIn.requests.append((self.path, json.loads(body)))
+        if SauceStandIn.failures:
+            SauceStandIn.failures -= 1
+            self.send_response(500)
+            self.end_headers()
+            return
+        job_id = self.path.split("/")[-1]
+        response = json.dumps(
+            {"id": job_id, "video_url": "https://video/{}".format(job_id)}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def sauce_api():
+    SauceStandIn.requests = []
+    SauceStandIn.failures = 0
+    server = HTTPServer(("127.0.0.1", 0), SauceStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/rest/v1".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_sauce_job_status_is_reported(sauce_api):
+    reporter = SauceJobReporter(api_url=sauce_api)
+    reporter.report("user", "key", "1234", True, "chrome_test_one")
+    reporter.report("user", "key", "5678", False, "chrome_test_two")
+    reporter.close()
+    assert SauceStandIn.requests == [
+        ("/rest/v1/user/jobs/1234", {"passed": False}),
+        ("/rest/v1/user/jobs/5678", {"passed": True}),
+    ]
+    assert reporter.get_summary() == [
+        "chrome_test_one: SauceLabs job_id=1234 Video_url=https://video/1234",
+        "chrome_test_two: SauceLabs job_id=5678 Video_url=https://video/5678",
+    ]
+
+
+def test_sauce_job_status_is_retried(sauce_api):
+    SauceStandIn.failures = 1
+    reporter = SauceJobReporter(api_url=sauce_api, backoff=0)
+    reporter.report("user", "key", "1234", False, "chrome_test_one")
+    reporter.flush()
+    assert len(SauceStandIn.requests) == 2
+    assert reporter.jobs[0]["job_id"] == "1234"
+    reporter.close()
+
+
+def test_sauce_job_error_in_summary(sauce_api):
+    SauceStandIn.failures = 2
+    reporter = SauceJobReporter(api_url=sauce_api, retry_count=2, backoff=0)
+    reporter.report("user", "key", "1234", False, "chrome_test_one")
+    reporter.close()
+    assert reporter.get_summary()[0].startswith(
+        "chrome_test_one: Could not notify Saucelabs job=1234"
+    )
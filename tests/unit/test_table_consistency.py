@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock
+
+from pytest_splunk_addon_ui_smartx.table_consistency import (
+    compare_table_with_conf,
+    get_conf_field,
+)
+from pytest_splunk_addon_ui_smartx.table_snapshot import MISSING, TableSnapshot
+
+TABLE = {
+    "input_1": {"name": "input_1", "interval": "60", "status": "Enabled"},
+    "input_2": {
+        "name": "input_2",
+        "interval": "120",
+        "status": "Disabled",
+        "actions": "Edit | Clone | Delete",
+    },
+}
+
+
+class PagedTable:
+    header_mapping = {"interval": "polling_interval", "account": 3}
+
+    def __init__(self):
+        self.get_snapshot = MagicMock(
+            side_effect=lambda columns=None, all_pages=False: TableSnapshot.from_rows(
+                self.iter_all_rows(columns)
+            )
+        )
+
+    def iter_all_rows(self, columns=None):
+        if columns is not None:
+            columns = [each_col.lower() for each_col in columns] + ["name"]
+        for row_name, row in TABLE.items():
+            yield row_name, {
+                header: value
+                for header, value in row.items()
+                if columns is None or header in columns
+            }
+
+
+def test_conf_field():
+    assert get_conf_field("Status", {}) == "disabled"
+    assert get_conf_field("Interval", PagedTable.header_mapping) == "polling_interval"
+    assert get_conf_field("account", PagedTable.header_mapping) is None
+
+
+def test_table_matches_conf():
+    backend_conf = MagicMock()
+    backend_conf.get_all_stanzas.return_value = {
+        "input_1": {"polling_interval": 60, "disabled": False},
+        "input_2": {"polling_interval": "120", "disabled": "1"},
+    }
+    table = PagedTable()
+    diff = compare_table_with_conf(table, backend_conf, query="search=input")
+    assert not diff, str(diff)
+    table.get_snapshot.assert_called_once_with(None, all_pages=True)
+    backend_conf.get_all_stanzas.assert_called_once_with("search=input")
+
+
+def test_paged_table_is_read_with_the_requested_columns():
+    backend_conf = MagicMock()
+    backend_conf.get_all_stanzas.return_value = {
+        "input_1": {"polling_interval": "60"},
+        "input_2": {"polling_interval": "300", "disabled": "1"},
+    }
+    table = PagedTable()
+    diff = compare_table_with_conf(table, backend_conf, columns=["Interval"])
+    table.get_snapshot.assert_called_once_with(["Interval"], all_pages=True)
+    assert diff.mismatches == {"input_2": {"interval": ("120", "300")}}
+
+
+def test_all_differences_are_reported():
+    backend_conf = MagicMock()
+    backend_conf.get_all_stanzas.return_value = {
+        "input_2": {"polling_interval": "300"},
+        "input_3": {"polling_interval": "60", "disabled": "0"},
+    }
+    table = MagicMock(spec=["get_table", "header_mapping"])
+    table.get_table.return_value = TABLE
+    table.header_mapping = PagedTable.header_mapping
+    diff = compare_table_with_conf(table, backend_conf, columns=["Interval", "Status"])
+    table.get_table.assert_called_once_with()
+    assert diff.missing_in_ui == ("input_3",)
+    assert diff.missing_in_conf == ("input_1",)
+    assert diff.mismatches == {
+        "input_2": {"interval": ("120", "300"), "status": ("Disabled", "Enabled")}
+    }
+    assert str(diff).splitlines() == [
+        "4 differences between the table and the conf",
+        "  - input_3: in the conf, not in the table",
+        "  - input_1: in the table, not in the conf",
+        "  - input_2.interval: table='120' conf='300'",
+        "  - input_2.status: table='Disabled' conf='Enabled'",
+    ]
+
+
+def test_parameters_not_in_the_stanza_use_their_default():
+    backend_conf = MagicMock()
+    backend_conf.get_all_stanzas.return_value = {
+        "input_1": {},
+        "input_2": {"polling_interval": "120", "disabled": "1"},
+    }
+    table = MagicMock(spec=["get_table", "header_mapping"])
+    table.get_table.return_value = TABLE
+    table.header_mapping = PagedTable.header_mapping
+    diff = compare_table_with_conf(
+        table,
+        backend_conf,
+        columns=["Interval", "Status"],
+        defaults={"interval": "60"},
+    )
+    assert not diff, str(diff)
+    diff = compare_table_with_conf(table, backend_conf, columns=["Interval", "Status"])
+    assert diff.mismatches == {"input_1": {"interval": ("60", "")}}
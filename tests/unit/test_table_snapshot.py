@@ -0,0 +1,57 @@
+import pickle
+
+import pytest
+
+from pytest_splunk_addon_ui_smartx.table_snapshot import MISSING, TableSnapshot
+
+TABLE = {
+    "input_1": {"name": "input_1", "interval": "60", "status": "Enabled"},
+    "input_2": {"name": "input_2", "interval": "120", "status": "Disabled"},
+}
+
+
+def test_snapshot_is_columnar():
+    snapshot = TableSnapshot.from_dict(TABLE)
+    assert len(snapshot) == 2
+    assert snapshot.names == ("input_1", "input_2")
+    assert snapshot.get_column("status") == ("Enabled", "Disabled")
+    assert snapshot.get_row("input_2")["interval"] == "120"
+    assert snapshot.to_dict() == TABLE
+    with pytest.raises(KeyError):
+        snapshot.get_row("input_3")
+
+
+def test_values_are_interned():
+    first = TableSnapshot.from_rows([("a", {"status": "".join(["Ena", "bled"])})])
+    second = TableSnapshot.from_rows([("b", {"status": "".join(["Ena", "bled"])})])
+    assert first.get_column("status")[0] is second.get_column("status")[0]
+
+
+def test_rows_with_other_columns():
+    snapshot = TableSnapshot.from_rows(
+        [("input_1", {"name": "input_1"}), ("input_2", {"interval": "120"})]
+    )
+    assert snapshot.get_column("interval") == (MISSING, "120")
+    assert snapshot.to_dict() == {
+        "input_1": {"name": "input_1"},
+        "input_2": {"interval": "120"},
+    }
+    assert pickle.loads(pickle.dumps(snapshot.get_column("interval")))[0] is MISSING
+
+
+def test_diff():
+    before = TableSnapshot.from_dict(TABLE)
+    assert not before.diff(TableSnapshot.from_dict(TABLE))
+    assert before == TableSnapshot.from_dict(TABLE)
+    table = {
+        "input_2": {"name": "input_2", "interval": "120", "status": "Enabled"},
+        "input_3": {"name": "input_3", "interval": "60", "status": "Enabled"},
+    }
+    diff = before.diff(TableSnapshot.from_dict(table))
+    assert diff
+    assert diff.added == ("input_3",)
+    assert diff.removed == ("input_1",)
+    assert diff.changed == {"input_2": {"status": ("Disabled", "Enabled")}}
+    table["input_2"].pop("interval")
+    diff = before.diff(TableSnapshot.from_dict(table))
+    assert diff.changed["input_2"]["interval"] == ("120", MISSING)
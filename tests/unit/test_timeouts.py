@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from pytest_splunk_addon_ui_smartx import timeouts
+from pytest_splunk_addon_ui_smartx.browser_wait import (
+    PRESENT,
+    WAIT_FOR_CONDITION,
+    BrowserWait,
+)
+from pytest_splunk_addon_ui_smartx.components.base_component import Selector
+from pytest_splunk_addon_ui_smartx.components.table import Table
+from pytest_splunk_addon_ui_smartx.timeouts import TimeoutPolicy
+
+
+@pytest.fixture()
+def timeout_policy():
+    timeout_policy = TimeoutPolicy()
+    previous_policy = timeouts.get_timeout_policy()
+    timeouts.set_timeout_policy(timeout_policy)
+    yield timeout_policy
+    timeouts.set_timeout_policy(previous_policy)
+
+
+def test_timeout_is_calibrated_after_min_samples():
+    timeout_policy = TimeoutPolicy(min_samples=10)
+    for _ in range(9):
+        timeout_policy.record("present:#table", 2)
+    assert timeout_policy.get_timeout(20, "present:#table") == 20
+    timeout_policy.record("present:#table", 4)
+    assert timeout_policy.get_timeout(20, "present:#table") == 12
+    for _ in range(10):
+        timeout_policy.record("present:#fast", 0.1)
+    assert timeout_policy.get_timeout(20, "present:#fast") == 5
+
+
+def test_timeout_overrides():
+    timeout_policy = TimeoutPolicy(samples={"present:#table": [1] * 20})
+    assert timeout_policy.get_timeout(20, "present:#table", "Table") == 5
+    timeout_policy.set_override("default", "30")
+    assert timeout_policy.get_timeout(20, "present:#table", "Table") == 30
+    timeout_policy.set_override("Table", 40)
+    assert timeout_policy.get_timeout(20, "present:#table", "Table") == 40
+    timeout_policy.set_override("present:#table", 10)
+    assert timeout_policy.get_timeout(20, "present:#table", "Table") == 10
+    assert timeout_policy.get_timeout(20, component="Toggle") == 30
+
+
+def test_durations_are_persisted_per_environment(tmp_path):
+    timeouts_file = str(tmp_path / "timeouts.json")
+    first_run = TimeoutPolicy.load(timeouts_file, "chrome:latest:local")
+    first_run.record("present:#table", 1)
+    first_run.save(timeouts_file, "chrome:latest:local")
+    concurrent_run = TimeoutPolicy.load(timeouts_file, "chrome:latest:local")
+    concurrent_run.record("present:#table", 2)
+    concurrent_run.save(timeouts_file, "chrome:latest:local")
+    first_run.save(timeouts_file, "chrome:latest:local")
+    other_environment = TimeoutPolicy.load(timeouts_file, "firefox:latest:remote")
+    assert other_environment.samples == {}
+    other_environment.record("present:#table", 1)
+    other_environment.save(timeouts_file, "firefox:latest:remote")
+    with open(timeouts_file) as f:
+        assert json.load(f) == {
+            "chrome:latest:local": {"present:#table": [1, 2]},
+            "firefox:latest:remote": {"present:#table": [1]},
+        }
+    assert TimeoutPolicy.load(timeouts_file, "chrome:latest:local").samples == {
+        "present:#table": [1, 2]
+    }
+
+
+def test_interleaved_saves_keep_all_the_durations(tmp_path):
+    timeouts_file = str(tmp_path / "timeouts.json")
+    first_run = TimeoutPolicy()
+    first_run.record("present:#table", 1)
+    other_run = TimeoutPolicy()
+    other_run.record("present:#form", 2)
+    other_save = threading.Thread(
+        target=other_run.save, args=(timeouts_file, "chrome:latest:local")
+    )
+    read = TimeoutPolicy._read
+
+    def _read_while_other_run_saves(path):
+        # The other run saves between the read & the write of the first run
+        if not other_save.is_alive():
+            other_save.start()
+            time.sleep(0.3)
+        return read(path)
+
+    with patch.object(
+        TimeoutPolicy, "_read", staticmethod(_read_while_other_run_saves)
+    ):
+        first_run.save(timeouts_file, "chrome:latest:local")
+        other_save.join()
+    with open(timeouts_file) as f:
+        assert json.load(f) == {
+            "chrome:latest:local": {"present:#table": [1], "present:#form": [2]}
+        }
+
+
+def test_nothing_is_saved_without_new_durations(tmp_path):
+    timeouts_file = tmp_path / "timeouts.json"
+    TimeoutPolicy(samples={"present:#table": [1]}).save(
+        str(timeouts_file), "chrome:latest:local"
+    )
+    assert not timeouts_file.exists()
+
+
+def test_browser_wait_uses_the_policy(timeout_policy):
+    timeout_policy.set_override("present:#table", 7)
+    browser = MagicMock()
+    BrowserWait(browser, 20, component="Table").until(
+        PRESENT, By.CSS_SELECTOR, "#table"
+    )
+    browser.execute_async_script.assert_called_with(
+        WAIT_FOR_CONDITION, PRESENT, "css", "#table", 7000
+    )
+    BrowserWait(browser, 20).until(PRESENT, By.CSS_SELECTOR, "#table")
+    browser.execute_async_script.assert_called_with(
+        WAIT_FOR_CONDITION, PRESENT, "css", "#table", 20000
+    )
+    assert len(timeout_policy.samples["present:#table"]) == 2
+
+
+def test_component_timeout(timeout_policy):
+    timeout_policy.set_override("Table", 40)
+    table = Table(MagicMock(), Selector(select="#table"))
+    assert table.wait._timeout == 40
+    table.set_timeout(5)
+    assert table.wait._timeout == 5
+    assert table.browser_wait.timeout == 5 and table.browser_wait.component is None
@@ -0,0 +1,87 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from selenium.webdriver.remote.command import Command
+
+from pytest_splunk_addon_ui_smartx.transport import (
+    CommandMetrics,
+    KeepAliveEdgeRemoteConnection,
+    KeepAliveRemoteConnection,
+)
+
+
+class HubStandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    headers_seen = []
+
+    def _respond(self):
+        HubStandIn.connections.add(self.client_address)
+        HubStandIn.headers_seen.append(dict(self.headers))
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        response = json.dumps({"value": "x" * 1000}).encode()
+        self.send_response(200)
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            response = gzip.compress(response)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def hub():
+    HubStandIn.connections = set()
+    HubStandIn.headers_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HubStandIn)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield "http://127.0.0.1:{}/wd/hub".format(server.server_port)
+    server.shutdown()
+    server.server_close()
+
+
+def test_connection_is_reused(hub):
+    connection = KeepAliveRemoteConnection(hub)
+    for _ in range(5):
+        response = connection.execute(Command.GET_TITLE, {"sessionId": "1234"})
+        assert response["value"] == "x" * 1000
+    assert len(HubStandIn.connections) == 1
+
+
+def test_command_metrics_are_recorded(hub):
+    metrics = CommandMetrics()
+    connection = KeepAliveRemoteConnection(hub, metrics=metrics)
+    connection.execute(Command.GET_TITLE, {"sessionId": "1234"})
+    connection.execute(Command.GET_TITLE, {"sessionId": "1234"})
+    connection.execute(
+        Command.GET, {"sessionId": "1234", "url": "https://localhost:8000"}
+    )
+    assert metrics.commands[Command.GET_TITLE]["count"] == 2
+    assert metrics.commands[Command.GET_TITLE]["bytes_received"] == 2 * 1013
+    assert metrics.commands[Command.GET]["bytes_sent"] > 0
+    summary = metrics.get_summary()
+    assert len(summary) == 2
+    assert summary[0].split(":")[0] in (Command.GET_TITLE, Command.GET)
+    assert len(metrics.get_summary(limit=1)) == 1
+
+
+def test_compressed_responses(hub):
+    metrics = CommandMetrics()
+    connection = KeepAliveEdgeRemoteConnection(hub, metrics=metrics, compress=True)
+    response = connection.execute(Command.GET_TITLE, {"sessionId": "1234"})
+    assert response["value"] == "x" * 1000
+    assert HubStandIn.headers_seen[0]["Accept-Encoding"] == "gzip"
+    assert metrics.commands[Command.GET_TITLE]["bytes_received"] < 1013
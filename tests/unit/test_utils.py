@@ -1,6 +1,9 @@
+import os
 from unittest.mock import mock_open, patch
 
-from pytest_splunk_addon_ui_smartx.utils import get_orca_deployment_urls
+import pytest
+
+from pytest_splunk_addon_ui_smartx.utils import file_lock, get_orca_deployment_urls
 
 ORCA_DEPLOYMENT_JSON = """{
     "deployment_type": "custom_cluster",
@@ -93,3 +96,13 @@ def test_global_parameters():
     with patch("builtins.open", mock_open(read_data=ORCA_DEPLOYMENT_JSON)) as json_mock:
         assert get_orca_deployment_urls() == expected
         json_mock.assert_called_with("orca_deployment.json")
+
+
+def test_file_lock(tmp_path):
+    lock_path = str(tmp_path / "cache.lock")
+    with file_lock(lock_path):
+        assert os.path.exists(lock_path)
+        with pytest.raises(TimeoutError):
+            with file_lock(lock_path, timeout=0.2):
+                pass
+    assert not os.path.exists(lock_path)